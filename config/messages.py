@@ -11,6 +11,9 @@ class Messages:
     SOMETHING_WENT_WRONG = "Something went wrong-please try again"
     NOT_ENOUGH_POINTS = "Not enough points! You need {places} points but have {current_points}"
     MAX_PLACES_EXCEEDED = "You cannot book more than 12 places per competition!"
+    INVALID_PLACES = "Please enter a valid number of places (at least 1)."
+    EMPTY_BATCH = "No booking requested. Please choose at least one competition."
+    NOT_ENOUGH_PLACES = "Not enough places left! You asked for {places} but only {available} remain"
 
     # Messages de succès
     BOOKING_COMPLETE = "Great-booking complete!"
@@ -36,6 +39,14 @@ class Messages:
             current_points=current_points
         )
 
+    @staticmethod
+    def format_not_enough_places(places_required, available_places):
+        """Format le message de places insuffisantes dans la compétition"""
+        return Messages.NOT_ENOUGH_PLACES.format(
+            places=places_required,
+            available=available_places
+        )
+
     @staticmethod
     def check_welcome_page(response_data):
         """Vérifie si c'est une page de bienvenue"""
@@ -60,3 +71,18 @@ class PerformanceThresholds:
     MAX_LOADING_TIME = 5.0  # 5 secondes maximum pour le chargement
     MAX_UPDATE_TIME = 2.0   # 2 secondes maximum pour les mises à jour
     DEFAULT_USERS = 6       # 6 utilisateurs par défaut pour les tests
+
+    # Objectifs par endpoint ("MÉTHODE nom" des statistiques Locust) : percentiles
+    # en millisecondes, débit minimal en requêtes/s (0 : pas d'objectif)
+    LOADING_TARGETS = {'p50': 500, 'p95': 2000, 'p99': MAX_LOADING_TIME * 1000, 'rps': 0}
+    UPDATE_TARGETS = {'p50': 250, 'p95': 1000, 'p99': MAX_UPDATE_TIME * 1000, 'rps': 0}
+    ENDPOINT_TARGETS = {
+        'GET /': LOADING_TARGETS,
+        'POST /showSummary': LOADING_TARGETS,
+        'GET /book/[club]/[competition]': LOADING_TARGETS,
+        'POST /purchasePlaces': UPDATE_TARGETS,
+        'POST /purchasePlacesBatch': UPDATE_TARGETS,
+    }
+    DEFAULT_TARGETS = LOADING_TARGETS  # endpoints non listés
+    MIN_TOTAL_RPS = 1.0                # débit global minimal
+    MAX_FAILURE_RATIO = 0.01           # part maximale de requêtes en échec
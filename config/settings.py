@@ -0,0 +1,77 @@
+"""
+Paramètres d'exécution de l'application (persistance, modes de déploiement)
+Les valeurs par défaut peuvent être surchargées par variables d'environnement.
+"""
+import os
+
+
+def env_flag(name, default=False):
+    """Lit un booléen ('1', 'true', 'yes', 'on') depuis l'environnement"""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+class Settings:
+    """Paramètres chargés dans app.config via app.config.from_object"""
+
+    # Répertoire des fichiers de données (vide : répertoire courant) ; prioritaire sur
+    # le répertoire de test, pour pointer l'application sur un jeu de données généré
+    DATA_DIR = os.getenv('GUDLFT_DATA_DIR', '')
+
+    # Backend de stockage : 'json' (fichiers historiques) ou 'sqlite'
+    STORAGE_BACKEND = os.getenv('GUDLFT_STORAGE_BACKEND', 'json')
+    SQLITE_DATABASE = os.getenv('GUDLFT_SQLITE_DATABASE', 'gudlft.sqlite3')
+
+    # Mode de persistance (backend json) : 'snapshot' (réécriture des JSON) ou 'journal'
+    PERSISTENCE_MODE = os.getenv('GUDLFT_PERSISTENCE_MODE', 'snapshot')
+
+    # Journal des réservations (mode 'journal')
+    JOURNAL_FILE = os.getenv('GUDLFT_JOURNAL_FILE', 'bookings.journal')
+    JOURNAL_SNAPSHOT_THRESHOLD = int(os.getenv('GUDLFT_JOURNAL_SNAPSHOT_THRESHOLD', '500'))
+
+    # Commit groupé des achats concurrents (un seul écrivain, une écriture par lot)
+    GROUP_COMMIT = env_flag('GUDLFT_GROUP_COMMIT')
+    GROUP_COMMIT_MAX_BATCH = int(os.getenv('GUDLFT_GROUP_COMMIT_MAX_BATCH', '64'))
+    GROUP_COMMIT_MAX_WAIT_MS = float(os.getenv('GUDLFT_GROUP_COMMIT_MAX_WAIT_MS', '5'))
+
+    # Déploiement multi-processus : verrou fichier et rechargement sur changement externe
+    MULTIPROCESS = env_flag('GUDLFT_MULTIPROCESS')
+    LOCK_FILE = os.getenv('GUDLFT_LOCK_FILE', 'gudlft.lock')
+
+    # Persistance différée : écriture en arrière-plan, fenêtre de durabilité bornée
+    WRITE_BEHIND = env_flag('GUDLFT_WRITE_BEHIND')
+    WRITE_BEHIND_INTERVAL_MS = float(os.getenv('GUDLFT_WRITE_BEHIND_INTERVAL_MS', '1000'))
+    WRITE_BEHIND_MAX_DIRTY = int(os.getenv('GUDLFT_WRITE_BEHIND_MAX_DIRTY', '100'))
+
+    # Compression des réponses (Brotli si disponible, sinon gzip) au-delà de COMPRESSION_MIN_SIZE octets
+    COMPRESSION = env_flag('GUDLFT_COMPRESSION', default=True)
+    COMPRESSION_MIN_SIZE = int(os.getenv('GUDLFT_COMPRESSION_MIN_SIZE', '500'))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv('GUDLFT_COMPRESSION_GZIP_LEVEL', '6'))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv('GUDLFT_COMPRESSION_BROTLI_QUALITY', '4'))
+
+    # Rendu en flux des pages d'accueil et de résumé (premier octet envoyé avant la fin du rendu)
+    STREAM_TEMPLATES = env_flag('GUDLFT_STREAM_TEMPLATES')
+
+    # Flux /events : événements conservés pour la reprise (Last-Event-ID) et intervalle de keep-alive
+    EVENTS_BUFFER_SIZE = int(os.getenv('GUDLFT_EVENTS_BUFFER_SIZE', '1024'))
+    EVENTS_HEARTBEAT_S = float(os.getenv('GUDLFT_EVENTS_HEARTBEAT_S', '15'))
+
+    # Serveur de production gevent (wsgi.py)
+    SERVER_HOST = os.getenv('GUDLFT_SERVER_HOST', '0.0.0.0')
+    SERVER_PORT = int(os.getenv('GUDLFT_SERVER_PORT', '5050'))
+    SERVER_WORKERS = int(os.getenv('GUDLFT_SERVER_WORKERS', '1'))
+    SERVER_MAX_CONNECTIONS = int(os.getenv('GUDLFT_SERVER_MAX_CONNECTIONS', '1000'))
+    SERVER_BACKLOG = int(os.getenv('GUDLFT_SERVER_BACKLOG', '2048'))
+    SERVER_KEEPALIVE_S = float(os.getenv('GUDLFT_SERVER_KEEPALIVE_S', '75'))
+    SERVER_GRACEFUL_TIMEOUT_S = float(os.getenv('GUDLFT_SERVER_GRACEFUL_TIMEOUT_S', '30'))
+
+    # Profilage cProfile : routes sélectionnées (une requête sur PROFILE_EVERY), ou toute
+    # requête portant l'en-tête X-Profile égal à PROFILE_SECRET
+    PROFILE = env_flag('GUDLFT_PROFILE')
+    PROFILE_ROUTES = os.getenv('GUDLFT_PROFILE_ROUTES', 'index,showSummary,book,purchasePlaces,purchasePlacesBatch')
+    PROFILE_EVERY = int(os.getenv('GUDLFT_PROFILE_EVERY', '1'))
+    PROFILE_SECRET = os.getenv('GUDLFT_PROFILE_SECRET', '')
+    PROFILE_DIR = os.getenv('GUDLFT_PROFILE_DIR', 'profiles')
+    PROFILE_KEEP = int(os.getenv('GUDLFT_PROFILE_KEEP', '50'))
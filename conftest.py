@@ -16,8 +16,12 @@ def app():
 
 
 @pytest.fixture(autouse=True)
-def setup_test_data():
-    """Copie automatiquement les fichiers source vers testing avant chaque test"""
+def setup_test_data(monkeypatch):
+    """Copie automatiquement les fichiers source vers testing avant chaque test
+
+    DATA_DIR est forcé sur le répertoire de test : un GUDLFT_DATA_DIR exporté
+    dans le shell ne doit pas faire écrire les tests dans de vraies données.
+    """
     source_dir = os.path.join('test', 'data', 'source')
     testing_dir = os.path.join('test', 'data', 'testing')
 
@@ -30,12 +34,17 @@ def setup_test_data():
     shutil.copy2(os.path.join(source_dir, 'competitions.json'),
                  os.path.join(testing_dir, 'competitions.json'))
 
+    # Supprimer le journal des réservations d'un test précédent
+    journal_path = os.path.join(testing_dir, server.app.config['JOURNAL_FILE'])
+    if os.path.exists(journal_path):
+        os.remove(journal_path)
+
     # Configurer l'environnement de test
     os.environ['TESTING'] = '1'
+    monkeypatch.setitem(server.app.config, 'DATA_DIR', testing_dir)
 
     # Recharger les données du serveur avec les nouvelles données
-    server.clubs = server.loadClubs()
-    server.competitions = server.loadCompetitions()
+    server.initStorage()
 
     yield
 
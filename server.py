@@ -1,142 +1,811 @@
-import json
+import atexit
 import os
-from datetime import datetime
-from flask import Flask, render_template, request, redirect, flash, url_for
+import signal
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from flask import (Flask, render_template, stream_template, request, redirect, flash, url_for, jsonify, g,
+                   get_flashed_messages, abort, send_from_directory, before_render_template, template_rendered)
+from markupsafe import Markup
 from config.messages import Messages
+from config.settings import Settings
+from storage import (BookingJournal, CompetitionTimeline, DataCoherence, DataVersion, GroupCommitter, JsonRepository,
+                     KeyedIndex, LockTable, SqliteRepository, WriteBehindFlusher, normalize_email)
+from web import EventHub, FragmentCache, MetricsRegistry, RequestProfiler, ResponseCompressor
 
 
 def get_data_path(filename):
     """Retourne le chemin du fichier de données selon l'environnement"""
+    if hasattr(app, 'config') and app.config.get('DATA_DIR'):
+        return os.path.join(app.config['DATA_DIR'], filename)
     if os.environ.get('TESTING') or hasattr(app, 'config') and app.config.get('TESTING'):
-        return f'test/data/testing/{filename}'
+        return os.path.join('test/data/testing', filename)
     return filename
 
 
+# Index en mémoire, reconstruits à chaque chargement des données
+clubs_by_email = KeyedIndex('email', normalize=normalize_email)
+clubs_by_name = KeyedIndex('name')
+competitions_by_name = KeyedIndex('name')
+competition_timeline = CompetitionTimeline()
+
+# Version des données (ETag, caches), incrémentée à chaque modification
+data_version = DataVersion()
+
+# Fragments HTML rendus, indexés par la version des données
+fragment_cache = FragmentCache()
+# Pages compressées, à part : leurs succès ne comptent pas dans ceux des fragments
+compressed_cache = FragmentCache()
+
+# Métriques du processus, exportées sur /metrics
+metrics_registry = MetricsRegistry()
+request_duration = metrics_registry.histogram(
+    'gudlft_request_duration_seconds', 'Durée des requêtes par route et issue', ('route', 'outcome'))
+persistence_duration = metrics_registry.histogram(
+    'gudlft_persistence_duration_seconds', 'Durée des écritures des données', ('operation',))
+render_duration = metrics_registry.histogram(
+    'gudlft_template_render_seconds', 'Durée du rendu des templates', ('template',))
+metrics_registry.collected(
+    'gudlft_fragment_cache_hits_total', 'Fragments servis depuis le cache', 'counter', lambda: fragment_cache.hits)
+metrics_registry.collected(
+    'gudlft_fragment_cache_misses_total', 'Fragments rendus faute de cache', 'counter', lambda: fragment_cache.misses)
+metrics_registry.collected(
+    'gudlft_compressed_cache_hits_total', 'Pages compressées servies depuis le cache', 'counter',
+    lambda: compressed_cache.hits)
+metrics_registry.collected(
+    'gudlft_compressed_cache_misses_total', 'Pages compressées faute de cache', 'counter',
+    lambda: compressed_cache.misses)
+metrics_registry.collected(
+    'gudlft_event_subscribers', 'Abonnés connectés à /events', 'gauge', lambda: event_hub.subscribers)
+metrics_registry.collected(
+    'gudlft_group_commit_latency_seconds', 'Latence des commits groupés (GROUP_COMMIT)', 'gauge',
+    lambda: groupCommitQuantiles(), ('quantile',))
+
+# Verrous fins des réservations, clés ('club', nom) et ('competition', nom)
+booking_locks = LockTable()
+
+# Achats en cours : à l'arrêt (SIGTERM), les nouveaux sont refusés et ceux-ci
+# attendus avant la fermeture du stockage
+bookings_in_flight = 0
+bookings_closed = False
+bookings_condition = threading.Condition()
+
+
 def loadClubs():
-    with open(get_data_path('clubs.json')) as c:
-        listOfClubs = json.load(c)['clubs']
-        return listOfClubs
+    listOfClubs = repository.load_clubs()
+    clubs_by_email.rebuild(listOfClubs)
+    clubs_by_name.rebuild(listOfClubs)
+    return listOfClubs
 
 
-def saveClubs():
+def saveClubs(durable=False):
     """Sauvegarde la liste des clubs dans le fichier JSON"""
-    data = {'clubs': clubs}
-    with open(get_data_path('clubs.json'), 'w') as file:
-        json.dump(data, file, indent=4)
+    with persistence_duration.time('saveClubs'):
+        repository.save_clubs(clubs, durable=durable)
+    # Le tableau des points et les pages compressées qui l'incluent
+    fragment_cache.invalidate()
+    compressed_cache.invalidate()
 
 
 def loadCompetitions():
-    with open(get_data_path('competitions.json')) as comps:
-        listOfCompetitions = json.load(comps)['competitions']
-        return listOfCompetitions
+    listOfCompetitions = repository.load_competitions()
+    competitions_by_name.rebuild(listOfCompetitions)
+    competition_timeline.rebuild(listOfCompetitions)
+    return listOfCompetitions
 
 
-def saveCompetitions():
+def saveCompetitions(durable=False):
     """Sauvegarde la liste des compétitions dans le fichier JSON"""
-    data = {'competitions': competitions}
-    with open(get_data_path('competitions.json'), 'w') as file:
-        json.dump(data, file, indent=4)
+    with persistence_duration.time('saveCompetitions'):
+        repository.save_competitions(competitions, durable=durable)
+
+
+def snapshotData():
+    """Écrit un snapshot durable des deux fichiers JSON"""
+    saveCompetitions(durable=True)
+    saveClubs(durable=True)
+
+
+def createRepository():
+    """Instancie le backend de stockage choisi par STORAGE_BACKEND"""
+    backend = app.config['STORAGE_BACKEND']
+    if backend == 'json':
+        return JsonRepository(get_data_path)
+    if backend == 'sqlite':
+        return SqliteRepository(get_data_path(app.config['SQLITE_DATABASE']))
+    raise ValueError(f"Unknown storage backend: {backend!r}")
+
+
+def loadData():
+    """Charge clubs et compétitions depuis le backend
+
+    En mode 'journal', le dernier snapshot JSON est chargé puis la fin du
+    journal est rejouée par-dessus.
+    """
+    global clubs, competitions
+    competitions = loadCompetitions()
+    clubs = loadClubs()
+    if journal is not None:
+        journal.replay(clubs_by_name, competitions_by_name)
+    data_version.bump()
+
+
+def watchedDataPaths():
+    """Fichiers dont la modification signale un changement des données"""
+    if app.config['STORAGE_BACKEND'] == 'sqlite':
+        database = get_data_path(app.config['SQLITE_DATABASE'])
+        return [database, f'{database}-wal']
+    paths = [get_data_path('clubs.json'), get_data_path('competitions.json')]
+    if journal is not None:
+        paths.append(journal.path)
+    return paths
+
+
+def initStorage():
+    """(Ré)initialise la persistance puis charge les données"""
+    global repository, journal, committer, coherence, write_behind, bookings_closed
+    closeStorage()
+    bookings_closed = False
+    if app.config['WRITE_BEHIND'] and (app.config['GROUP_COMMIT'] or app.config['MULTIPROCESS']):
+        raise ValueError('Write-behind mode cannot be combined with group commit or multi-process mode')
+
+    repository = createRepository()
+    if app.config['PERSISTENCE_MODE'] == 'journal':
+        if app.config['STORAGE_BACKEND'] != 'json':
+            raise ValueError("Journal persistence mode requires the 'json' storage backend")
+        journal = BookingJournal(get_data_path(app.config['JOURNAL_FILE']),
+                                 app.config['JOURNAL_SNAPSHOT_THRESHOLD'])
+    loadData()
+
+    if app.config['MULTIPROCESS']:
+        coherence = DataCoherence(get_data_path(app.config['LOCK_FILE']), watchedDataPaths, loadData,
+                                  poll_interval=lockPollInterval())
+
+    if app.config['GROUP_COMMIT']:
+        committer = GroupCommitter(lambda bookings: flushBookings(bookings, durable=True),
+                                   max_batch=app.config['GROUP_COMMIT_MAX_BATCH'],
+                                   max_wait=app.config['GROUP_COMMIT_MAX_WAIT_MS'] / 1000)
+
+    if app.config['WRITE_BEHIND']:
+        write_behind = WriteBehindFlusher(lambda bookings: flushBookings(bookings, durable=True),
+                                          interval=app.config['WRITE_BEHIND_INTERVAL_MS'] / 1000,
+                                          max_dirty=app.config['WRITE_BEHIND_MAX_DIRTY'])
+        installShutdownHandler()
+
+
+def groupCommitQuantiles():
+    """Quantiles de latence du commit groupé, vides hors mode GROUP_COMMIT"""
+    if committer is None:
+        return {}
+    summary = committer.latency_summary()
+    return {(quantile,): summary[key] for quantile, key in (('0.5', 'p50'), ('0.9', 'p90'), ('0.99', 'p99'))}
+
+
+def lockPollInterval():
+    """Attente entre deux essais du verrou fichier sous gevent, sinon None
+
+    Un worker gevent (wsgi.py) exécute toutes ses requêtes dans un seul
+    thread : un flock bloquant y suspendrait toutes les connexions.
+    """
+    try:
+        from gevent import monkey
+    except ImportError:
+        return None
+    return 0.001 if monkey.is_module_patched('threading') else None
+
+
+def closeStorage():
+    """Vide les écritures en attente et ferme le journal et le backend"""
+    global repository, journal, committer, coherence, write_behind
+    if write_behind is not None:
+        write_behind.close()
+        write_behind = None
+    if committer is not None:
+        committer.close()
+        app.logger.info('Group commit latency: %s', committer.latency_summary())
+        committer = None
+    if journal is not None:
+        journal.close()
+        journal = None
+    if repository is not None:
+        repository.close()
+        repository = None
+    if coherence is not None:
+        coherence.close()
+        coherence = None
+
+
+@contextmanager
+def bookingInFlight():
+    """Compte un achat en cours ; 503 si l'arrêt a commencé"""
+    global bookings_in_flight
+    with bookings_condition:
+        if bookings_closed:
+            abort(503)
+        bookings_in_flight += 1
+    try:
+        yield
+    finally:
+        with bookings_condition:
+            bookings_in_flight -= 1
+            bookings_condition.notify_all()
+
+
+def drainBookings(timeout):
+    """Refuse les nouveaux achats et attend ceux en cours ; False si le délai est dépassé"""
+    global bookings_closed
+    with bookings_condition:
+        bookings_closed = True
+        return bookings_condition.wait_for(lambda: bookings_in_flight == 0, timeout)
+
+
+def installShutdownHandler():
+    """Vide les écritures différées à la réception de SIGTERM
+
+    Les nouveaux achats sont refusés, ceux en cours terminés (au plus
+    SERVER_GRACEFUL_TIMEOUT_S), puis la file différée est vidée et le
+    stockage fermé. Le gestionnaire précédent (celui de gunicorn par
+    exemple) est appelé ensuite ; à défaut, le processus se termine.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    previous = signal.getsignal(signal.SIGTERM)
+    if getattr(previous, 'flushes_storage', False):
+        return
+
+    def handleSigterm(signum, frame):
+        if not drainBookings(app.config['SERVER_GRACEFUL_TIMEOUT_S']):
+            app.logger.warning('Bookings still in flight after %ss, closing storage anyway',
+                               app.config['SERVER_GRACEFUL_TIMEOUT_S'])
+        closeStorage()
+        if callable(previous):
+            previous(signum, frame)
+        elif previous == signal.SIG_DFL:
+            raise SystemExit(128 + signum)
+
+    handleSigterm.flushes_storage = True
+    signal.signal(signal.SIGTERM, handleSigterm)
+
+
+def flushBookings(bookings, durable=False):
+    """Persiste un lot de réservations déjà appliquées en mémoire
+
+    Mode 'journal' : un enregistrement par réservation, un seul fsync pour le
+    lot, snapshot des JSON au-delà du seuil. Sinon : le backend persiste le
+    lot (réécriture des deux JSON, ou une transaction SQLite).
+    """
+    with persistence_duration.time('flushBookings'):
+        if journal is None:
+            with persistence_duration.time('recordBookings'):
+                repository.record_bookings(bookings, clubs, competitions, durable=durable)
+            return
+
+        with persistence_duration.time('appendJournal'):
+            journal.append_many([BookingJournal.booking_record(*booking) for booking in bookings])
+        if journal.needs_snapshot():
+            journal.compact(snapshotData)
+
+
+def commitBookings(bookings):
+    """Persiste des réservations, directement, via le commit groupé ou en différé
+
+    Retourne une fonction qui attend que les réservations soient sur disque.
+    En commit groupé, elles sont seulement mises en file : l'attente du
+    fsync se fait après avoir relâché les verrous des réservations, sinon
+    chaque achat sur une compétition disputée attendrait son propre lot.
+    """
+    if write_behind is not None:
+        # Retourne immédiatement : l'écriture est faite par le thread de fond
+        for booking in bookings:
+            write_behind.mark(*booking)
+    elif committer is None:
+        flushBookings(bookings)
+    else:
+        pending, batchCommitter = committer.enqueue_many(bookings), committer
+        return lambda: batchCommitter.wait(pending)
+    return lambda: None
+
+
+def dataWriteLock():
+    """Section critique des écritures entre processus (si MULTIPROCESS)
+
+    Les réservations d'un même processus sont en plus protégées par les
+    verrous fins de booking_locks.
+    """
+    if coherence is None:
+        return nullcontext()
+    return coherence.write_lock()
+
+
+def checkBooking(competition, placesRequired, clubPoints):
+    """Retourne le message d'erreur si la réservation enfreint une règle, sinon None
+
+    clubPoints : points encore disponibles pour le club (déduction faite des
+    réservations précédentes d'un même lot).
+    """
+    # Vérifier si la compétition est dans le passé
+    if competition_timeline.is_expired(competition):
+        return Messages.COMPETITION_EXPIRED
+
+    # Refuser les quantités nulles ou négatives
+    if placesRequired < 1:
+        return Messages.INVALID_PLACES
+
+    # Limiter à 12 places maximum
+    if placesRequired > Messages.MAX_PLACES_PER_BOOKING:  # ← Utilise la config
+        return Messages.MAX_PLACES_EXCEEDED  # ← Utilise la config
+
+    # Vérifier si le club a assez de points
+    if clubPoints < placesRequired:
+        return Messages.format_not_enough_points(placesRequired, clubPoints)  # ← Utilise la config
+
+    # Vérifier qu'il reste assez de places dans la compétition
+    if competition.numberOfPlaces < placesRequired:
+        return Messages.format_not_enough_places(placesRequired, competition.numberOfPlaces)
+
+    return None
+
+
+def bookingOutcome(message):
+    """Issue d'un achat pour les métriques, d'après le message affiché"""
+    outcome = BOOKING_OUTCOMES.get(message)
+    if outcome is not None:
+        return outcome
+    if message.startswith(Messages.NOT_ENOUGH_POINTS.partition('{')[0]):
+        return 'not_enough_points'
+    if message.startswith(Messages.NOT_ENOUGH_PLACES.partition('{')[0]):
+        return 'not_enough_places'
+    return 'error'
+
+
+BOOKING_OUTCOMES = {
+    Messages.BOOKING_COMPLETE: 'booked',
+    Messages.COMPETITION_EXPIRED: 'expired',
+    Messages.MAX_PLACES_EXCEEDED: 'max_exceeded',
+    Messages.INVALID_PLACES: 'invalid',
+    Messages.SOMETHING_WENT_WRONG: 'not_found',
+}
+
+
+def applyBookings(bookings):
+    """Applique en mémoire puis persiste, en une seule fois, des réservations validées
+
+    Retourne l'attente de persistance (voir commitBookings), à appeler une
+    fois les verrous des réservations relâchés.
+    """
+    for club, competition, placesRequired in bookings:
+        # Décrémenter les places de la compétition
+        competition.numberOfPlaces -= placesRequired
+
+        # Décrémenter les points du club
+        club.points -= placesRequired
+    data_version.bump()
+
+    # bug fix #2 : update jsons compétitions et clubs
+    waitCommitted = commitBookings(bookings)
+    publishBookings(bookings)
+    return waitCommitted
+
+
+def publishBookings(bookings):
+    """Diffuse aux abonnés de /events les nouvelles places et points
+
+    Appelée sous les verrous des clubs et compétitions concernés : les
+    valeurs publiées pour un même club ou une même compétition se suivent
+    dans l'ordre des réservations.
+    """
+    event_hub.publish('booking', {
+        'competitions': {competition.name: competition.numberOfPlaces for _, competition, _ in bookings},
+        'clubs': {club.name: club.points for club, _, _ in bookings},
+    })
+
+
+def bookPlaces(clubName, competitionName, places):
+    """Valide puis applique une réservation ; retourne (club, message flash)
+
+    La lecture des points et des places, la validation et l'écriture se
+    font sous les verrous du club et de la compétition : deux achats
+    concurrents ne peuvent ni dépasser la capacité ni dépenser deux fois
+    les mêmes points. En commit groupé, l'attente du disque se fait après
+    les avoir relâchés. Doit être appelée dans dataWriteLock().
+    """
+    # bug fix 4 : unknown club or competition on purchase
+    competition = competitions_by_name.get(competitionName)
+    club = clubs_by_name.get(clubName)
+
+    if competition is None or club is None:
+        return {"name": clubName}, Messages.SOMETHING_WENT_WRONG  # ← Utilise la config
+
+    placesRequired = int(places)
+
+    with booking_locks.hold(('club', club.name), ('competition', competition.name)):
+        error = checkBooking(competition, placesRequired, club.points)
+        if error is not None:
+            return club, error
+        waitCommitted = applyBookings([(club, competition, placesRequired)])
+
+    waitCommitted()
+    return club, Messages.BOOKING_COMPLETE  # ← Utilise la config
+
+
+def bookBatch(clubName, items):
+    """Valide puis applique un lot de réservations d'un club, tout ou rien
+
+    items : liste de couples (nom de compétition, places). Chaque demande
+    doit être un nombre entier de places positif ; les demandes sur une même
+    compétition sont ensuite cumulées avant validation. Retourne
+    (club, erreurs) où erreurs est une liste de (compétition, message) ;
+    si elle n'est pas vide, rien n'a été réservé. Doit être appelée dans
+    dataWriteLock().
+    """
+    club = clubs_by_name.get(clubName)
+    if club is None:
+        return {"name": clubName}, [(None, Messages.CLUB_NOT_FOUND)]
+
+    requested = {}
+    errors = []
+    for competitionName, places in items:
+        competition = competitions_by_name.get(competitionName)
+        if competition is None:
+            errors.append((competitionName, Messages.COMPETITION_NOT_FOUND))
+            continue
+        # JSON : true vaudrait 1 place et 2.9 serait tronqué à 2
+        if isinstance(places, (bool, float)):
+            errors.append((competitionName, Messages.INVALID_PLACES))
+            continue
+        try:
+            placesRequired = int(places)
+        except (TypeError, ValueError):
+            errors.append((competitionName, Messages.INVALID_PLACES))
+            continue
+        # Vérifié avant le cumul : une demande négative ne doit pas se
+        # compenser avec une autre demande sur la même compétition
+        if placesRequired < 1:
+            errors.append((competitionName, Messages.INVALID_PLACES))
+            continue
+        previous = requested.get(competition.name, (competition, 0))[1]
+        requested[competition.name] = (competition, previous + placesRequired)
+
+    if not errors and not requested:
+        errors.append((None, Messages.EMPTY_BATCH))
+    if errors:
+        return club, errors
+
+    keys = [('club', club.name)] + [('competition', name) for name in requested]
+    with booking_locks.hold(*keys):
+        pointsLeft = club.points
+        for competition, placesRequired in requested.values():
+            error = checkBooking(competition, placesRequired, pointsLeft)
+            if error is not None:
+                errors.append((competition.name, error))
+            else:
+                pointsLeft -= placesRequired
+        if errors:
+            return club, errors
+        waitCommitted = applyBookings([(club, competition, placesRequired)
+                                       for competition, placesRequired in requested.values()])
+
+    waitCommitted()
+    return club, []
 
 
 app = Flask(__name__)
 # Load the secret key from environment variable
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key-for-testing')
+app.config.from_object(Settings)
+
+
+# /events reste ouvert tant que le navigateur est connecté
+UNTIMED_ROUTES = frozenset({'metrics', 'events', 'static'})
+STATUS_OUTCOMES = {4: 'client_error', 5: 'error'}
+
+
+# Enregistrés avant les autres hooks : le chronomètre démarre en premier et
+# l'after_request s'exécute en dernier (ordre inverse d'enregistrement)
+@app.before_request
+def startRequestTimer():
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def recordRequestMetrics(response):
+    """Durée de la requête par route et issue (g.outcome, sinon d'après le statut)"""
+    route = request.endpoint or 'unmatched'
+    if route not in UNTIMED_ROUTES and 'request_start' in g:
+        outcome = g.get('outcome') or STATUS_OUTCOMES.get(response.status_code // 100, 'ok')
+        request_duration.observe(time.perf_counter() - g.request_start, route, outcome)
+    return response
+
+
+@before_render_template.connect_via(app)
+def startRenderTimer(sender, template, context, **extra):
+    g.setdefault('render_starts', []).append(time.perf_counter())
 
-competitions = loadCompetitions()
-clubs = loadClubs()
+
+@template_rendered.connect_via(app)
+def recordRenderMetrics(sender, template, context, **extra):
+    starts = g.get('render_starts')
+    if starts:
+        render_duration.observe(time.perf_counter() - starts.pop(), template.name)
+
+
+clubs = []
+competitions = []
+repository = None
+journal = None
+committer = None
+coherence = None
+write_behind = None
+initStorage()
+atexit.register(closeStorage)
+
+
+def createCompressor():
+    """Compresseur des réponses selon la configuration, ou None si désactivé"""
+    if not app.config['COMPRESSION']:
+        return None
+    return ResponseCompressor(
+        min_size=app.config['COMPRESSION_MIN_SIZE'],
+        gzip_level=app.config['COMPRESSION_GZIP_LEVEL'],
+        brotli_quality=app.config['COMPRESSION_BROTLI_QUALITY'],
+    )
+
+
+compressor = createCompressor()
+
+# Abonnés au flux /events des places et points mis à jour
+event_hub = EventHub(capacity=app.config['EVENTS_BUFFER_SIZE'], heartbeat=app.config['EVENTS_HEARTBEAT_S'])
+atexit.register(event_hub.close)
+
+
+def createProfiler():
+    """Profileur des requêtes, ou None si ni PROFILE ni PROFILE_SECRET ne sont définis"""
+    if not app.config['PROFILE'] and not app.config['PROFILE_SECRET']:
+        return None
+    return RequestProfiler(
+        app.config['PROFILE_DIR'],
+        enabled=app.config['PROFILE'],
+        routes=[route.strip() for route in app.config['PROFILE_ROUTES'].split(',') if route.strip()],
+        every=app.config['PROFILE_EVERY'],
+        secret=app.config['PROFILE_SECRET'],
+        keep=app.config['PROFILE_KEEP'],
+    )
+
+
+profiler = createProfiler()
+
+
+@app.before_request
+def startProfile():
+    if profiler is not None and profiler.should_profile(request.endpoint, request.headers.get('X-Profile')):
+        started = profiler.start()
+        if started is not None:
+            g.profile = started
+
+
+@app.after_request
+def stopProfile(response):
+    """Écrit le profil de la requête ; le corps d'une réponse en flux n'y figure pas"""
+    started = g.pop('profile', None)
+    if started is not None:
+        response.headers['X-Profile-File'] = profiler.stop(started, request.endpoint or 'unmatched')
+    return response
+
+
+def renderPage(template, **context):
+    """Rend une page entière, ou en flux si STREAM_TEMPLATES est activé
+
+    En flux, l'en-tête et les messages flash partent avant les lignes des
+    tableaux. La session étant enregistrée avant l'envoi du corps, les
+    messages flash en sont retirés avant le début du rendu.
+    """
+    if not app.config['STREAM_TEMPLATES']:
+        return render_template(template, **context)
+    get_flashed_messages()
+    return app.response_class(stream_template(template, **context))
+
+
+@app.before_request
+def refreshData():
+    """Recharge les données modifiées par un autre worker (MULTIPROCESS)"""
+    if coherence is not None:
+        coherence.refresh()
 
 
 @app.route('/')
 def index():
-    return render_template('index.html', clubs=clubs)
+    # Le tableau des points est partagé par tous les visiteurs ; les messages
+    # flash restent rendus par index.html, hors du fragment mis en cache
+    version = data_version.value
+    cached = fragment_cache.lookup('club_points', version)
+    points_table = fragment_cache.get_or_render(
+        'club_points', version, lambda: render_template('club_points_table.html', clubs=clubs))
+    response = app.make_response(renderPage('index.html', points_table=Markup(points_table)))
+    response.headers['X-Fragment-Cache'] = 'hit' if cached else 'miss'
+    if not get_flashed_messages():
+        # Sans message flash, la page entière ne dépend que des données
+        g.cacheable_page = ('index.html', version)
+    return response
 
 
 @app.route('/showSummary', methods=['POST'])
 def showSummary():
-    club_list = [club for club in clubs if club['email'] == request.form['email']]
+    club = clubs_by_email.get(request.form['email'])
     # bug fix #1 : unknown email on login
-    if not club_list:
+    if club is None:
+        g.outcome = 'not_found'
         flash(Messages.CLUB_NOT_FOUND)  # ← Utilise la config
         return redirect(url_for('index'))
-    club = club_list[0]
-    return render_template('welcome.html', club=club, competitions=competitions)
+    return renderPage('welcome.html', club=club, competitions=competition_timeline.upcoming())
 
 
 @app.route('/book/<club>/<competition>')
 def book(club, competition):
     # bug fix 3 : unknown club or competition on booking
-    foundClub_list = [c for c in clubs if c['name'] == club]
-    foundCompetition_list = [c for c in competitions if c['name'] == competition]
+    foundClub = clubs_by_name.get(club)
+    foundCompetition = competitions_by_name.get(competition)
 
-    if not foundClub_list:
+    if foundClub is None:
+        g.outcome = 'not_found'
         flash(Messages.CLUB_NOT_FOUND)  # ← Utilise la config
-        return render_template('welcome.html', club={"name": club}, competitions=competitions)
-    elif not foundCompetition_list:
+        return renderPage('welcome.html', club={"name": club}, competitions=competition_timeline.upcoming())
+    elif foundCompetition is None:
+        g.outcome = 'not_found'
         flash(Messages.COMPETITION_NOT_FOUND)  # ← Utilise la config
-        return render_template('welcome.html', club={"name": club}, competitions=competitions)
+        return renderPage('welcome.html', club={"name": club}, competitions=competition_timeline.upcoming())
     else:
-        foundClub = foundClub_list[0]
-        foundCompetition = foundCompetition_list[0]
-
         # Vérifier si la compétition est dans le passé
-        competition_date = datetime.strptime(foundCompetition['date'], '%Y-%m-%d %H:%M:%S')
-        current_date = datetime.now()
-
-        if competition_date < current_date:
+        if competition_timeline.is_expired(foundCompetition):
+            g.outcome = 'expired'
             flash(Messages.COMPETITION_EXPIRED)
-            return render_template('welcome.html', club=foundClub, competitions=competitions)
+            return renderPage('welcome.html', club=foundClub, competitions=competition_timeline.upcoming())
 
         return render_template('booking.html', club=foundClub, competition=foundCompetition)
 
 
 @app.route('/purchasePlaces', methods=['POST'])
 def purchasePlaces():
-    # bug fix 4 : unknown club or competition on purchase
-    competition_list = [c for c in competitions if c['name'] == request.form['competition']]
-    club_list = [c for c in clubs if c['name'] == request.form['club']]
-
-    if not competition_list or not club_list:
-        flash(Messages.SOMETHING_WENT_WRONG)  # ← Utilise la config
-        return render_template('welcome.html', club={"name": request.form['club']}, competitions=competitions)
-
-    competition = competition_list[0]
-    club = club_list[0]
-    placesRequired = int(request.form['places'])
-
-    # Convertir les valeurs JSON en entiers pour éviter les erreurs de type
-    club_points = int(club['points'])
-    competition_places = int(competition['numberOfPlaces'])
-
-    # Vérifier si la compétition est dans le passé
-    competition_date = datetime.strptime(competition['date'], '%Y-%m-%d %H:%M:%S')
-    current_date = datetime.now()
-
-    if competition_date < current_date:
-        flash(Messages.COMPETITION_EXPIRED)
-        return render_template('welcome.html', club=club, competitions=competitions)
-
-    # Limiter à 12 places maximum
-    if placesRequired > Messages.MAX_PLACES_PER_BOOKING:  # ← Utilise la config
-        flash(Messages.MAX_PLACES_EXCEEDED)  # ← Utilise la config
-        return render_template('welcome.html', club=club, competitions=competitions)
-
-    # Vérifier si le club a assez de points
-    if club_points < placesRequired:
-        flash(Messages.format_not_enough_points(placesRequired, club_points))  # ← Utilise la config
-        return render_template('welcome.html', club=club, competitions=competitions)
-
-    # Décrémenter les places de la compétition
-    competition['numberOfPlaces'] = competition_places - placesRequired
-
-    # Décrémenter les points du club
-    club['points'] = club_points - placesRequired
-
-    # bug fix #2 : update jsons compétitions et clubs
-    saveCompetitions()
-    saveClubs()
-
-    flash(Messages.BOOKING_COMPLETE)  # ← Utilise la config
-    return render_template('welcome.html', club=club, competitions=competitions)
+    with bookingInFlight(), dataWriteLock():
+        club, message = bookPlaces(request.form['club'], request.form['competition'], request.form['places'])
+    g.outcome = bookingOutcome(message)
+    flash(message)
+    return renderPage('welcome.html', club=club, competitions=competition_timeline.upcoming())
+
+
+@app.route('/purchasePlacesBatch', methods=['POST'])
+def purchasePlacesBatch():
+    """Réservations multiples d'un club en une requête (formulaire ou JSON)
+
+    JSON : {"club": "...", "bookings": [{"competition": "...", "places": 2}, ...]}
+    Formulaire : un champ club, et des champs competition / places répétés.
+    """
+    if request.is_json:
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict):
+            # Liste, chaîne ou nombre JSON : même refus qu'un lot mal formé
+            payload = {}
+        clubName = payload.get('club')
+        entries = payload.get('bookings')
+        # Les noms servent de clés aux index : une liste ou un objet lèverait TypeError
+        if (not isinstance(clubName, str) or not isinstance(entries, list)
+                or not all(isinstance(entry, dict) and isinstance(entry.get('competition'), str)
+                           for entry in entries)):
+            return jsonify(club=clubName, errors=[{'competition': None, 'message': Messages.EMPTY_BATCH}]), 400
+        items = [(entry.get('competition'), entry.get('places')) for entry in entries]
+    else:
+        clubName = request.form.get('club')
+        items = list(zip(request.form.getlist('competition'), request.form.getlist('places')))
+
+    with bookingInFlight(), dataWriteLock():
+        club, errors = bookBatch(clubName, items)
+
+    if request.is_json:
+        if errors:
+            return jsonify(club=clubName,
+                           errors=[{'competition': name, 'message': message} for name, message in errors]), 400
+        booked = {name for name, _ in items}
+        return jsonify(club=club.name, points=club.points,
+                       competitions=[{'name': competition.name, 'numberOfPlaces': competition.numberOfPlaces}
+                                     for competition in map(competitions_by_name.get, sorted(booked))])
+
+    for _, message in errors:
+        flash(message)
+    if not errors:
+        flash(Messages.BOOKING_COMPLETE)
+    return renderPage('welcome.html', club=club, competitions=competition_timeline.upcoming())
+
+
+def versionedJson(resource, build):
+    """Réponse JSON avec ETag fort dérivé de la version des données
+
+    Si le client présente l'ETag courant (If-None-Match), la réponse est un
+    304 sans corps : build() n'est pas appelé.
+    """
+    version = data_version.value
+    etag = f'{resource}-{data_version.tag}'
+    # Comparaison faible : la version compressée porte un ETag faible
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        response = jsonify(build())
+        g.cacheable_page = (resource, version)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+@app.route('/api/clubs')
+def apiClubs():
+    """Points des clubs (mêmes données que le tableau public de l'accueil)"""
+    return versionedJson('clubs', lambda: {
+        'clubs': [{'name': club.name, 'points': club.points} for club in clubs]
+    })
+
+
+@app.route('/api/competitions')
+def apiCompetitions():
+    """Compétitions avec leur date et leurs places restantes"""
+    return versionedJson('competitions', lambda: {
+        'competitions': [competition.to_dict() for competition in competitions]
+    })
+
+
+@app.route('/events')
+def events():
+    """Flux Server-Sent Events des réservations (places et points mis à jour)"""
+    last_id = request.headers.get('Last-Event-ID', type=int)
+    response = app.response_class(event_hub.stream(last_id), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Pas de mise en tampon par un proxy nginx
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@app.after_request
+def compressResponse(response):
+    """Compresse la réponse selon Accept-Encoding (voir web.compression)"""
+    if compressor is None:
+        return response
+    page = g.get('cacheable_page')
+    if page is None:
+        return compressor.apply(response, request.accept_encodings)
+    name, version = page
+
+    def cached(encoding, produce):
+        # Octets compressés conservés pour la même version des données
+        return compressed_cache.get_or_render(f'{name}:{encoding}', version, produce)
+    return compressor.apply(response, request.accept_encodings, cached)
+
+
+@app.route('/metrics')
+def metrics():
+    """Métriques du processus au format texte Prometheus"""
+    return app.response_class(metrics_registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def requireProfilerAccess():
+    """404 si le profilage est inactif ou sans secret ; secret exigé dans l'en-tête X-Profile
+
+    Jamais dans l'URL : elle figure dans les journaux d'accès et des proxys.
+    """
+    if profiler is None or not profiler.secret:
+        abort(404)
+    if not profiler.has_secret(request.headers.get('X-Profile')):
+        abort(403)
+
+
+@app.route('/profiles')
+def profiles():
+    """Liste des profils récents, par route"""
+    requireProfilerAccess()
+    return render_template('profiles.html', profiles=profiler.recent())
+
+
+@app.route('/profiles/<name>')
+def profileFile(name):
+    """Téléchargement d'un profil (.prof) ou de son résumé (.txt)"""
+    requireProfilerAccess()
+    return send_from_directory(os.path.abspath(profiler.directory), name, as_attachment=name.endswith('.prof'))
 
 
 @app.route('/logout')
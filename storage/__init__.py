@@ -0,0 +1,34 @@
+"""
+Couche de données de l'application (index en mémoire, persistance)
+"""
+from storage.coherence import DataCoherence
+from storage.files import write_json_atomic
+from storage.group_commit import GroupCommitter
+from storage.index import KeyedIndex, normalize_email
+from storage.journal import BookingJournal
+from storage.locks import LockTable
+from storage.models import Club, Competition
+from storage.repository import JsonRepository, Repository
+from storage.sqlite import SqliteRepository, import_from_json
+from storage.timeline import CompetitionTimeline
+from storage.version import DataVersion
+from storage.write_behind import WriteBehindFlusher
+
+__all__ = [
+    'BookingJournal',
+    'Club',
+    'Competition',
+    'CompetitionTimeline',
+    'DataCoherence',
+    'DataVersion',
+    'GroupCommitter',
+    'JsonRepository',
+    'KeyedIndex',
+    'LockTable',
+    'Repository',
+    'SqliteRepository',
+    'WriteBehindFlusher',
+    'import_from_json',
+    'normalize_email',
+    'write_json_atomic',
+]
@@ -0,0 +1,101 @@
+"""
+Cohérence des données entre plusieurs processus (workers gunicorn)
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows : verrouillage limité au processus courant
+    fcntl = None
+
+
+class DataCoherence:
+    """Verrou fichier partagé et détection des modifications externes
+
+    La version des données est l'empreinte (inode, mtime, taille) des
+    fichiers surveillés : un simple os.stat par fichier suffit à savoir si
+    un autre processus a écrit depuis le dernier chargement. Les écritures
+    se font en lecture-modification-écriture sous verrou exclusif.
+    """
+
+    def __init__(self, lock_path, watched_paths, reload, poll_interval=None):
+        self._watched_paths = watched_paths
+        self._reload = reload
+        # Sous gevent, un flock bloquant figerait tous les greenlets du
+        # worker : le verrou est alors demandé sans blocage, avec une attente
+        # coopérative de poll_interval secondes entre deux essais
+        self._poll_interval = poll_interval
+        self._thread_lock = threading.Lock()
+        self._fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._seen = self.current_version()
+        self.reloads = 0
+
+    def current_version(self):
+        """Empreinte actuelle des fichiers de données"""
+        version = []
+        for path in self._watched_paths():
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                version.append(None)
+            else:
+                version.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+        return tuple(version)
+
+    def is_stale(self):
+        return self.current_version() != self._seen
+
+    def _flock(self, operation):
+        if fcntl is None:
+            return
+        if self._poll_interval is None or operation == 'LOCK_UN':
+            fcntl.flock(self._fd, getattr(fcntl, operation))
+            return
+        while True:
+            try:
+                fcntl.flock(self._fd, getattr(fcntl, operation) | fcntl.LOCK_NB)
+                return
+            except BlockingIOError:
+                time.sleep(self._poll_interval)
+
+    def _reload_if_stale(self):
+        version = self.current_version()
+        if version == self._seen:
+            return False
+        self._reload()
+        self._seen = version
+        self.reloads += 1
+        return True
+
+    def refresh(self):
+        """Recharge les données si un autre processus les a modifiées"""
+        if not self.is_stale():
+            return False
+        with self._thread_lock:
+            self._flock('LOCK_SH')
+            try:
+                return self._reload_if_stale()
+            finally:
+                self._flock('LOCK_UN')
+
+    @contextmanager
+    def write_lock(self):
+        """Section critique inter-processus avec données rafraîchies à l'entrée
+
+        Les modifications faites dans le bloc sont considérées comme vues :
+        elles ne déclenchent pas de rechargement dans ce processus.
+        """
+        with self._thread_lock:
+            self._flock('LOCK_EX')
+            try:
+                self._reload_if_stale()
+                yield
+                self._seen = self.current_version()
+            finally:
+                self._flock('LOCK_UN')
+
+    def close(self):
+        os.close(self._fd)
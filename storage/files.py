@@ -0,0 +1,24 @@
+"""
+Écriture des fichiers de données JSON
+"""
+import json
+import os
+import threading
+
+
+def write_json_atomic(path, data, durable=False):
+    """Écrit data dans path via un fichier temporaire renommé
+
+    Un lecteur (ou un redémarrage après crash) ne voit jamais un fichier
+    à moitié écrit. Avec durable=True, le contenu est forcé sur disque
+    (fsync) avant le renommage.
+    """
+    # Nom temporaire propre au thread et au processus : deux écrivains
+    # concurrents ne partagent jamais le même fichier intermédiaire
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'w') as file:
+        json.dump(data, file, indent=4)
+        if durable:
+            file.flush()
+            os.fsync(file.fileno())
+    os.replace(tmp_path, path)
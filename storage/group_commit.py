@@ -0,0 +1,130 @@
+"""
+Commit groupé : un unique thread écrivain persiste les réservations par lots
+"""
+import threading
+import time
+from collections import deque
+
+
+def percentile(sorted_values, fraction):
+    """Percentile (méthode du rang le plus proche) d'une liste déjà triée"""
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+class _Ticket:
+    __slots__ = ('item', 'enqueued_at', 'done', 'error')
+
+    def __init__(self, item):
+        self.item = item
+        self.enqueued_at = time.monotonic()
+        self.done = threading.Event()
+        self.error = None
+
+
+class GroupCommitter:
+    """Regroupe les mutations concurrentes en une seule écriture durable
+
+    Chaque appel à submit() met la mutation en file et bloque jusqu'à ce
+    que le lot qui la contient soit sur disque. L'écrivain attend au plus
+    max_wait secondes après la première mutation d'un lot, ou s'arrête dès
+    que max_batch mutations sont en attente.
+    """
+
+    def __init__(self, flush, max_batch=64, max_wait=0.005, history=10000):
+        self._flush = flush
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._latencies = deque(maxlen=history)
+        self.batches = 0
+        self.commits = 0
+        self._thread = threading.Thread(target=self._run, name='group-commit', daemon=True)
+        self._thread.start()
+
+    def submit(self, item):
+        """Met une mutation en file et attend que son lot soit persisté"""
+        self.submit_many([item])
+
+    def submit_many(self, items):
+        """Met plusieurs mutations en file ensemble et attend qu'elles soient persistées"""
+        self.wait(self.enqueue_many(items))
+
+    def enqueue_many(self, items):
+        """Met des mutations en file sans attendre ; retourne les tickets à passer à wait()
+
+        Permet de mettre en file sous un verrou et d'attendre le disque après
+        l'avoir relâché : les mutations concurrentes rejoignent alors le même lot.
+        """
+        tickets = [_Ticket(item) for item in items]
+        with self._cond:
+            if self._closed:
+                raise RuntimeError('GroupCommitter is closed')
+            self._queue.extend(tickets)
+            self._cond.notify()
+        return tickets
+
+    def wait(self, tickets):
+        """Attend que les tickets soient persistés ; relève l'erreur d'écriture éventuelle"""
+        for ticket in tickets:
+            ticket.done.wait()
+        for ticket in tickets:
+            if ticket.error is not None:
+                raise ticket.error
+
+    def _next_batch(self):
+        with self._cond:
+            while not self._queue and not self._closed:
+                self._cond.wait()
+            if not self._queue:
+                return None
+            deadline = self._queue[0].enqueued_at + self.max_wait
+            while len(self._queue) < self.max_batch and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            size = min(len(self._queue), self.max_batch)
+            return [self._queue.popleft() for _ in range(size)]
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            error = None
+            try:
+                self._flush([ticket.item for ticket in batch])
+            except Exception as exc:  # transmis aux requêtes en attente
+                error = exc
+            now = time.monotonic()
+            self.batches += 1
+            self.commits += len(batch)
+            for ticket in batch:
+                ticket.error = error
+                self._latencies.append(now - ticket.enqueued_at)
+                ticket.done.set()
+
+    def latency_summary(self):
+        """Distribution des latences de commit (secondes) et taille moyenne des lots"""
+        values = sorted(self._latencies)
+        return {
+            'commits': self.commits,
+            'batches': self.batches,
+            'mean_batch_size': self.commits / self.batches if self.batches else 0.0,
+            'p50': percentile(values, 0.50),
+            'p90': percentile(values, 0.90),
+            'p99': percentile(values, 0.99),
+            'max': values[-1] if values else 0.0,
+        }
+
+    def close(self):
+        """Persiste les mutations en attente puis arrête l'écrivain"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
@@ -0,0 +1,31 @@
+"""
+Import ponctuel des fichiers clubs.json / competitions.json dans SQLite
+
+Usage:
+    python -m storage.import_json --db gudlft.sqlite3
+    python -m storage.import_json --data-dir test/data/testing --db /tmp/gudlft.sqlite3
+"""
+import argparse
+import os
+
+from storage.repository import JsonRepository
+from storage.sqlite import SqliteRepository, import_from_json
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--data-dir', default='.', help='Dossier contenant clubs.json et competitions.json')
+    parser.add_argument('--db', default='gudlft.sqlite3', help='Base SQLite cible')
+    args = parser.parse_args(argv)
+
+    source = JsonRepository(lambda filename: os.path.join(args.data_dir, filename))
+    target = SqliteRepository(args.db)
+    try:
+        nb_clubs, nb_competitions = import_from_json(source, target)
+    finally:
+        target.close()
+    print(f'{nb_clubs} clubs et {nb_competitions} compétitions importés dans {args.db}')
+
+
+if __name__ == '__main__':
+    main()
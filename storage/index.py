@@ -0,0 +1,59 @@
+"""
+Index en mémoire pour les recherches de clubs et de compétitions
+"""
+from operator import attrgetter
+
+
+def normalize_email(email):
+    """Normalise un email pour la recherche (espaces et casse ignorés)"""
+    return email.strip().lower()
+
+
+class KeyedIndex:
+    """Table de hachage clé -> enregistrement, pour des recherches en O(1)
+
+    L'index conserve une référence vers les enregistrements eux-mêmes :
+    les mises à jour en place (points, places) sont donc visibles sans
+    reconstruction. Seuls les ajouts/suppressions passent par add/discard.
+    """
+
+    def __init__(self, field, normalize=None):
+        self.field = field
+        self._get_field = attrgetter(field)
+        self._normalize = normalize
+        self._entries = {}
+
+    def _key(self, value):
+        if self._normalize is not None and isinstance(value, str):
+            return self._normalize(value)
+        return value
+
+    def rebuild(self, records):
+        """Reconstruit l'index à partir d'une liste d'enregistrements"""
+        entries = {}
+        for record in records:
+            # Le premier enregistrement l'emporte, comme l'ancien parcours de liste
+            entries.setdefault(self._key(self._get_field(record)), record)
+        self._entries = entries
+
+    def add(self, record):
+        """Indexe un nouvel enregistrement"""
+        self._entries.setdefault(self._key(self._get_field(record)), record)
+
+    def discard(self, record):
+        """Retire un enregistrement de l'index s'il y figure"""
+        key = self._key(self._get_field(record))
+        if self._entries.get(key) is record:
+            del self._entries[key]
+
+    def get(self, value, default=None):
+        """Retourne l'enregistrement associé à la clé, ou default"""
+        if value is None:
+            return default
+        return self._entries.get(self._key(value), default)
+
+    def __contains__(self, value):
+        return self.get(value) is not None
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,130 @@
+"""
+Journal append-only des réservations (write-ahead log)
+"""
+import json
+import os
+import threading
+
+
+class BookingJournal:
+    """Journal des réservations, un enregistrement JSON compact par ligne
+
+    Chaque enregistrement contient les valeurs absolues après réservation
+    (points du club, places de la compétition) : rejouer deux fois le même
+    enregistrement est sans effet, ce qui rend la compaction sûre même si
+    le processus s'arrête entre l'écriture du snapshot et la troncature.
+    """
+
+    def __init__(self, path, snapshot_threshold=500):
+        self.path = path
+        self.snapshot_threshold = snapshot_threshold
+        self._lock = threading.Lock()
+        self.discard_torn_tail()
+        self._file = open(path, 'a')
+        self._count = sum(1 for _ in self.read())
+
+    def discard_torn_tail(self):
+        """Tronque le journal après sa dernière ligne complète
+
+        Un arrêt pendant l'écriture laisse une ligne sans fin : sans troncature,
+        l'enregistrement suivant serait collé à ce fragment et perdu au rejeu.
+        """
+        try:
+            file = open(self.path, 'rb+')
+        except FileNotFoundError:
+            return
+        with file:
+            end = file.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                size = min(4096, position)
+                file.seek(position - size)
+                newline = file.read(size).rfind(b'\n')
+                if newline != -1:
+                    position = position - size + newline + 1
+                    break
+                position -= size
+            if position != end:
+                file.truncate(position)
+                file.flush()
+                os.fsync(file.fileno())
+
+    def __len__(self):
+        return self._count
+
+    @staticmethod
+    def booking_record(club, competition, places):
+        """Construit l'enregistrement d'une réservation déjà appliquée"""
+        return {
+            'club': club.name,
+            'competition': competition.name,
+            'places': places,
+            'points': club.points,
+            'numberOfPlaces': competition.numberOfPlaces,
+        }
+
+    def append(self, record):
+        """Ajoute un enregistrement et le force sur disque (fsync)"""
+        self.append_many([record])
+
+    def append_many(self, records):
+        """Ajoute plusieurs enregistrements avec un seul fsync"""
+        data = ''.join(json.dumps(record, separators=(',', ':')) + '\n' for record in records)
+        with self._lock:
+            self._file.write(data)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._count += len(records)
+
+    def read(self):
+        """Parcourt les enregistrements du journal
+
+        Une ligne illisible (fin tronquée par un arrêt pendant l'écriture) est
+        ignorée sans interrompre la lecture des suivantes.
+        """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path) as file:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def replay(self, clubs_by_name, competitions_by_name):
+        """Réapplique le journal sur les données chargées depuis le snapshot
+
+        Le compteur de compaction est recalé sur le contenu du fichier, qui
+        peut avoir été complété par un autre processus.
+        """
+        applied = 0
+        for record in self.read():
+            club = clubs_by_name.get(record['club'])
+            competition = competitions_by_name.get(record['competition'])
+            if club is not None:
+                club.points = record['points']
+            if competition is not None:
+                competition.numberOfPlaces = record['numberOfPlaces']
+            applied += 1
+        self._count = applied
+        return applied
+
+    def needs_snapshot(self):
+        """Indique si le seuil de compaction est atteint"""
+        return self._count >= self.snapshot_threshold
+
+    def compact(self, write_snapshot):
+        """Écrit un snapshot puis vide le journal
+
+        Le verrou empêche tout ajout entre le snapshot et la troncature.
+        """
+        with self._lock:
+            write_snapshot()
+            self._file.truncate(0)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._count = 0
+
+    def close(self):
+        with self._lock:
+            self._file.close()
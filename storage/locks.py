@@ -0,0 +1,42 @@
+"""
+Verrous fins par club et par compétition
+"""
+import threading
+from contextlib import contextmanager
+
+
+class LockTable:
+    """Un verrou par clé, créé à la demande
+
+    hold() acquiert toujours les verrous dans l'ordre trié des clés : deux
+    réservations qui se partagent un club ou une compétition ne peuvent pas
+    s'interbloquer, et celles qui ne partagent rien s'exécutent en parallèle.
+    """
+
+    def __init__(self):
+        self._locks = {}
+        self._guard = threading.Lock()
+
+    def _lock_for(self, key):
+        lock = self._locks.get(key)
+        if lock is None:
+            with self._guard:
+                lock = self._locks.setdefault(key, threading.Lock())
+        return lock
+
+    @contextmanager
+    def hold(self, *keys):
+        """Acquiert les verrous des clés données (tuples comparables)"""
+        acquired = []
+        try:
+            for key in sorted(set(keys)):
+                lock = self._lock_for(key)
+                lock.acquire()
+                acquired.append(lock)
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
+
+    def __len__(self):
+        return len(self._locks)
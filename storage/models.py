@@ -0,0 +1,44 @@
+"""
+Enregistrements typés des clubs et compétitions
+Les valeurs sont converties une seule fois, au chargement.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+@dataclass(slots=True)
+class Club:
+    """Club inscrit : points stockés en entier"""
+    name: str
+    email: str
+    points: int
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(name=data['name'], email=data['email'], points=int(data['points']))
+
+    def to_dict(self):
+        return {'name': self.name, 'email': self.email, 'points': self.points}
+
+
+@dataclass(slots=True)
+class Competition:
+    """Compétition : date analysée une fois, places stockées en entier"""
+    name: str
+    date: datetime
+    numberOfPlaces: int
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(name=data['name'],
+                   date=datetime.strptime(data['date'], DATE_FORMAT),
+                   numberOfPlaces=int(data['numberOfPlaces']))
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'date': self.date.strftime(DATE_FORMAT),
+            'numberOfPlaces': self.numberOfPlaces,
+        }
@@ -0,0 +1,78 @@
+"""
+Interface de stockage des clubs et compétitions, et implémentation JSON
+"""
+import json
+import threading
+from abc import ABC, abstractmethod
+
+from storage.files import write_json_atomic
+from storage.models import Club, Competition
+
+
+class Repository(ABC):
+    """Interface commune des backends de stockage
+
+    Les enregistrements échangés sont des Club et Competition typés. Avec
+    durable=True, une écriture n'est terminée qu'une fois forcée sur disque.
+    """
+
+    @abstractmethod
+    def load_clubs(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_clubs(self, clubs, durable=False):
+        raise NotImplementedError
+
+    @abstractmethod
+    def load_competitions(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_competitions(self, competitions, durable=False):
+        raise NotImplementedError
+
+    @abstractmethod
+    def record_bookings(self, bookings, clubs, competitions, durable=False):
+        """Persiste un lot de réservations (club, competition, places) déjà
+        appliquées aux listes en mémoire clubs et competitions"""
+        raise NotImplementedError
+
+    def close(self):
+        """Libère les ressources du backend"""
+
+
+class JsonRepository(Repository):
+    """Stockage historique : un fichier JSON par collection, réécrit en entier"""
+
+    def __init__(self, path_for):
+        # path_for(filename) résout le chemin au moment de l'accès, ce qui
+        # suit les bascules de l'environnement de test (get_data_path)
+        self._path_for = path_for
+        # Sérialise les réécritures : un snapshot plus ancien ne doit jamais
+        # remplacer un snapshot plus récent écrit par un autre thread
+        self._write_lock = threading.RLock()
+
+    def load_clubs(self):
+        with open(self._path_for('clubs.json')) as file:
+            return [Club.from_dict(data) for data in json.load(file)['clubs']]
+
+    def save_clubs(self, clubs, durable=False):
+        with self._write_lock:
+            data = {'clubs': [club.to_dict() for club in clubs]}
+            write_json_atomic(self._path_for('clubs.json'), data, durable=durable)
+
+    def load_competitions(self):
+        with open(self._path_for('competitions.json')) as file:
+            return [Competition.from_dict(data) for data in json.load(file)['competitions']]
+
+    def save_competitions(self, competitions, durable=False):
+        with self._write_lock:
+            data = {'competitions': [competition.to_dict() for competition in competitions]}
+            write_json_atomic(self._path_for('competitions.json'), data, durable=durable)
+
+    def record_bookings(self, bookings, clubs, competitions, durable=False):
+        # Le format JSON ne permet pas de mise à jour partielle
+        with self._write_lock:
+            self.save_competitions(competitions, durable=durable)
+            self.save_clubs(clubs, durable=durable)
@@ -0,0 +1,116 @@
+"""
+Backend SQLite : mises à jour transactionnelles ligne par ligne (mode WAL)
+"""
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from storage.models import DATE_FORMAT, Club, Competition
+from storage.repository import Repository
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clubs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    email TEXT NOT NULL,
+    points INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_clubs_email ON clubs (email COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS competitions (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    date TEXT NOT NULL,
+    numberOfPlaces INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_competitions_date ON competitions (date);
+"""
+
+
+class SqliteRepository(Repository):
+    """Stockage SQLite, une connexion unique partagée sous verrou
+
+    Une réservation ne touche que deux lignes, dans une seule transaction,
+    au lieu de réécrire l'intégralité des données. SQLite n'admet qu'un
+    écrivain à la fois : une connexion par thread n'apporterait rien, et
+    sous gevent (wsgi.py) chaque greenlet en ouvrirait une nouvelle.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        with self._transaction() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _transaction(self, durable=False):
+        """Connexion réservée au bloc, validée à la sortie (annulée sur exception)
+
+        En mode WAL, synchronous=NORMAL ne force pas le journal sur disque à
+        la validation ; une écriture durable passe le temps de la transaction
+        en synchronous=FULL.
+        """
+        with self._lock:
+            if self._conn is None:
+                raise RuntimeError('SqliteRepository is closed')
+            if durable:
+                self._conn.execute('PRAGMA synchronous=FULL')
+            try:
+                with self._conn:
+                    yield self._conn
+            finally:
+                if durable:
+                    self._conn.execute('PRAGMA synchronous=NORMAL')
+
+    def load_clubs(self):
+        with self._transaction() as conn:
+            rows = conn.execute('SELECT name, email, points FROM clubs ORDER BY id').fetchall()
+        return [Club(row['name'], row['email'], row['points']) for row in rows]
+
+    def save_clubs(self, clubs, durable=False):
+        with self._transaction(durable) as conn:
+            conn.executemany(
+                'INSERT INTO clubs (name, email, points) VALUES (?, ?, ?) '
+                'ON CONFLICT (name) DO UPDATE SET email = excluded.email, points = excluded.points',
+                [(club.name, club.email, club.points) for club in clubs])
+
+    def load_competitions(self):
+        with self._transaction() as conn:
+            rows = conn.execute('SELECT name, date, numberOfPlaces FROM competitions ORDER BY id').fetchall()
+        return [Competition.from_dict(row) for row in rows]
+
+    def save_competitions(self, competitions, durable=False):
+        with self._transaction(durable) as conn:
+            conn.executemany(
+                'INSERT INTO competitions (name, date, numberOfPlaces) VALUES (?, ?, ?) '
+                'ON CONFLICT (name) DO UPDATE SET date = excluded.date, '
+                'numberOfPlaces = excluded.numberOfPlaces',
+                [(competition.name, competition.date.strftime(DATE_FORMAT), competition.numberOfPlaces)
+                 for competition in competitions])
+
+    def record_bookings(self, bookings, clubs, competitions, durable=False):
+        with self._transaction(durable) as conn:
+            for club, competition, places in bookings:
+                conn.execute('UPDATE clubs SET points = points - ? WHERE name = ?',
+                             (places, club.name))
+                conn.execute('UPDATE competitions SET numberOfPlaces = numberOfPlaces - ? WHERE name = ?',
+                             (places, competition.name))
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def import_from_json(source, target):
+    """Copie les clubs et compétitions d'un dépôt (JSON) vers un autre (SQLite)"""
+    clubs = source.load_clubs()
+    competitions = source.load_competitions()
+    target.save_clubs(clubs)
+    target.save_competitions(competitions)
+    return len(clubs), len(competitions)
@@ -0,0 +1,49 @@
+"""
+Index temporel des compétitions
+"""
+from bisect import bisect_left, insort
+from datetime import datetime
+from operator import attrgetter
+
+
+class CompetitionTimeline:
+    """Compétitions triées par date
+
+    La frontière entre compétitions passées et à venir se trouve par
+    bisection : lister les compétitions à venir coûte O(log n + k), k étant
+    le nombre de compétitions à venir, quel que soit l'historique conservé.
+    """
+
+    def __init__(self):
+        self._competitions = []
+        self._dates = []
+
+    def rebuild(self, competitions):
+        """Reconstruit l'index à partir d'une liste de compétitions"""
+        self._competitions = sorted(competitions, key=attrgetter('date'))
+        self._dates = [competition.date for competition in self._competitions]
+
+    def add(self, competition):
+        """Insère une compétition à sa place chronologique"""
+        index = bisect_left(self._dates, competition.date)
+        insort(self._dates, competition.date)
+        self._competitions.insert(index, competition)
+
+    def _boundary(self, now):
+        return bisect_left(self._dates, now or datetime.now())
+
+    def upcoming(self, now=None):
+        """Compétitions non expirées, de la plus proche à la plus lointaine"""
+        return self._competitions[self._boundary(now):]
+
+    def past(self, now=None):
+        """Compétitions expirées, de la plus ancienne à la plus récente"""
+        return self._competitions[:self._boundary(now)]
+
+    @staticmethod
+    def is_expired(competition, now=None):
+        """Indique si la compétition est passée (date déjà analysée au chargement)"""
+        return competition.date < (now or datetime.now())
+
+    def __len__(self):
+        return len(self._competitions)
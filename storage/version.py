@@ -0,0 +1,33 @@
+"""
+Version des données, pour les ETag et l'invalidation des caches
+"""
+import threading
+import uuid
+
+
+class DataVersion:
+    """Compteur incrémenté à chaque modification des données
+
+    L'étiquette combine le compteur et une époque tirée au hasard au
+    démarrage du processus : deux workers (ou deux démarrages successifs)
+    ne produisent jamais la même étiquette pour des données différentes.
+    """
+
+    def __init__(self):
+        self._epoch = uuid.uuid4().hex[:12]
+        self._value = 0
+        self._lock = threading.Lock()
+
+    @property
+    def value(self):
+        return self._value
+
+    @property
+    def tag(self):
+        return f'{self._epoch}-{self._value}'
+
+    def bump(self):
+        """Signale une modification des données ; retourne la nouvelle version"""
+        with self._lock:
+            self._value += 1
+            return self._value
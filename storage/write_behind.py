@@ -0,0 +1,82 @@
+"""
+Persistance différée (write-behind) avec suivi des données modifiées
+"""
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindFlusher:
+    """Marque les réservations comme à persister et les écrit en arrière-plan
+
+    Les réservations sur un même couple (club, compétition) sont fusionnées
+    en une seule entrée. Un thread vide les entrées toutes les `interval`
+    secondes, ou dès que `max_dirty` entrées sont en attente. Une erreur
+    d'écriture remet les entrées en attente pour la tentative suivante.
+    """
+
+    def __init__(self, flush, interval=1.0, max_dirty=100):
+        self._flush = flush
+        self.interval = interval
+        self.max_dirty = max_dirty
+        self._dirty = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self.flushes = 0
+        self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+        self._thread.start()
+
+    @property
+    def dirty_count(self):
+        return len(self._dirty)
+
+    def mark(self, club, competition, places):
+        """Enregistre une réservation déjà appliquée en mémoire"""
+        key = (club.name, competition.name)
+        with self._lock:
+            entry = self._dirty.get(key)
+            if entry is None:
+                self._dirty[key] = [club, competition, places]
+            else:
+                entry[2] += places
+            full = len(self._dirty) >= self.max_dirty
+        if full:
+            self._wakeup.set()
+
+    def flush(self):
+        """Écrit immédiatement les réservations en attente"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._dirty = self._dirty, {}
+            if not pending:
+                return 0
+            try:
+                self._flush([tuple(entry) for entry in pending.values()])
+            except Exception:
+                logger.exception('Write-behind flush failed, %d entries requeued', len(pending))
+                with self._lock:
+                    for key, entry in pending.items():
+                        current = self._dirty.get(key)
+                        if current is None:
+                            self._dirty[key] = entry
+                        else:
+                            current[2] += entry[2]
+                return 0
+            self.flushes += 1
+            return len(pending)
+
+    def _run(self):
+        while not self._stopped:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def close(self):
+        """Arrête le thread puis écrit tout ce qui reste en attente"""
+        self._stopped = True
+        self._wakeup.set()
+        self._thread.join()
+        self.flush()
@@ -0,0 +1,49 @@
+"""
+Fixtures et utilitaires partagés des tests de persistance (journal, différé, commit groupé, multi-processus)
+"""
+import json
+import os
+import signal
+import pytest
+import server
+
+TESTING_DIR = os.path.join('test', 'data', 'testing')
+
+
+def with_storage(name, **config):
+    """Exécute le test décoré avec les réglages de persistance config (fixture storage_mode)"""
+    return pytest.mark.parametrize('storage_mode', [config], indirect=True, ids=[name])
+
+
+@pytest.fixture
+def storage_mode(request, monkeypatch):
+    """Redémarre le stockage avec les réglages reçus en paramètre, puis le ferme
+
+    Le gestionnaire SIGTERM installé par initStorage est remplacé par le
+    précédent à la fin du test.
+    """
+    for key, value in request.param.items():
+        monkeypatch.setitem(server.app.config, key, value)
+    previous = signal.getsignal(signal.SIGTERM)
+    server.initStorage()
+    yield server
+    server.closeStorage()
+    signal.signal(signal.SIGTERM, previous)
+
+
+def book(client, club='Simply Lift', competition='Future Championship', places='1'):
+    return client.post('/purchasePlaces', data={
+        'club': club,
+        'competition': competition,
+        'places': places
+    })
+
+
+def read_json(filename):
+    with open(os.path.join(TESTING_DIR, filename)) as f:
+        return json.load(f)
+
+
+def persisted_points(name):
+    """Points du club tels qu'écrits sur disque"""
+    return {club['name']: club['points'] for club in read_json('clubs.json')['clubs']}[name]
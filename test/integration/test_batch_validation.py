@@ -0,0 +1,68 @@
+"""
+Tests d'intégration des réservations multiples : chaque demande d'un lot est validée
+avant d'être cumulée, et un lot mal typé est refusé sans rien réserver
+"""
+import json
+import pytest
+from config.messages import Messages
+
+
+def snapshot():
+    """Points des clubs et places des compétitions tels qu'écrits sur disque"""
+    with open('test/data/testing/clubs.json') as f:
+        clubs = {club['name']: club['points'] for club in json.load(f)['clubs']}
+    with open('test/data/testing/competitions.json') as f:
+        competitions = {comp['name']: comp['numberOfPlaces'] for comp in json.load(f)['competitions']}
+    return clubs, competitions
+
+
+class TestBatchItemValidation:
+    """Tests de la validation de chaque demande d'un lot"""
+
+    @pytest.mark.parametrize('bookings', [
+        [{'competition': 'Next Year Games', 'places': 5}, {'competition': 'Next Year Games', 'places': -3}],
+        [{'competition': 'Next Year Games', 'places': 2}, {'competition': 'Next Year Games', 'places': 0}],
+        [{'competition': 'Next Year Games', 'places': True}],
+        [{'competition': 'Next Year Games', 'places': 2.9}],
+    ], ids=['negative-netted', 'zero-netted', 'bool', 'float'])
+    def test_invalid_item_rejects_whole_batch(self, client, bookings):
+        """Test qu'une demande invalide n'est ni tronquée ni compensée par une autre"""
+        before = snapshot()
+
+        response = client.post('/purchasePlacesBatch', json={'club': 'Simply Lift', 'bookings': bookings})
+
+        assert response.status_code == 400
+        assert {'competition': 'Next Year Games', 'message': Messages.INVALID_PLACES} in response.json['errors']
+        assert snapshot() == before
+
+    def test_negative_form_item_rejects_whole_batch(self, client):
+        """Test que le formulaire ne compense pas non plus une demande négative"""
+        before = snapshot()
+
+        response = client.post('/purchasePlacesBatch', data={
+            'club': 'Simply Lift',
+            'competition': ['Next Year Games', 'Next Year Games'],
+            'places': ['5', '-3'],
+        })
+
+        assert response.status_code == 200
+        assert Messages.INVALID_PLACES.encode() in response.data
+        assert Messages.BOOKING_COMPLETE.encode() not in response.data
+        assert snapshot() == before
+
+    @pytest.mark.parametrize('payload', [
+        {'club': ['Simply Lift'], 'bookings': [{'competition': 'Next Year Games', 'places': 1}]},
+        {'club': {'name': 'Simply Lift'}, 'bookings': [{'competition': 'Next Year Games', 'places': 1}]},
+        {'club': 'Simply Lift', 'bookings': [{'competition': ['Next Year Games'], 'places': 1}]},
+        {'club': 'Simply Lift', 'bookings': [{'competition': 'Next Year Games', 'places': 1},
+                                             {'competition': {'name': 'Future Championship'}, 'places': 1}]},
+    ], ids=['list-club', 'object-club', 'list-competition', 'object-competition'])
+    def test_non_string_names_are_rejected(self, client, payload):
+        """Test qu'un nom de club ou de compétition non textuel donne un 400, pas une erreur serveur"""
+        before = snapshot()
+
+        response = client.post('/purchasePlacesBatch', json=payload)
+
+        assert response.status_code == 400
+        assert response.json['errors'] == [{'competition': None, 'message': Messages.EMPTY_BATCH}]
+        assert snapshot() == before
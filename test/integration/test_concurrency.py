@@ -0,0 +1,168 @@
+"""
+Tests de concurrence du parcours d'achat
+Plusieurs threads réservent en parallèle : aucune survente, aucun point dépensé deux fois
+"""
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import server
+from config.messages import Messages
+from storage import Club, Competition, LockTable
+
+
+class SlowCounters:
+    """Mixin dont la lecture des compteurs est lente
+
+    Élargit la fenêtre entre lecture et écriture des points/places pour
+    qu'une réservation non protégée soit effectivement prise en défaut.
+    """
+
+    def __getattribute__(self, name):
+        value = object.__getattribute__(self, name)
+        if name in ('points', 'numberOfPlaces'):
+            time.sleep(0.0005)
+        return value
+
+
+class SlowClub(SlowCounters, Club):
+    pass
+
+
+class SlowCompetition(SlowCounters, Competition):
+    pass
+
+
+@pytest.fixture
+def slow_records():
+    """Remplace clubs et compétitions en mémoire par des versions lentes"""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    server.clubs[:] = [SlowClub(club.name, club.email, club.points) for club in server.clubs]
+    server.competitions[:] = [SlowCompetition(c.name, c.date, c.numberOfPlaces) for c in server.competitions]
+    server.clubs_by_name.rebuild(server.clubs)
+    server.clubs_by_email.rebuild(server.clubs)
+    server.competitions_by_name.rebuild(server.competitions)
+    server.competition_timeline.rebuild(server.competitions)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def purchase(club, competition, places=1):
+    with server.app.test_client() as client:
+        response = client.post('/purchasePlaces', data={
+            'club': club,
+            'competition': competition,
+            'places': str(places)
+        })
+    return Messages.BOOKING_COMPLETE.encode() in response.data
+
+
+class TestNoOversell:
+    """Stress test : réservations concurrentes sur une même compétition"""
+
+    def test_concurrent_bookings_never_oversell(self, client, slow_records):
+        """Test que la capacité et les points sont conservés sous concurrence"""
+        competition = server.competitions_by_name.get('Future Championship')
+        competition.numberOfPlaces = 20
+        initial_points = {club.name: club.points for club in server.clubs}
+        total_points = sum(initial_points.values())
+        assert total_points > 20  # assez de demande pour dépasser la capacité
+
+        attempts = [name for name, points in initial_points.items() for _ in range(points)]
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(lambda name: purchase(name, 'Future Championship'), attempts))
+
+        places_sold = sum(results)
+        points_spent = total_points - sum(club.points for club in server.clubs)
+
+        assert places_sold == 20
+        assert competition.numberOfPlaces == 0
+        assert points_spent == places_sold
+        assert all(club.points >= 0 for club in server.clubs)
+
+        # L'état persisté est identique à l'état en mémoire
+        with open('test/data/testing/competitions.json') as f:
+            persisted = {c['name']: c for c in json.load(f)['competitions']}
+        assert persisted['Future Championship']['numberOfPlaces'] == 0
+
+    def test_same_club_concurrent_bookings_never_overspend(self, client, slow_records):
+        """Test qu'un club ne peut pas dépenser deux fois les mêmes points"""
+        club = server.clubs_by_name.get('Iron Temple')  # 4 points
+        competitions = ['Future Championship', 'Next Year Games']
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda i: purchase('Iron Temple', competitions[i % 2]), range(16)))
+
+        assert sum(results) == 4
+        assert club.points == 0
+
+    def test_booking_more_than_remaining_places_refused(self, client):
+        """Test qu'une réservation au-delà des places restantes est refusée"""
+        server.competitions_by_name.get('Future Championship').numberOfPlaces = 2
+
+        response = client.post('/purchasePlaces', data={
+            'club': 'Simply Lift',
+            'competition': 'Future Championship',
+            'places': '3'
+        })
+        assert Messages.format_not_enough_places(3, 2).encode() in response.data
+        assert server.clubs_by_name.get('Simply Lift').points == 15
+
+    def test_negative_places_refused(self, client):
+        """Test qu'une quantité négative ne crédite pas de points"""
+        response = client.post('/purchasePlaces', data={
+            'club': 'Simply Lift',
+            'competition': 'Future Championship',
+            'places': '-5'
+        })
+        assert Messages.INVALID_PLACES.encode() in response.data
+        assert server.clubs_by_name.get('Simply Lift').points == 15
+
+
+class TestLockTable:
+    """Tests des verrous fins"""
+
+    def test_locks_taken_in_fixed_order(self):
+        """Test que des ordres de demande opposés ne s'interbloquent pas"""
+        locks = LockTable()
+        a, b = ('club', 'A'), ('competition', 'B')
+        done = []
+
+        def worker(keys):
+            for _ in range(200):
+                with locks.hold(*keys):
+                    pass
+            done.append(keys)
+
+        threads = [threading.Thread(target=worker, args=((a, b),)),
+                   threading.Thread(target=worker, args=((b, a),))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        assert len(done) == 2
+
+    def test_independent_keys_do_not_block(self):
+        """Test que des réservations sur des compétitions différentes ne se bloquent pas"""
+        locks = LockTable()
+        entered = threading.Event()
+        release = threading.Event()
+
+        def hold_first():
+            with locks.hold(('competition', 'A')):
+                entered.set()
+                release.wait(timeout=5)
+
+        thread = threading.Thread(target=hold_first)
+        thread.start()
+        entered.wait(timeout=5)
+
+        acquired = threading.Event()
+        with locks.hold(('competition', 'B')):
+            acquired.set()
+        release.set()
+        thread.join()
+        assert acquired.is_set()
@@ -0,0 +1,31 @@
+"""
+Tests du harnais de contention : nombreux clubs, une compétition, invariants de conservation
+"""
+import server
+from test.perf.bench_contention import check_invariants, run_harness
+
+
+def test_invariants_detect_violations():
+    """Test que chaque invariant de conservation violé est signalé"""
+    before = {'A': 5, 'B': 5}
+    assert check_invariants(before, {'A': 4, 'B': 3}, 10, 7, confirmed=3) == []
+
+    violations = check_invariants(before, {'A': -1, 'B': 6}, 3, -2, confirmed=4)
+    assert "5 places vendues pour 5 points dépensés" not in violations
+    assert "4 places confirmées pour 5 places vendues" in violations
+    assert "capacité dépassée : -2 places restantes" in violations
+    assert "1 club(s) aux points négatifs : A" in violations
+    assert "1 club(s) ont gagné des points : B" in violations
+    assert check_invariants(before, {'A': 4, 'B': 5}, 10, 8) == ["2 places vendues pour 1 points dépensés"]
+
+
+def test_concurrent_bookings_conserve_places_and_points(tmp_path):
+    """Test que 40 clubs en concurrence sur 50 places ne vendent ni plus ni moins que confirmé"""
+    report = run_harness(tmp_path, clubs=40, points=3, capacity=50, threads=8, attempts=3)
+
+    assert report['violations'] == []
+    assert report['confirmed_places'] == 50
+    assert report['places_left'] == 0
+    assert report['bookings_per_s'] > 0
+    # L'application est revenue au jeu de données de test
+    assert server.clubs_by_name.get('Simply Lift') is not None
@@ -0,0 +1,75 @@
+"""
+Tests du point d'entrée de production (wsgi.py) : workers gevent, rechargement et arrêt gracieux
+"""
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+import pytest
+
+pytest.importorskip('gevent')
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def worker_pids(master_pid):
+    output = subprocess.run(['ps', '--ppid', str(master_pid), '-o', 'pid='],
+                            stdout=subprocess.PIPE, text=True).stdout
+    return {int(pid) for pid in output.split()}
+
+
+def wait_until(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if predicate():
+                return True
+        except OSError:
+            pass
+        time.sleep(0.1)
+    return False
+
+
+@pytest.fixture
+def production_server():
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, 'wsgi.py', '--workers', '2', '--host', '127.0.0.1', '--port', str(port),
+         '--graceful-timeout', '2'],
+        env={**os.environ, 'TESTING': '1', 'GUDLFT_DATA_DIR': os.path.join('test', 'data', 'testing')},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    url = f'http://127.0.0.1:{port}'
+    assert wait_until(lambda: urllib.request.urlopen(f'{url}/').status == 200)
+    yield process, url
+    if process.poll() is None:
+        process.kill()
+        process.wait()
+
+
+def test_workers_serve_and_reload(production_server):
+    """Test que SIGHUP remplace les workers sans interrompre le service"""
+    process, url = production_server
+    assert wait_until(lambda: len(worker_pids(process.pid)) == 2)
+    before = worker_pids(process.pid)
+
+    process.send_signal(signal.SIGHUP)
+    assert wait_until(lambda: len(worker_pids(process.pid)) == 2 and not worker_pids(process.pid) & before)
+
+    response = urllib.request.urlopen(f'{url}/api/clubs')
+    assert response.status == 200
+
+
+def test_sigterm_stops_gracefully(production_server):
+    """Test que SIGTERM arrête le maître et ses workers"""
+    process, _ = production_server
+    process.send_signal(signal.SIGTERM)
+
+    assert process.wait(timeout=10) == 0
@@ -0,0 +1,151 @@
+"""
+Contention en processus : de nombreux clubs réservent la même compétition depuis un pool de threads
+
+Chaque thread pilote server.app.test_client() ; en fin d'exécution, les
+invariants de conservation sont vérifiés en mémoire puis sur les données
+relues depuis le disque :
+- places vendues = points dépensés = places confirmées aux clients ;
+- aucun solde de points ni nombre de places négatif ;
+- pas plus de places vendues que la capacité de la compétition.
+
+Usage:
+    python test/perf/bench_contention.py
+    python test/perf/bench_contention.py --clubs 500 --points 10 --capacity 1500 --threads 32 --attempts 4
+    GUDLFT_GROUP_COMMIT=1 python test/perf/bench_contention.py
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+# Ajouter le répertoire racine au path pour les imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.messages import Messages  # noqa: E402
+from storage.models import DATE_FORMAT  # noqa: E402
+from test.perf.generate_dataset import generate_clubs, write_collection  # noqa: E402
+
+HOT_COMPETITION = 'Hot Competition'
+
+
+def check_invariants(clubs_before, clubs_after, places_before, places_after, confirmed=None):
+    """Invariants de conservation d'une compétition disputée ; retourne les violations
+
+    clubs_* : {nom: points} ; places_* : places restantes ; confirmed : places
+    dont l'achat a été confirmé aux clients (None : non vérifié).
+    """
+    violations = []
+    sold = places_before - places_after
+    spent = sum(points - clubs_after.get(name, 0) for name, points in clubs_before.items())
+    if sold != spent:
+        violations.append(f"{sold} places vendues pour {spent} points dépensés")
+    if confirmed is not None and confirmed != sold:
+        violations.append(f"{confirmed} places confirmées pour {sold} places vendues")
+    if places_after < 0:
+        violations.append(f"capacité dépassée : {places_after} places restantes")
+    negative = sorted(name for name, points in clubs_after.items() if points < 0)
+    if negative:
+        violations.append(f"{len(negative)} club(s) aux points négatifs : {', '.join(negative[:5])}")
+    gained = sorted(name for name, points in clubs_after.items() if points > clubs_before.get(name, points))
+    if gained:
+        violations.append(f"{len(gained)} club(s) ont gagné des points : {', '.join(gained[:5])}")
+    return violations
+
+
+def write_contention_dataset(directory, clubs, points, capacity):
+    """Clubs dotés de `points` points chacun et une seule compétition à venir de `capacity` places"""
+    write_collection(os.path.join(directory, 'clubs.json'), 'clubs',
+                     generate_clubs(clubs, points='constant', max_points=points))
+    date = (datetime.now() + timedelta(days=30)).strftime(DATE_FORMAT)
+    write_collection(os.path.join(directory, 'competitions.json'), 'competitions',
+                     [{'name': HOT_COMPETITION, 'date': date, 'numberOfPlaces': capacity}])
+
+
+def state(server):
+    return {club.name: club.points for club in server.clubs}, server.competitions_by_name.get(HOT_COMPETITION)
+
+
+def run_harness(directory, clubs=200, points=20, capacity=600, threads=16, attempts=5, places=1):
+    """Lance la contention sur un jeu de données écrit dans directory ; retourne le rapport"""
+    import server
+
+    write_contention_dataset(directory, clubs, points, capacity)
+    previous_data_dir = server.app.config['DATA_DIR']
+    server.app.config['DATA_DIR'] = str(directory)
+    try:
+        server.initStorage()
+        clubs_before, competition = state(server)
+        places_before = competition.numberOfPlaces
+
+        def book(club):
+            confirmed = 0
+            client = server.app.test_client()
+            for _ in range(attempts):
+                response = client.post('/purchasePlaces', data={
+                    'club': club, 'competition': HOT_COMPETITION, 'places': str(places)})
+                if Messages.BOOKING_COMPLETE.encode() in response.data:
+                    confirmed += places
+            return confirmed
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            confirmed = sum(pool.map(book, list(clubs_before)))
+        duration = time.perf_counter() - started
+
+        clubs_after, competition = state(server)
+        violations = check_invariants(clubs_before, clubs_after, places_before, competition.numberOfPlaces,
+                                      confirmed)
+        # Relecture depuis le disque : les écritures confirmées doivent avoir été persistées
+        server.initStorage()
+        clubs_saved, saved = state(server)
+        violations += [f"sur disque : {violation}" for violation in
+                       check_invariants(clubs_before, clubs_saved, places_before, saved.numberOfPlaces, confirmed)]
+    finally:
+        server.app.config['DATA_DIR'] = previous_data_dir
+        server.initStorage()
+
+    requests = clubs * attempts
+    return {
+        'requests': requests,
+        'confirmed_places': confirmed,
+        'places_left': competition.numberOfPlaces,
+        'duration_s': duration,
+        'requests_per_s': requests / duration,
+        'bookings_per_s': confirmed / places / duration,
+        'violations': violations,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Contention en processus sur une compétition unique')
+    parser.add_argument('--clubs', type=int, default=200)
+    parser.add_argument('--points', type=int, default=20, help='Points de chaque club')
+    parser.add_argument('--capacity', type=int, default=600, help='Places de la compétition')
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--attempts', type=int, default=5, help='Achats tentés par club')
+    parser.add_argument('--places', type=int, default=1, help='Places par achat')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        report = run_harness(directory, args.clubs, args.points, args.capacity, args.threads, args.attempts,
+                             args.places)
+
+    print(f"Demande: {args.clubs * args.attempts * args.places} places ({args.clubs} clubs x {args.attempts} "
+          f"achats x {args.places}), capacité: {args.capacity}")
+    print(f"Places confirmées: {report['confirmed_places']}, restantes: {report['places_left']}")
+    print(f"Durée: {report['duration_s']:.2f}s, {report['requests_per_s']:.0f} requêtes/s, "
+          f"{report['bookings_per_s']:.0f} réservations/s")
+    if report['violations']:
+        print("KO - Invariants violés :")
+        for violation in report['violations']:
+            print(f"   • {violation}")
+        return 1
+    print("OK - Invariants de conservation respectés")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Micro-benchmarks (pytest-benchmark) : chargement, sauvegarde, recherches, validation d'achat et rendus
+Chaque mesure est répétée pour 10, 1 000 et 100 000 enregistrements.
+
+Usage:
+    python -m pytest test/perf/bench_core.py --benchmark-json=benchmark.json
+    python -m pytest test/perf/bench_core.py -k "10-records" --benchmark-json=benchmark.json
+"""
+from datetime import datetime
+import pytest
+from flask import render_template
+from markupsafe import Markup
+
+import server
+from config.messages import Messages
+from storage import JsonRepository
+from test.perf.generate_dataset import write_dataset
+
+SIZES = [10, 1_000, 100_000]
+
+
+@pytest.fixture(scope='module')
+def dataset_dirs(tmp_path_factory):
+    """Répertoires de données générés une fois par taille, la moitié des compétitions à venir"""
+    directories = {}
+    for size in SIZES:
+        directory = tmp_path_factory.mktemp(f'data{size}')
+        write_dataset(directory, size, size, seed=size, reference=datetime.now(), spread_days=30)
+        directories[size] = directory
+    return directories
+
+
+@pytest.fixture(params=SIZES, ids=lambda size: f'{size}-records')
+def dataset(request, dataset_dirs):
+    """L'application pointe sur le jeu de données de la taille demandée (DATA_DIR)
+
+    Les tests de sauvegarde écrivent dans leur propre répertoire temporaire.
+    """
+    size = request.param
+    previous_data_dir = server.app.config['DATA_DIR']
+    server.app.config['DATA_DIR'] = str(dataset_dirs[size])
+    server.initStorage()
+    yield size
+    server.app.config['DATA_DIR'] = previous_data_dir
+    server.initStorage()
+
+
+def test_load_clubs(benchmark, dataset):
+    clubs = benchmark(server.loadClubs)
+    assert len(clubs) == dataset
+
+
+def test_load_competitions(benchmark, dataset):
+    competitions = benchmark(server.loadCompetitions)
+    assert len(competitions) == dataset
+
+
+def test_save_clubs(benchmark, dataset, tmp_path, monkeypatch):
+    monkeypatch.setattr(server, 'repository', JsonRepository(lambda filename: str(tmp_path / filename)))
+    benchmark(server.saveClubs)
+    assert (tmp_path / 'clubs.json').exists()
+
+
+def test_save_competitions(benchmark, dataset, tmp_path, monkeypatch):
+    monkeypatch.setattr(server, 'repository', JsonRepository(lambda filename: str(tmp_path / filename)))
+    benchmark(server.saveCompetitions)
+    assert (tmp_path / 'competitions.json').exists()
+
+
+def test_lookup_club_by_email(benchmark, dataset):
+    last = server.clubs[-1]
+    club = benchmark(server.clubs_by_email.get, last.email.upper())
+    assert club is last
+
+
+def test_lookup_competition_by_name(benchmark, dataset):
+    name = server.competitions[-1].name
+    competition = benchmark(server.competitions_by_name.get, name)
+    assert competition.name == name
+
+
+def validation_case(outcome):
+    """Club, compétition et places menant bookPlaces jusqu'à la règle refusant l'achat
+
+    Les règles sont vérifiées dans l'ordre : date, nombre valide, maximum
+    par achat, points, places ; chaque cas atteint une étape différente.
+    """
+    upcoming = server.competition_timeline.upcoming()
+    limit = Messages.MAX_PLACES_PER_BOOKING
+    if outcome == 'expired':
+        return server.clubs[-1], server.competition_timeline.past()[-1], '1'
+    if outcome == 'max_exceeded':
+        return server.clubs[-1], upcoming[-1], str(limit + 1)
+    if outcome == 'not_enough_points':
+        club = next(club for club in server.clubs if club.points < limit)
+        return club, upcoming[-1], str(club.points + 1)
+    competition = next(competition for competition in upcoming if competition.numberOfPlaces < limit)
+    club = next(club for club in server.clubs if club.points > competition.numberOfPlaces)
+    return club, competition, str(competition.numberOfPlaces + 1)
+
+
+@pytest.mark.parametrize('outcome', ['expired', 'max_exceeded', 'not_enough_points', 'not_enough_places'])
+def test_purchase_validation(benchmark, dataset, outcome):
+    """Chemin de validation de purchasePlaces (recherches, verrous, règles) jusqu'à chaque refus, sans écriture"""
+    club, competition, places = validation_case(outcome)
+
+    def validate():
+        with server.app.test_request_context():
+            with server.dataWriteLock():
+                return server.bookPlaces(club.name, competition.name, places)
+
+    _, message = benchmark(validate)
+    assert server.bookingOutcome(message) == outcome
+
+
+def test_render_welcome(benchmark, dataset):
+    club = server.clubs[0]
+
+    def render():
+        with server.app.test_request_context():
+            return render_template('welcome.html', club=club, competitions=server.competition_timeline.upcoming())
+
+    assert club.email in benchmark(render)
+
+
+def test_render_index(benchmark, dataset):
+    """Rendu complet de l'accueil, tableau des points compris (sans le cache des fragments)"""
+    def render():
+        with server.app.test_request_context():
+            table = render_template('club_points_table.html', clubs=server.clubs)
+            return render_template('index.html', points_table=Markup(table))
+
+    assert server.clubs[-1].name in benchmark(render)
@@ -0,0 +1,73 @@
+"""
+Benchmark mémoire : dictionnaires JSON bruts contre enregistrements typés (__slots__)
+
+Usage:
+    python test/perf/bench_memory.py
+    python test/perf/bench_memory.py --clubs 100000 --competitions 10000
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+
+# Ajouter le répertoire racine au path pour les imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from storage.models import DATE_FORMAT, Club, Competition  # noqa: E402
+
+
+def make_payload(nb_clubs, nb_competitions):
+    """Contenu JSON sérialisé, au format des fichiers clubs.json / competitions.json"""
+    start = datetime(2020, 1, 1, 9, 0, 0)
+    clubs = [{'name': f'Club {i}', 'email': f'secretary{i}@club{i}.fr', 'points': str(i % 30)}
+             for i in range(nb_clubs)]
+    competitions = [{'name': f'Competition {i}',
+                     'date': (start + timedelta(days=i)).strftime(DATE_FORMAT),
+                     'numberOfPlaces': str(10 + i % 40)}
+                    for i in range(nb_competitions)]
+    return json.dumps({'clubs': clubs}), json.dumps({'competitions': competitions})
+
+
+def measure(build):
+    """Mémoire conservée (octets) par le résultat de build()"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark mémoire des enregistrements')
+    parser.add_argument('--clubs', type=int, default=100000)
+    parser.add_argument('--competitions', type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    clubs_json, competitions_json = make_payload(args.clubs, args.competitions)
+
+    results = {}
+    for label, loader in (
+        ('dict', lambda: (json.loads(clubs_json)['clubs'],
+                          json.loads(competitions_json)['competitions'])),
+        ('slots', lambda: ([Club.from_dict(d) for d in json.loads(clubs_json)['clubs']],
+                           [Competition.from_dict(d) for d in json.loads(competitions_json)['competitions']])),
+    ):
+        records, retained = measure(loader)
+        results[label] = retained
+        del records
+
+    print(f"Clubs: {args.clubs}, compétitions: {args.competitions}")
+    for label, retained in results.items():
+        print(f"   • {label:<5}: {retained / 1024 / 1024:8.1f} Mo "
+              f"({retained / (args.clubs + args.competitions):.0f} o/enregistrement)")
+    print(f"   • gain : {100 * (1 - results['slots'] / results['dict']):.0f} %")
+    return results
+
+
+if __name__ == '__main__':
+    main()
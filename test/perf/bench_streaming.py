@@ -0,0 +1,87 @@
+"""
+Benchmark du rendu de la page de résumé : rendu complet contre rendu en flux
+Mesure le temps jusqu'au premier octet (TTFB), le temps total et le pic mémoire.
+
+Usage:
+    python test/perf/bench_streaming.py
+    python test/perf/bench_streaming.py --competitions 5000 --repeat 5
+"""
+import argparse
+import gc
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+# Ajouter le répertoire racine au path pour les imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import server  # noqa: E402
+from storage.models import Club, Competition  # noqa: E402
+
+EMAIL = 'bench@club.fr'
+
+
+def install_dataset(nb_competitions):
+    """Remplace les données en mémoire par un club et nb_competitions à venir"""
+    start = datetime.now() + timedelta(days=1)
+    competitions = [Competition(f'Competition {i}', start + timedelta(hours=i), 10 + i % 40)
+                    for i in range(nb_competitions)]
+    club = Club('Bench Club', EMAIL, 30)
+    server.clubs_by_email.rebuild([club])
+    server.clubs_by_name.rebuild([club])
+    server.competitions_by_name.rebuild(competitions)
+    server.competition_timeline.rebuild(competitions)
+
+
+def measure(client):
+    """(ttfb, total, pic mémoire, taille) d'une requête /showSummary"""
+    gc.collect()
+    tracemalloc.start()
+    begin = time.perf_counter()
+    response = client.post('/showSummary', data={'email': EMAIL}, buffered=False)
+    chunks = iter(response.response)
+    size = len(next(chunks))
+    ttfb = time.perf_counter() - begin
+    for chunk in chunks:
+        size += len(chunk)
+    total = time.perf_counter() - begin
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    response.close()
+    return ttfb, total, peak, size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark du rendu en flux')
+    parser.add_argument('--competitions', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    install_dataset(args.competitions)
+    client = server.app.test_client()
+
+    results = {}
+    for label, streamed in (('buffered', False), ('streamed', True)):
+        server.app.config['STREAM_TEMPLATES'] = streamed
+        runs = [measure(client) for _ in range(args.repeat)]
+        results[label] = {
+            'ttfb': statistics.median(run[0] for run in runs),
+            'total': statistics.median(run[1] for run in runs),
+            'peak': max(run[2] for run in runs),
+            'size': runs[0][3],
+        }
+
+    print(f"Compétitions: {args.competitions}, répétitions: {args.repeat}")
+    for label, result in results.items():
+        print(f"   • {label:<8}: TTFB {result['ttfb'] * 1000:8.2f} ms, "
+              f"total {result['total'] * 1000:8.2f} ms, "
+              f"pic mémoire {result['peak'] / 1024 / 1024:6.2f} Mo, "
+              f"page {result['size'] / 1024:.0f} Ko")
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Recherche de capacité : débit maximal tenu par endpoint avant de dépasser PerformanceThresholds
+
+Les statistiques Locust étant cumulées, chaque palier est jugé sur la
+différence entre deux instantanés (requêtes, échecs, histogramme des temps)
+pris au début et à la fin de sa fenêtre de mesure.
+"""
+import math
+
+from config.messages import PerformanceThresholds
+from test.perf.slo import PERCENTILES, check
+
+
+def snapshot(stats):
+    """Instantané des statistiques Locust : {"MÉTHODE nom": (requêtes, échecs, {ms: nombre})}"""
+    return {f'{entry.method} {entry.name}': (entry.num_requests, entry.num_failures, dict(entry.response_times))
+            for entry in stats.entries.values()}
+
+
+def percentile(histogram, count, quantile):
+    """Temps (ms) sous lequel se trouvent `quantile` des `count` requêtes de l'histogramme"""
+    rank = math.ceil(count * quantile)
+    seen = 0
+    for value in sorted(histogram):
+        seen += histogram[value]
+        if seen >= rank:
+            return value
+    return 0
+
+
+def window_summary(before, after, duration):
+    """Résumés par endpoint des requêtes arrivées entre deux instantanés"""
+    summaries = {}
+    for name, (requests, failures, times) in after.items():
+        previous_requests, previous_failures, previous_times = before.get(name, (0, 0, {}))
+        count = requests - previous_requests
+        if count <= 0:
+            continue
+        histogram = {value: number - previous_times.get(value, 0) for value, number in times.items()}
+        histogram = {value: number for value, number in histogram.items() if number > 0}
+        summary = {'requests': count, 'failures': failures - previous_failures}
+        for key, quantile in PERCENTILES.items():
+            summary[key] = percentile(histogram, sum(histogram.values()), quantile)
+        summary['rps'] = round(count / duration, 3) if duration > 0 else 0.0
+        summaries[name] = summary
+    return summaries
+
+
+class CapacitySearch:
+    """Suit les paliers d'une montée en charge et s'arrête au premier objectif non tenu
+
+    Pour chaque endpoint, le débit maximal retenu est celui du dernier
+    palier où il tenait ses objectifs de percentiles et de taux d'échec.
+    """
+
+    def __init__(self, thresholds=PerformanceThresholds):
+        self.thresholds = thresholds
+        self.steps = []
+        self.sustainable = {}
+        self.max_rate = None
+        self.broken_at = None
+        self.violations = []
+
+    @property
+    def done(self):
+        return self.broken_at is not None
+
+    def record(self, rate, summaries):
+        """Juge un palier (taux d'arrivée visé, résumés par endpoint) ; retourne False s'il est dépassé"""
+        violations = []
+        for name, summary in sorted(summaries.items()):
+            targets = self.thresholds.ENDPOINT_TARGETS.get(name, self.thresholds.DEFAULT_TARGETS)
+            # Le débit d'un palier est imposé par la charge : seuls percentiles et échecs sont jugés
+            failed = check(summary, {key: targets[key] for key in PERCENTILES if key in targets},
+                           self.thresholds.MAX_FAILURE_RATIO)
+            if failed:
+                violations.extend(f'{name}: {violation}' for violation in failed)
+            else:
+                self.sustainable[name] = max(self.sustainable.get(name, 0.0), summary['rps'])
+        self.steps.append({'rate': rate, 'endpoints': summaries, 'violations': violations})
+        if violations:
+            self.broken_at = rate
+            self.violations = violations
+            return False
+        self.max_rate = rate
+        return True
+
+    def report(self):
+        return {
+            'max_sustainable_rate': self.max_rate,
+            'broken_at': self.broken_at,
+            'violations': self.violations,
+            'endpoints': dict(sorted(self.sustainable.items())),
+            'steps': self.steps,
+        }
@@ -0,0 +1,146 @@
+"""
+Générateur de jeux de données volumineux (clubs.json / competitions.json)
+
+Déterministe : même graine et mêmes options, mêmes fichiers. Les
+enregistrements sont produits et écrits un à un, sans jamais tenir la
+collection entière en mémoire : plusieurs millions d'enregistrements
+restent possibles.
+
+Usage:
+    python test/perf/generate_dataset.py --output data/large --clubs 100000 --competitions 10000
+    python test/perf/generate_dataset.py --output data/large --seed 7 --future-ratio 0.8 \\
+        --points pareto --name-length 10:40
+
+L'application utilise ensuite ces fichiers via GUDLFT_DATA_DIR :
+    GUDLFT_DATA_DIR=data/large python wsgi.py
+"""
+import argparse
+import json
+import os
+import random
+import string
+import sys
+from datetime import datetime, timedelta
+
+# Ajouter le répertoire racine au path pour les imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from storage.models import DATE_FORMAT  # noqa: E402
+
+POINT_DISTRIBUTIONS = ('uniform', 'pareto', 'constant')
+# Date de référence par défaut : fixe, pour que la sortie ne dépende pas du jour
+DEFAULT_REFERENCE = datetime(2026, 1, 1)
+
+
+def make_name(rng, prefix, index, length):
+    """Nom unique d'environ `length` caractères : lettres aléatoires puis numéro"""
+    suffix = f' {prefix}{index}'
+    letters = max(1, length - len(suffix))
+    return rng.choice(string.ascii_uppercase) + ''.join(rng.choices(string.ascii_lowercase, k=letters - 1)) + suffix
+
+
+def generate_clubs(count, seed=0, points='uniform', max_points=30, name_length=(8, 24)):
+    """Clubs au format de clubs.json, produits un à un
+
+    points : 'uniform' (0 à max_points), 'pareto' (la plupart des clubs
+    ont peu de points, quelques-uns beaucoup, plafonné à max_points) ou
+    'constant' (max_points pour tous).
+    """
+    if points not in POINT_DISTRIBUTIONS:
+        raise ValueError(f"Distribution de points inconnue : {points!r}")
+    rng = random.Random(f'{seed}-clubs')
+    for index in range(count):
+        name = make_name(rng, 'C', index, rng.randint(*name_length))
+        if points == 'uniform':
+            value = rng.randint(0, max_points)
+        elif points == 'pareto':
+            value = min(max_points, int(rng.paretovariate(1.5)) - 1)
+        else:
+            value = max_points
+        yield {'name': name, 'email': f'secretary{index}@club{index}.example', 'points': value}
+
+
+def generate_competitions(count, seed=0, future_ratio=0.5, reference=DEFAULT_REFERENCE, spread_days=365,
+                          max_places=50, name_length=(8, 32)):
+    """Compétitions au format de competitions.json, produites une à une
+
+    Une proportion future_ratio des compétitions a lieu après `reference`,
+    les autres avant, à au plus spread_days jours d'écart.
+    """
+    rng = random.Random(f'{seed}-competitions')
+    spread_seconds = spread_days * 24 * 3600
+    for index in range(count):
+        name = make_name(rng, 'E', index, rng.randint(*name_length))
+        offset = timedelta(seconds=rng.randint(1, spread_seconds))
+        date = reference + offset if rng.random() < future_ratio else reference - offset
+        yield {
+            'name': name,
+            'date': date.strftime(DATE_FORMAT),
+            'numberOfPlaces': rng.randint(1, max_places),
+        }
+
+
+def write_collection(path, key, records):
+    """Écrit {key: [records...]} enregistrement par enregistrement ; retourne le nombre écrit
+
+    Le fichier n'apparaît qu'une fois complet (fichier temporaire renommé).
+    """
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    count = 0
+    with open(tmp_path, 'w') as file:
+        file.write(f'{{\n    "{key}": [')
+        for record in records:
+            file.write(',\n        ' if count else '\n        ')
+            file.write(json.dumps(record))
+            count += 1
+        file.write('\n    ]\n}\n')
+    os.replace(tmp_path, path)
+    return count
+
+
+def write_dataset(directory, clubs, competitions, seed=0, **options):
+    """Écrit clubs.json et competitions.json dans directory
+
+    options : points, max_points, future_ratio, reference, spread_days,
+    max_places, name_length (appliqué aux deux collections).
+    """
+    club_options = {key: options[key] for key in ('points', 'max_points', 'name_length') if key in options}
+    competition_options = {key: options[key] for key in
+                           ('future_ratio', 'reference', 'spread_days', 'max_places', 'name_length') if key in options}
+    os.makedirs(directory, exist_ok=True)
+    write_collection(os.path.join(directory, 'clubs.json'), 'clubs',
+                     generate_clubs(clubs, seed, **club_options))
+    write_collection(os.path.join(directory, 'competitions.json'), 'competitions',
+                     generate_competitions(competitions, seed, **competition_options))
+
+
+def parse_range(value):
+    low, _, high = value.partition(':')
+    return int(low), int(high or low)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Génère clubs.json et competitions.json à grande échelle')
+    parser.add_argument('--output', required=True, help='Répertoire de sortie')
+    parser.add_argument('--clubs', type=int, default=1000)
+    parser.add_argument('--competitions', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--future-ratio', type=float, default=0.5, help='Part des compétitions à venir (0 à 1)')
+    parser.add_argument('--reference', type=lambda value: datetime.strptime(value, '%Y-%m-%d'),
+                        default=DEFAULT_REFERENCE, help='Date séparant passé et futur (AAAA-MM-JJ)')
+    parser.add_argument('--spread-days', type=int, default=365)
+    parser.add_argument('--points', choices=POINT_DISTRIBUTIONS, default='uniform')
+    parser.add_argument('--max-points', type=int, default=30)
+    parser.add_argument('--max-places', type=int, default=50)
+    parser.add_argument('--name-length', type=parse_range, default=(8, 24), help='Longueur des noms, min:max')
+    args = parser.parse_args(argv)
+
+    write_dataset(args.output, args.clubs, args.competitions, seed=args.seed,
+                  points=args.points, max_points=args.max_points, future_ratio=args.future_ratio,
+                  reference=args.reference, spread_days=args.spread_days, max_places=args.max_places,
+                  name_length=args.name_length)
+    print(f"{args.clubs} clubs et {args.competitions} compétitions écrits dans {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,268 @@
+"""
+Historique des performances : enregistrement des exécutions Locust / pytest-benchmark et détection des régressions
+
+Chaque exécution est ajoutée comme une ligne JSON au fichier d'historique
+(perf_history.jsonl, ou GUDLFT_PERF_HISTORY) avec le commit git, la taille
+du jeu de données, le nombre d'utilisateurs et, par endpoint, les
+percentiles (ms) et le débit (requêtes/s).
+
+Comparaisons :
+- deux exécutions Locust : test de Mann-Whitney sur les distributions des
+  temps de réponse (histogrammes enregistrés par Locust) ;
+- deux exécutions pytest-benchmark : test t de Welch sur les moyennes ;
+- une exécution contre une base glissante (les N précédentes de même
+  nature, taille et nombre d'utilisateurs) : écart réduit (z) de la valeur
+  suivie (p95 Locust, moyenne benchmark) par rapport à la base.
+Une régression n'est signalée que si elle est significative (p < alpha) et
+dépasse un écart relatif minimal.
+
+Usage:
+    python test/perf/history.py record --locust locust_verdict.json
+    python test/perf/history.py record --benchmark benchmark.json
+    python test/perf/history.py list
+    python test/perf/history.py compare 3 7
+    python test/perf/history.py compare latest --baseline 5
+"""
+import argparse
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HISTORY_FILE = os.getenv('GUDLFT_PERF_HISTORY', 'perf_history.jsonl')
+ALPHA = 0.01
+MIN_CHANGE = 0.05
+
+
+def git_revision():
+    """SHA du commit courant, suffixé de '+dirty' si l'arbre est modifié (None hors dépôt git)"""
+    try:
+        sha = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return sha + ('+dirty' if dirty else '')
+
+
+def from_locust(verdict):
+    """Exécution à partir d'un verdict Locust (test/perf/slo.py)"""
+    endpoints = {}
+    for name, result in verdict['endpoints'].items():
+        endpoints[name] = {key: result[key] for key in ('requests', 'failures', 'p50', 'p95', 'p99', 'rps')}
+        endpoints[name]['histogram'] = result.get('histogram', {})
+    return {'kind': 'locust', 'git': git_revision(), 'dataset': verdict.get('dataset'),
+            'users': verdict.get('users'), 'endpoints': endpoints}
+
+
+def from_benchmark(report):
+    """Exécution à partir d'un rapport --benchmark-json de pytest-benchmark"""
+    endpoints = {}
+    for benchmark in report['benchmarks']:
+        stats = benchmark['stats']
+        endpoints[benchmark['name']] = {
+            'dataset': (benchmark.get('params') or {}).get('dataset'),
+            'rounds': stats['rounds'],
+            'mean': stats['mean'] * 1000,
+            'stddev': stats['stddev'] * 1000,
+            'p50': stats['median'] * 1000,
+            'rps': stats['ops'],
+        }
+    commit = report.get('commit_info') or {}
+    git = commit['id'] + ('+dirty' if commit.get('dirty') else '') if commit.get('id') else git_revision()
+    return {'kind': 'benchmark', 'git': git, 'dataset': None, 'users': None, 'endpoints': endpoints}
+
+
+def load_history(path=HISTORY_FILE):
+    try:
+        with open(path) as file:
+            return [json.loads(line) for line in file if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def append_run(run, path=HISTORY_FILE):
+    """Ajoute l'exécution à l'historique ; retourne l'exécution numérotée"""
+    run = {'id': len(load_history(path)) + 1, 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), **run}
+    with open(path, 'a') as file:
+        file.write(json.dumps(run) + '\n')
+    return run
+
+
+def find_run(history, run_id):
+    if run_id == 'latest':
+        if not history:
+            raise LookupError("Historique vide")
+        return history[-1]
+    for run in history:
+        if run['id'] == int(run_id):
+            return run
+    raise LookupError(f"Exécution {run_id} absente de l'historique")
+
+
+def p_value(z):
+    """p bilatéral d'un écart réduit (approximation normale)"""
+    return math.erfc(abs(z) / math.sqrt(2))
+
+
+def mann_whitney(before, after):
+    """Écart réduit z et p du test de Mann-Whitney entre deux histogrammes {ms: nombre}
+
+    z > 0 : les temps de `after` sont plutôt plus longs.
+    """
+    before = {float(value): count for value, count in before.items()}
+    after = {float(value): count for value, count in after.items()}
+    n1, n2 = sum(before.values()), sum(after.values())
+    n = n1 + n2
+    if not n1 or not n2:
+        return 0.0, 1.0
+    rank, rank_sum_after, ties = 1, 0.0, 0
+    for value in sorted(set(before) | set(after)):
+        count = before.get(value, 0) + after.get(value, 0)
+        rank_sum_after += after.get(value, 0) * (rank + (count - 1) / 2)
+        ties += count ** 3 - count
+        rank += count
+    u_after = rank_sum_after - n2 * (n2 + 1) / 2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 0.0, 1.0
+    z = (u_after - n1 * n2 / 2) / math.sqrt(variance)
+    return z, p_value(z)
+
+
+def welch(before, after):
+    """Écart réduit t et p (approximation normale) du test de Welch entre deux moyennes"""
+    error = math.sqrt(before['stddev'] ** 2 / before['rounds'] + after['stddev'] ** 2 / after['rounds'])
+    difference = after['mean'] - before['mean']
+    if error == 0:
+        return (math.copysign(math.inf, difference), 0.0) if difference else (0.0, 1.0)
+    t = difference / error
+    return t, p_value(t)
+
+
+def tracked(run):
+    """Valeur suivie par endpoint : p95 (Locust) ou moyenne (benchmark)"""
+    return 'p95' if run['kind'] == 'locust' else 'mean'
+
+
+def row(endpoint, before, after, statistic, p, alpha, min_change):
+    change = (after - before) / before if before else 0.0
+    if p < alpha and statistic > 0 and change > min_change:
+        status = 'REGRESSION'
+    elif p < alpha and statistic < 0 and change < -min_change:
+        status = 'amélioration'
+    else:
+        status = '='
+    return {'endpoint': endpoint, 'before': before, 'after': after, 'change': change, 'p': p, 'status': status}
+
+
+def compare_runs(before, after, alpha=ALPHA, min_change=MIN_CHANGE):
+    """Comparaison endpoint par endpoint de deux exécutions de même nature"""
+    if before['kind'] != after['kind']:
+        raise ValueError(f"Exécutions de natures différentes : {before['kind']} et {after['kind']}")
+    key = tracked(after)
+    rows = []
+    for endpoint in sorted(set(before['endpoints']) & set(after['endpoints'])):
+        old, new = before['endpoints'][endpoint], after['endpoints'][endpoint]
+        if after['kind'] == 'locust':
+            statistic, p = mann_whitney(old['histogram'], new['histogram'])
+        else:
+            statistic, p = welch(old, new)
+        rows.append(row(endpoint, old[key], new[key], statistic, p, alpha, min_change))
+    return rows
+
+
+def baseline_runs(history, run, window):
+    """Les `window` exécutions précédentes comparables (nature, jeu de données, utilisateurs)"""
+    comparable = [previous for previous in history if previous['id'] < run['id'] and
+                  all(previous.get(field) == run.get(field) for field in ('kind', 'dataset', 'users'))]
+    return comparable[-window:]
+
+
+def compare_to_baseline(history, run, window=5, alpha=ALPHA, min_change=MIN_CHANGE):
+    """Comparaison de chaque endpoint à la moyenne et à la dispersion de la base glissante"""
+    baseline = baseline_runs(history, run, window)
+    key = tracked(run)
+    rows = []
+    for endpoint, summary in sorted(run['endpoints'].items()):
+        values = [previous['endpoints'][endpoint][key] for previous in baseline if endpoint in previous['endpoints']]
+        if len(values) < 2:
+            continue
+        mean = statistics.fmean(values)
+        # Dispersion plancher de 1 % : une base parfaitement stable ne rend pas tout écart significatif
+        spread = max(statistics.stdev(values), abs(mean) * 0.01, 1e-9)
+        z = (summary[key] - mean) / spread
+        rows.append(row(endpoint, mean, summary[key], z, p_value(z), alpha, min_change))
+    return rows, baseline
+
+
+def print_rows(rows, unit):
+    print(f"{'Endpoint':<50} {'Avant':>10} {'Après':>10} {'Écart':>8} {'p':>8}  Statut")
+    for result in rows:
+        print(f"{result['endpoint']:<50} {result['before']:>8.2f}{unit} {result['after']:>8.2f}{unit} "
+              f"{result['change']:>+8.1%} {result['p']:>8.4f}  {result['status']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Historique des performances et détection des régressions")
+    parser.add_argument('--history', default=HISTORY_FILE, help="Fichier d'historique (JSON lines)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record = commands.add_parser('record', help='Ajoute une exécution à l\'historique')
+    source = record.add_mutually_exclusive_group(required=True)
+    source.add_argument('--locust', help='Verdict JSON de locustfile.py')
+    source.add_argument('--benchmark', help='Rapport --benchmark-json de pytest-benchmark')
+    record.add_argument('--users', type=int, help="Nombre d'utilisateurs (remplace celui du verdict)")
+    record.add_argument('--dataset', help='Taille du jeu de données (remplace celle du verdict)')
+
+    commands.add_parser('list', help='Liste les exécutions enregistrées')
+
+    compare = commands.add_parser('compare', help='Compare deux exécutions, ou une exécution à sa base')
+    compare.add_argument('runs', nargs='+',
+                         help="Identifiants (ou 'latest') : avant après, ou un seul avec --baseline")
+    compare.add_argument('--baseline', type=int, metavar='N', help='Compare aux N exécutions comparables précédentes')
+    compare.add_argument('--alpha', type=float, default=ALPHA, help='Seuil de significativité')
+    compare.add_argument('--min-change', type=float, default=MIN_CHANGE, help='Écart relatif minimal (0.05 : 5 %%)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'record':
+        with open(args.locust or args.benchmark) as file:
+            data = json.load(file)
+        run = from_locust(data) if args.locust else from_benchmark(data)
+        if args.users is not None:
+            run['users'] = args.users
+        if args.dataset is not None:
+            run['dataset'] = args.dataset
+        run = append_run(run, args.history)
+        print(f"Exécution {run['id']} ({run['kind']}, {len(run['endpoints'])} endpoints) ajoutée à {args.history}")
+        return 0
+
+    history = load_history(args.history)
+    if args.command == 'list':
+        for run in history:
+            print(f"{run['id']:>4}  {run['timestamp']}  {run['kind']:<9} {str(run['git'])[:12]:<13} "
+                  f"données={run['dataset']} utilisateurs={run['users']} endpoints={len(run['endpoints'])}")
+        return 0
+
+    if args.baseline:
+        run = find_run(history, args.runs[0])
+        rows, baseline = compare_to_baseline(history, run, args.baseline, args.alpha, args.min_change)
+        print(f"Exécution {run['id']} contre la base {[previous['id'] for previous in baseline]}")
+    else:
+        if len(args.runs) != 2:
+            parser.error('compare attend deux exécutions, ou une seule avec --baseline')
+        before, after = (find_run(history, run_id) for run_id in args.runs)
+        rows = compare_runs(before, after, args.alpha, args.min_change)
+        run = after
+        print(f"Exécution {before['id']} -> {after['id']}")
+    print_rows(rows, 'ms')
+    regressions = [result['endpoint'] for result in rows if result['status'] == 'REGRESSION']
+    print(f"{len(regressions)} régression(s) significative(s) ({tracked(run)})")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
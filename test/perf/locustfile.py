@@ -1,12 +1,19 @@
 """
-Tests de performance avec Locust - Version Simple
+Tests de performance avec Locust
 Tests selon les spécifications :
 - Temps de chargement ≤ 5 secondes
 - Mises à jour ≤ 2 secondes
 - 6 utilisateurs par défaut
 
+La charge est tirée des fichiers de données (voir workload.py) : un club
+distinct par utilisateur virtuel, compétitions choisies selon une
+popularité de Zipf, parcours visite/connexion/réservation en proportions
+configurables.
+
 Usage:
     locust -f test/perf/locustfile.py --host=http://localhost:5050
+    GUDLFT_DATA_DIR=data/large GUDLFT_LOCUST_MIX=70,20,10 GUDLFT_LOCUST_ZIPF=1.2 \
+        locust -f test/perf/locustfile.py --host=http://localhost:5050
 """
 import time
 import sys
@@ -17,105 +24,68 @@ from locust import HttpUser, task, between, events
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from config.messages import PerformanceThresholds  # noqa: E402
+from test.perf.slo import evaluate, summarize_locust, write_verdict  # noqa: E402
+from test.perf.workload import Workload  # noqa: E402
+
+workload = Workload.from_environment()
+VERDICT_FILE = os.getenv('GUDLFT_LOCUST_VERDICT', 'locust_verdict.json')
+verdict = None
+
+
+def check_response(response, started, limit, label):
+    """Succès si statut 200 et temps de réponse sous le seuil (secondes)"""
+    response_time = time.time() - started
+    if response.status_code != 200:
+        response.failure(f"{label} : erreur HTTP {response.status_code}")
+    elif response_time > limit:
+        response.failure(f"{label} trop lente : {response_time:.2f}s > {limit}s")
+    else:
+        response.success()
 
 
-class WebsiteUser(HttpUser):
-    """Utilisateur simulé testant les pages de chargement"""
+class ClubUser(HttpUser):
+    """Secrétaire de club simulé : visite, connexion ou réservation à chaque itération"""
     wait_time = between(1, 3)
 
     def on_start(self):
-        """Initialisation - visite de la page d'accueil"""
-        self.client.get("/")
+        """Attribution d'un club propre à cet utilisateur"""
+        self.club, self.rng = workload.next_user()
 
-    @task(3)
-    def test_homepage_loading(self):
-        """Test du temps de chargement de la page d'accueil (seuil: 5s)"""
-        start_time = time.time()
-        with self.client.get("/", catch_response=True) as response:
-            response_time = time.time() - start_time
-
-            if response.status_code == 200:
-                if response_time <= PerformanceThresholds.MAX_LOADING_TIME:
-                    response.success()
-                else:
-                    response.failure(
-                        f"Page d'accueil trop lente: {response_time:.2f}s > "
-                        f"{PerformanceThresholds.MAX_LOADING_TIME}s"
-                    )
-            else:
-                response.failure(f"Erreur HTTP: {response.status_code}")
-
-    @task(2)
-    def test_login_loading(self):
-        """Test du temps de chargement de la connexion (seuil: 5s)"""
-        start_time = time.time()
-        with self.client.post("/showSummary",
-                              data={'email': 'john@simplylift.co'},
-                              catch_response=True) as response:
-            response_time = time.time() - start_time
-
-            if response.status_code == 200:
-                if response_time <= PerformanceThresholds.MAX_LOADING_TIME:
-                    response.success()
-                else:
-                    response.failure(
-                        f"Connexion trop lente: {response_time:.2f}s > "
-                        f"{PerformanceThresholds.MAX_LOADING_TIME}s"
-                    )
-            else:
-                response.failure(f"Erreur de connexion: {response.status_code}")
-
-    @task(2)
-    def test_booking_page_loading(self):
-        """Test du temps de chargement de la page de réservation (seuil: 5s)"""
-        start_time = time.time()
-        with self.client.get("/book/Simply Lift/Future Championship",
-                             catch_response=True) as response:
-            response_time = time.time() - start_time
-
-            if response.status_code == 200:
-                if response_time <= PerformanceThresholds.MAX_LOADING_TIME:
-                    response.success()
-                else:
-                    response.failure(
-                        f"Page de réservation trop lente: {response_time:.2f}s > "
-                        f"{PerformanceThresholds.MAX_LOADING_TIME}s"
-                    )
-            else:
-                response.failure(f"Erreur page de réservation: {response.status_code}")
+    @task
+    def run_flow(self):
+        getattr(self, workload.next_flow(self.rng))()
 
+    def browse(self):
+        """Visite anonyme : page d'accueil et tableau des points (seuil: 5s)"""
+        started = time.time()
+        with self.client.get("/", catch_response=True) as response:
+            check_response(response, started, PerformanceThresholds.MAX_LOADING_TIME, "Page d'accueil")
 
-class BookingUser(HttpUser):
-    """Utilisateur simulé testant les mises à jour (achats de places)"""
-    wait_time = between(2, 5)
+    def login(self):
+        """Connexion puis consultation d'une compétition (seuil: 5s)"""
+        started = time.time()
+        with self.client.post("/showSummary", data={'email': self.club.email}, catch_response=True) as response:
+            check_response(response, started, PerformanceThresholds.MAX_LOADING_TIME, "Connexion")
 
-    def on_start(self):
-        """Connexion au démarrage"""
-        self.client.post("/showSummary", data={'email': 'john@simplylift.co'})
+        competition = workload.competitions.sample(self.rng)
+        started = time.time()
+        with self.client.get(f"/book/{self.club.name}/{competition.name}", name="/book/[club]/[competition]",
+                             catch_response=True) as response:
+            check_response(response, started, PerformanceThresholds.MAX_LOADING_TIME, "Page de réservation")
+        return competition
 
-    @task(1)
-    def test_purchase_update_time(self):
-        """Test du temps de mise à jour lors d'un achat (seuil: 2s)"""
-        start_time = time.time()
+    def book(self):
+        """Connexion, page de réservation puis achat d'une place (seuil: 2s)"""
+        competition = self.login()
+        started = time.time()
         with self.client.post("/purchasePlaces",
                               data={
-                                  'club': 'Simply Lift',
-                                  'competition': 'Future Championship',
+                                  'club': self.club.name,
+                                  'competition': competition.name,
                                   'places': '1'
                               },
                               catch_response=True) as response:
-            response_time = time.time() - start_time
-
-            if response.status_code == 200:
-                if response_time <= PerformanceThresholds.MAX_UPDATE_TIME:
-                    response.success()
-                else:
-                    response.failure(
-                        f"Mise à jour trop lente: {response_time:.2f}s > "
-                        f"{PerformanceThresholds.MAX_UPDATE_TIME}s"
-                    )
-            else:
-                response.failure(f"Erreur lors de l'achat: {response.status_code}")
+            check_response(response, started, PerformanceThresholds.MAX_UPDATE_TIME, "Mise à jour")
 
 
 # Événements pour afficher les résultats
@@ -128,60 +98,51 @@ def on_test_start(environment, **kwargs):
     print("Seuils configurés:")
     print(f"   • Chargement maximum: {PerformanceThresholds.MAX_LOADING_TIME}s")
     print(f"   • Mise à jour maximum: {PerformanceThresholds.MAX_UPDATE_TIME}s")
+    print(f"   • Débit global minimal: {PerformanceThresholds.MIN_TOTAL_RPS} req/s")
     print(f"   • Utilisateurs par défaut: {PerformanceThresholds.DEFAULT_USERS}")
+    print("Charge:")
+    print(f"   • Clubs: {len(workload.clubs)}, compétitions tirées: {len(workload.competitions.items)}")
+    print(f"   • Parcours (visite/connexion/réservation): {workload.mix}")
     print("="*60 + "\n")
 
 
 @events.test_stop.add_listener
 def on_test_stop(environment, **kwargs):
-    """Affichage du résumé à la fin du test"""
+    """Verdict par endpoint (percentiles, débit), écrit en JSON et affiché"""
+    global verdict
+    endpoints, total = summarize_locust(environment.stats)
+    verdict = evaluate(endpoints, total)
+    verdict['users'] = environment.parsed_options.num_users if environment.parsed_options else None
+    verdict['dataset'] = {'clubs': len(workload.clubs), 'competitions': len(workload.competitions.items)}
+    write_verdict(VERDICT_FILE, verdict)
+
     print("\n" + "="*60)
     print("RÉSULTATS DES TESTS DE PERFORMANCE")
     print("="*60)
-
-    stats = environment.stats
-
     print("Statistiques globales:")
-    print(f"   • Requêtes totales: {stats.total.num_requests}")
-    print(f"   • Échecs: {stats.total.num_failures}")
-    print(f"   • Temps de réponse médian: {stats.total.median_response_time}ms")
-    print(f"   • Temps de réponse moyen: {stats.total.avg_response_time:.1f}ms")
-    print(f"   • Temps de réponse max: {stats.total.max_response_time}ms")
-
-    # Vérification des seuils
-    violations_chargement = 0
-    violations_mise_a_jour = 0
-
-    max_loading_ms = PerformanceThresholds.MAX_LOADING_TIME * 1000
-    max_update_ms = PerformanceThresholds.MAX_UPDATE_TIME * 1000
+    print(f"   • Requêtes totales: {total['requests']}")
+    print(f"   • Échecs: {total['failures']}")
+    print(f"   • Débit: {total['rps']:.1f} req/s")
+    print(f"   • p50/p95/p99: {total['p50']}/{total['p95']}/{total['p99']}ms")
 
     print("Détail par endpoint:")
-    for entry in stats.entries.values():
-        is_loading = (entry.method == "GET" or
-                      (entry.method == "POST" and "/showSummary" in entry.name))
-        is_update = (entry.method == "POST" and "/purchasePlaces" in entry.name)
-
-        status = "OK"
-        if is_loading and entry.max_response_time > max_loading_ms:
-            violations_chargement += 1
-            status = "KO"
-        elif is_update and entry.max_response_time > max_update_ms:
-            violations_mise_a_jour += 1
-            status = "KO"
-
-        print(f"   {status} {entry.method} {entry.name}: "
-              f"max={entry.max_response_time}ms, "
-              f"avg={entry.avg_response_time:.1f}ms")
-
-    print("Conformité aux seuils:")
-    print(f"   • Violations chargement (>{PerformanceThresholds.MAX_LOADING_TIME}s): "
-          f"{violations_chargement}")
-    print(f"   • Violations mise à jour (>{PerformanceThresholds.MAX_UPDATE_TIME}s): "
-          f"{violations_mise_a_jour}")
-
-    if violations_chargement == 0 and violations_mise_a_jour == 0:
-        print("OK - Tous les seuils sont respectés !")
-    else:
-        print("KO - es seuils ont été dépassés.")
+    for name, result in verdict['endpoints'].items():
+        status = "KO" if result['violations'] else "OK"
+        print(f"   {status} {name}: p50={result['p50']}ms, p95={result['p95']}ms, p99={result['p99']}ms, "
+              f"{result['rps']:.1f} req/s")
 
+    if verdict['passed']:
+        print("OK - Tous les objectifs sont respectés !")
+    else:
+        print("KO - Objectifs non tenus :")
+        for violation in verdict['violations']:
+            print(f"   • {violation}")
+    print(f"Verdict écrit dans {VERDICT_FILE}")
     print("="*60 + "\n")
+
+
+@events.quitting.add_listener
+def on_quitting(environment, **kwargs):
+    """Code de sortie non nul si le dernier verdict n'est pas conforme"""
+    if verdict is not None and not verdict['passed']:
+        environment.process_exit_code = 1
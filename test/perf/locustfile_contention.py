@@ -0,0 +1,117 @@
+"""
+Scénario de contention Locust : chaque utilisateur (un club distinct) achète des places de la même compétition
+
+Les points des clubs et les places de la compétition sont relevés via
+/api/clubs et /api/competitions avant et après l'exécution ; les invariants
+de conservation (voir bench_contention.py) sont vérifiés contre les places
+confirmées aux utilisateurs. Un invariant violé donne un code de sortie 1.
+
+Compétition disputée : GUDLFT_LOCUST_HOT_COMPETITION, sinon la plus
+populaire du modèle de charge (workload.py). Exécution locale uniquement :
+les places confirmées sont comptées dans le processus Locust.
+
+Usage:
+    locust -f test/perf/locustfile_contention.py --host=http://localhost:5050 --headless -u 200 -r 50 -t 30s
+"""
+import os
+import sys
+import threading
+import time
+import requests
+from locust import HttpUser, between, events, task
+
+# Ajouter le répertoire racine au path pour les imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.messages import Messages  # noqa: E402
+from storage import write_json_atomic  # noqa: E402
+from test.perf.bench_contention import check_invariants  # noqa: E402
+from test.perf.workload import Workload  # noqa: E402
+
+workload = Workload.from_environment()
+HOT_COMPETITION = os.getenv('GUDLFT_LOCUST_HOT_COMPETITION') or workload.competitions.items[0].name
+REPORT_FILE = os.getenv('GUDLFT_LOCUST_CONTENTION', 'locust_contention.json')
+
+run = {'confirmed': 0, 'lock': threading.Lock()}
+
+
+def fetch_state(host):
+    """Points par club et places restantes de la compétition disputée, lus sur le serveur"""
+    clubs = requests.get(f'{host}/api/clubs', timeout=30).json()['clubs']
+    competitions = requests.get(f'{host}/api/competitions', timeout=30).json()['competitions']
+    places = next(competition['numberOfPlaces'] for competition in competitions
+                  if competition['name'] == HOT_COMPETITION)
+    return {club['name']: club['points'] for club in clubs}, places
+
+
+class ContentionUser(HttpUser):
+    """Club achetant une place de la compétition disputée à chaque itération"""
+    wait_time = between(0, 0.5)
+
+    def on_start(self):
+        self.club, _ = workload.next_user()
+
+    @task
+    def purchase_hot_place(self):
+        with self.client.post("/purchasePlaces",
+                              data={'club': self.club.name, 'competition': HOT_COMPETITION, 'places': '1'},
+                              catch_response=True) as response:
+            if response.status_code != 200:
+                response.failure(f"Erreur lors de l'achat: {response.status_code}")
+                return
+            # Un refus (plus de places, plus de points) est un résultat attendu
+            if Messages.BOOKING_COMPLETE in response.text:
+                with run['lock']:
+                    run['confirmed'] += 1
+            response.success()
+
+
+@events.test_start.add_listener
+def on_test_start(environment, **kwargs):
+    """Relevé initial des points et des places"""
+    run['confirmed'] = 0
+    run['started'] = time.monotonic()
+    run['before'] = fetch_state(environment.host)
+    print(f"\nContention sur « {HOT_COMPETITION} » : {run['before'][1]} places, {len(workload.clubs)} clubs\n")
+
+
+@events.test_stop.add_listener
+def on_test_stop(environment, **kwargs):
+    """Vérification des invariants de conservation et débit de réservation"""
+    duration = time.monotonic() - run['started']
+    clubs_before, places_before = run['before']
+    clubs_after, places_after = fetch_state(environment.host)
+    violations = check_invariants(clubs_before, clubs_after, places_before, places_after, run['confirmed'])
+    report = {
+        'competition': HOT_COMPETITION,
+        'places_before': places_before,
+        'places_after': places_after,
+        'confirmed_places': run['confirmed'],
+        'requests': environment.stats.total.num_requests,
+        'duration_s': round(duration, 3),
+        'bookings_per_s': round(run['confirmed'] / duration, 3),
+        'violations': violations,
+    }
+    run['violations'] = violations
+    write_json_atomic(REPORT_FILE, report)
+
+    print("\n" + "="*60)
+    print("CONTENTION : INVARIANTS DE CONSERVATION")
+    print("="*60)
+    print(f"   • Places: {places_before} -> {places_after}, confirmées: {run['confirmed']}")
+    print(f"   • Débit de réservation: {report['bookings_per_s']:.1f} réservations/s "
+          f"({report['requests']} requêtes en {duration:.1f}s)")
+    if violations:
+        print("KO - Invariants violés :")
+        for violation in violations:
+            print(f"   • {violation}")
+    else:
+        print("OK - Invariants de conservation respectés")
+    print(f"Rapport écrit dans {REPORT_FILE}")
+    print("="*60 + "\n")
+
+
+@events.quitting.add_listener
+def on_quitting(environment, **kwargs):
+    if run.get('violations'):
+        environment.process_exit_code = 1
@@ -0,0 +1,122 @@
+"""
+Modèle ouvert pour Locust : taux d'arrivée constant, paliers, recherche de capacité
+
+Contrairement à locustfile.py (chaque utilisateur attend 1 à 3 s entre deux
+parcours, donc la charge offerte baisse quand le serveur ralentit), chaque
+utilisateur démarre ici un parcours toutes les 1 / GUDLFT_LOCUST_USER_RATE
+secondes et le nombre d'utilisateurs suit le taux d'arrivée visé (parcours
+démarrés par seconde). Tant que les réponses restent plus courtes que cet
+intervalle, la charge offerte ne dépend pas du temps de réponse.
+
+Modes (GUDLFT_LOCUST_SHAPE) :
+    constant  GUDLFT_LOCUST_RATE parcours/s pendant GUDLFT_LOCUST_DURATION_S
+    steps     de GUDLFT_LOCUST_RATE_START à GUDLFT_LOCUST_RATE_MAX, par pas de
+              GUDLFT_LOCUST_RATE_STEP toutes les GUDLFT_LOCUST_STEP_S secondes
+    search    paliers de steps, arrêtés au premier palier dont un endpoint
+              dépasse ses objectifs ; le débit maximal tenu par endpoint est
+              écrit dans locust_capacity.json (GUDLFT_LOCUST_CAPACITY)
+
+Usage:
+    GUDLFT_LOCUST_SHAPE=constant GUDLFT_LOCUST_RATE=50 locust -f test/perf/locustfile_open.py \\
+        --host=http://localhost:5050 --headless
+    GUDLFT_LOCUST_SHAPE=search GUDLFT_LOCUST_RATE_STEP=10 locust -f test/perf/locustfile_open.py \\
+        --host=http://localhost:5050 --headless
+"""
+import math
+import os
+import sys
+import time
+from locust import LoadTestShape, constant_throughput, events
+
+# Ajouter le répertoire racine au path pour les imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import test.perf.locustfile as closed  # noqa: E402
+from storage import write_json_atomic  # noqa: E402
+from test.perf.capacity import CapacitySearch, snapshot, window_summary  # noqa: E402
+
+USER_RATE = float(os.getenv('GUDLFT_LOCUST_USER_RATE', '0.5'))
+CAPACITY_FILE = os.getenv('GUDLFT_LOCUST_CAPACITY', 'locust_capacity.json')
+
+
+class OpenClubUser(closed.ClubUser):
+    """ClubUser cadencé : un parcours toutes les 1 / USER_RATE secondes, quel que soit le temps de réponse"""
+    wait_time = constant_throughput(USER_RATE)
+
+
+class ArrivalRateShape(LoadTestShape):
+    """Nombre d'utilisateurs OpenClubUser ajusté au taux d'arrivée visé"""
+
+    def __init__(self):
+        super().__init__()
+        self.mode = os.getenv('GUDLFT_LOCUST_SHAPE', 'steps')
+        if self.mode not in ('constant', 'steps', 'search'):
+            raise ValueError(f"Mode inconnu : {self.mode!r} (constant, steps ou search)")
+        self.rate = float(os.getenv('GUDLFT_LOCUST_RATE', '20'))
+        self.duration = float(os.getenv('GUDLFT_LOCUST_DURATION_S', '60'))
+        self.rate_start = float(os.getenv('GUDLFT_LOCUST_RATE_START', '5'))
+        self.rate_step = float(os.getenv('GUDLFT_LOCUST_RATE_STEP', '5'))
+        self.rate_max = float(os.getenv('GUDLFT_LOCUST_RATE_MAX', '200'))
+        self.step_s = float(os.getenv('GUDLFT_LOCUST_STEP_S', '30'))
+        # Début de palier exclu de la mesure (montée des utilisateurs)
+        self.settle_s = min(5.0, self.step_s / 3)
+        self.search = CapacitySearch() if self.mode == 'search' else None
+        self._step = None
+        self._window = None
+
+    def users_for(self, rate):
+        return max(1, math.ceil(rate / USER_RATE))
+
+    def tick(self):
+        run_time = self.get_run_time()
+        if self.mode == 'constant':
+            if run_time >= self.duration:
+                return None
+            users = self.users_for(self.rate)
+            return users, users
+
+        step = int(run_time // self.step_s)
+        if self.search is not None:
+            self.measure(step, run_time)
+            if self.search.done:
+                return None
+        rate = self.rate_start + step * self.rate_step
+        if rate > self.rate_max:
+            return None
+        users = self.users_for(rate)
+        return users, users
+
+    def measure(self, step, run_time):
+        """Ouvre la fenêtre de mesure du palier après stabilisation, la juge au changement de palier"""
+        if self._step is not None and step != self._step and self._window is not None:
+            started, before = self._window
+            rate = self.rate_start + self._step * self.rate_step
+            self.search.record(rate, window_summary(before, snapshot(self.runner.stats), time.monotonic() - started))
+            self._window = None
+        self._step = step
+        if self._window is None and run_time - step * self.step_s >= self.settle_s:
+            self._window = (time.monotonic(), snapshot(self.runner.stats))
+
+
+@events.test_stop.add_listener
+def on_capacity_stop(environment, **kwargs):
+    """Rapport de la recherche de capacité (mode search)"""
+    shape = environment.shape_class
+    if not isinstance(shape, ArrivalRateShape) or shape.search is None or not shape.search.steps:
+        return
+    report = shape.search.report()
+    write_json_atomic(CAPACITY_FILE, report)
+
+    print("\n" + "="*60)
+    print("RECHERCHE DE CAPACITÉ")
+    print("="*60)
+    print(f"Taux d'arrivée maximal tenu: {report['max_sustainable_rate']} parcours/s")
+    if report['broken_at'] is not None:
+        print(f"Objectifs dépassés à {report['broken_at']} parcours/s:")
+        for violation in report['violations']:
+            print(f"   • {violation}")
+    print("Débit maximal tenu par endpoint:")
+    for name, rps in report['endpoints'].items():
+        print(f"   {name}: {rps:.1f} req/s")
+    print(f"Rapport écrit dans {CAPACITY_FILE}")
+    print("="*60 + "\n")
@@ -0,0 +1,66 @@
+"""
+Verdict d'une exécution de charge : percentiles et débit par endpoint contre PerformanceThresholds
+
+Le verdict est un dict sérialisable en JSON :
+    {"passed": bool, "violations": [...], "total": {...},
+     "endpoints": {"POST /purchasePlaces": {"requests": ..., "p95": ..., "targets": {...}, "violations": [...]}}}
+"""
+import time
+
+from config.messages import PerformanceThresholds
+from storage import write_json_atomic
+
+PERCENTILES = {'p50': 0.50, 'p95': 0.95, 'p99': 0.99}
+
+
+def summarize_entry(entry):
+    """Résumé d'une entrée de statistiques Locust (temps en ms, débit en requêtes/s)"""
+    summary = {'requests': entry.num_requests, 'failures': entry.num_failures}
+    for key, quantile in PERCENTILES.items():
+        summary[key] = entry.get_response_time_percentile(quantile) if entry.num_requests else 0
+    summary['max'] = entry.max_response_time
+    summary['rps'] = round(entry.total_rps, 3)
+    # Distribution des temps (ms arrondis : nombre), pour les comparaisons de test/perf/history.py
+    summary['histogram'] = dict(sorted(entry.response_times.items()))
+    return summary
+
+
+def summarize_locust(stats):
+    """Résumés par endpoint ("MÉTHODE nom") et global des statistiques Locust"""
+    endpoints = {f'{entry.method} {entry.name}': summarize_entry(entry) for entry in stats.entries.values()}
+    return endpoints, summarize_entry(stats.total)
+
+
+def check(summary, targets, max_failure_ratio):
+    """Objectifs non tenus par un résumé, sous forme de messages"""
+    violations = []
+    if summary['requests'] and summary['failures'] / summary['requests'] > max_failure_ratio:
+        violations.append(f"échecs {summary['failures']}/{summary['requests']} > {max_failure_ratio:.0%}")
+    for key in PERCENTILES:
+        if summary['requests'] and key in targets and summary[key] > targets[key]:
+            violations.append(f"{key} {summary[key]:.0f}ms > {targets[key]:.0f}ms")
+    if targets.get('rps') and summary['rps'] < targets['rps']:
+        violations.append(f"débit {summary['rps']:.2f} req/s < {targets['rps']} req/s")
+    return violations
+
+
+def evaluate(endpoints, total, thresholds=PerformanceThresholds):
+    """Verdict des résumés contre les objectifs par endpoint et globaux"""
+    verdict = {'endpoints': {}, 'violations': []}
+    for name, summary in sorted(endpoints.items()):
+        targets = thresholds.ENDPOINT_TARGETS.get(name, thresholds.DEFAULT_TARGETS)
+        violations = check(summary, targets, thresholds.MAX_FAILURE_RATIO)
+        verdict['endpoints'][name] = {**summary, 'targets': targets, 'violations': violations}
+        verdict['violations'].extend(f'{name}: {violation}' for violation in violations)
+
+    total_targets = {'rps': thresholds.MIN_TOTAL_RPS}
+    total_violations = check(total, total_targets, thresholds.MAX_FAILURE_RATIO)
+    verdict['total'] = {**total, 'targets': total_targets, 'violations': total_violations}
+    verdict['violations'].extend(f'Total: {violation}' for violation in total_violations)
+    verdict['passed'] = not verdict['violations']
+    verdict['timestamp'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+    return verdict
+
+
+def write_verdict(path, verdict):
+    write_json_atomic(path, verdict)
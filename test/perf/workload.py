@@ -0,0 +1,90 @@
+"""
+Modèle de charge réaliste pour Locust : clubs et compétitions lus dans les fichiers de données
+
+Chaque utilisateur virtuel reçoit son propre club ; les compétitions sont
+choisies selon une popularité de Zipf (quelques compétitions concentrent
+l'essentiel du trafic) ; les parcours visite/connexion/réservation sont
+tirés selon des proportions configurables.
+
+Variables d'environnement (lues par locustfile.py) :
+    GUDLFT_DATA_DIR       répertoire de clubs.json / competitions.json (celui du serveur)
+    GUDLFT_LOCUST_ZIPF    exposant de Zipf (1.0 ; 0 : popularité uniforme)
+    GUDLFT_LOCUST_MIX     proportions visite,connexion,réservation (60,30,10)
+    GUDLFT_LOCUST_SEED    graine des tirages (0)
+"""
+import itertools
+import os
+import random
+from bisect import bisect_right
+from datetime import datetime
+from itertools import accumulate
+
+from storage import JsonRepository
+
+FLOWS = ('browse', 'login', 'book')
+DEFAULT_MIX = (60, 30, 10)
+
+
+def parse_mix(value):
+    """'60,30,10' -> {'browse': 60, 'login': 30, 'book': 10}"""
+    weights = [int(weight) for weight in value.split(',')] if value else list(DEFAULT_MIX)
+    if len(weights) != len(FLOWS) or min(weights) < 0 or not any(weights):
+        raise ValueError(f"Proportions invalides : {value!r} (attendu : visite,connexion,réservation)")
+    return dict(zip(FLOWS, weights))
+
+
+class ZipfSampler:
+    """Tirage d'éléments de probabilité proportionnelle à 1 / rang ** exponent
+
+    Les rangs sont attribués par un mélange déterministe (graine), pour que
+    la popularité ne suive pas l'ordre du fichier.
+    """
+
+    def __init__(self, items, exponent=1.0, seed=0):
+        if not items:
+            raise ValueError('Aucun élément à tirer')
+        self.items = list(items)
+        random.Random(f'{seed}-zipf').shuffle(self.items)
+        self.cumulative = list(accumulate(1 / rank ** exponent for rank in range(1, len(self.items) + 1)))
+
+    def sample(self, rng=random):
+        point = rng.random() * self.cumulative[-1]
+        return self.items[min(bisect_right(self.cumulative, point), len(self.items) - 1)]
+
+
+class Workload:
+    """Clubs, compétitions à venir et proportions des parcours pour une exécution Locust"""
+
+    def __init__(self, clubs, competitions, exponent=1.0, mix=None, seed=0, now=None):
+        if not clubs:
+            raise ValueError('Aucun club dans le jeu de données')
+        now = now or datetime.now()
+        upcoming = [competition for competition in competitions if competition.date > now]
+        self.clubs = clubs
+        self.competitions = ZipfSampler(upcoming or competitions, exponent, seed)
+        self.mix = mix or dict(zip(FLOWS, DEFAULT_MIX))
+        self.seed = seed
+        self._next_user = itertools.count()
+
+    @classmethod
+    def from_directory(cls, directory='', **options):
+        repository = JsonRepository(lambda filename: os.path.join(directory, filename))
+        return cls(repository.load_clubs(), repository.load_competitions(), **options)
+
+    @classmethod
+    def from_environment(cls):
+        return cls.from_directory(os.getenv('GUDLFT_DATA_DIR', ''),
+                                  exponent=float(os.getenv('GUDLFT_LOCUST_ZIPF', '1.0')),
+                                  mix=parse_mix(os.getenv('GUDLFT_LOCUST_MIX')),
+                                  seed=int(os.getenv('GUDLFT_LOCUST_SEED', '0')))
+
+    def next_user(self):
+        """Club et générateur aléatoire propres au prochain utilisateur virtuel
+
+        Les clubs sont distincts tant qu'il y a moins d'utilisateurs que de clubs.
+        """
+        index = next(self._next_user)
+        return self.clubs[index % len(self.clubs)], random.Random(f'{self.seed}-user{index}')
+
+    def next_flow(self, rng):
+        return rng.choices(FLOWS, weights=[self.mix[flow] for flow in FLOWS])[0]
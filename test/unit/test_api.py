@@ -0,0 +1,70 @@
+import server
+
+
+def test_api_clubs_lists_points(client):
+    """Test que l'API renvoie les points de chaque club, sans les emails"""
+    response = client.get('/api/clubs')
+    assert response.status_code == 200
+
+    clubs = {club['name']: club for club in response.json['clubs']}
+    assert clubs['Simply Lift'] == {'name': 'Simply Lift', 'points': 15}
+    assert len(clubs) == 6
+
+
+def test_api_competitions_lists_places_and_dates(client):
+    """Test que l'API renvoie date et places restantes des compétitions"""
+    response = client.get('/api/competitions')
+    assert response.status_code == 200
+
+    competitions = {comp['name']: comp for comp in response.json['competitions']}
+    assert competitions['Future Championship'] == {
+        'name': 'Future Championship',
+        'date': '2026-06-15 14:00:00',
+        'numberOfPlaces': 30,
+    }
+
+
+def test_api_returns_strong_etag_and_304(client):
+    """Test qu'une requête conditionnelle sans changement renvoie 304"""
+    response = client.get('/api/clubs')
+    etag = response.headers['ETag']
+    assert not etag.startswith('W/')
+
+    response = client.get('/api/clubs', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+
+
+def test_api_etag_changes_after_booking(client):
+    """Test qu'une réservation invalide l'ETag des deux ressources"""
+    clubs_etag = client.get('/api/clubs').headers['ETag']
+    competitions_etag = client.get('/api/competitions').headers['ETag']
+
+    client.post('/purchasePlaces', data={
+        'club': 'Simply Lift',
+        'competition': 'Future Championship',
+        'places': '2'
+    })
+
+    response = client.get('/api/clubs', headers={'If-None-Match': clubs_etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != clubs_etag
+    response = client.get('/api/competitions', headers={'If-None-Match': competitions_etag})
+    assert response.status_code == 200
+
+
+def test_api_failed_booking_keeps_etag(client):
+    """Test qu'une réservation refusée ne change pas la version des données"""
+    version = server.data_version.value
+    client.post('/purchasePlaces', data={
+        'club': 'Simply Lift',
+        'competition': 'Spring Festival',
+        'places': '1'
+    })
+    assert server.data_version.value == version
+
+
+def test_api_etags_differ_between_resources(client):
+    """Test que les deux ressources n'ont pas le même ETag"""
+    assert client.get('/api/clubs').headers['ETag'] != client.get('/api/competitions').headers['ETag']
@@ -0,0 +1,142 @@
+import json
+import server
+from config.messages import Messages
+
+
+def load_points(name):
+    with open('test/data/testing/clubs.json') as f:
+        return {club['name']: club['points'] for club in json.load(f)['clubs']}[name]
+
+
+def load_places(name):
+    with open('test/data/testing/competitions.json') as f:
+        return {comp['name']: comp['numberOfPlaces'] for comp in json.load(f)['competitions']}[name]
+
+
+def test_batch_json_books_all_competitions(client):
+    """Test qu'un lot JSON réserve toutes les compétitions demandées"""
+    response = client.post('/purchasePlacesBatch', json={
+        'club': 'Simply Lift',
+        'bookings': [
+            {'competition': 'Future Championship', 'places': 2},
+            {'competition': 'Next Year Games', 'places': 3},
+        ]
+    })
+
+    assert response.status_code == 200
+    assert response.json['points'] == 10
+    assert load_points('Simply Lift') == 10
+    assert load_places('Future Championship') == 28
+    assert load_places('Next Year Games') == 37
+
+
+def test_batch_form_books_all_competitions(client):
+    """Test qu'un lot envoyé par formulaire réserve toutes les compétitions"""
+    response = client.post('/purchasePlacesBatch', data={
+        'club': 'She Lifts',
+        'competition': ['Future Championship', 'Next Year Games'],
+        'places': ['1', '4'],
+    })
+
+    assert response.status_code == 200
+    assert Messages.BOOKING_COMPLETE.encode() in response.data
+    assert load_points('She Lifts') == 7
+
+
+def test_batch_is_all_or_nothing(client):
+    """Test qu'une seule réservation invalide annule tout le lot"""
+    response = client.post('/purchasePlacesBatch', json={
+        'club': 'Simply Lift',
+        'bookings': [
+            {'competition': 'Future Championship', 'places': 2},
+            {'competition': 'Spring Festival', 'places': 1},
+        ]
+    })
+
+    assert response.status_code == 400
+    assert response.json['errors'] == [
+        {'competition': 'Spring Festival', 'message': Messages.COMPETITION_EXPIRED}
+    ]
+    assert server.clubs_by_name.get('Simply Lift').points == 15
+    assert load_points('Simply Lift') == 15
+    assert load_places('Future Championship') == 30
+
+
+def test_batch_points_checked_on_cumulated_places(client):
+    """Test que les points sont vérifiés sur le total du lot"""
+    response = client.post('/purchasePlacesBatch', json={
+        'club': 'Iron Temple',  # 4 points
+        'bookings': [
+            {'competition': 'Future Championship', 'places': 3},
+            {'competition': 'Next Year Games', 'places': 3},
+        ]
+    })
+
+    assert response.status_code == 400
+    assert response.json['errors'][0]['message'] == Messages.format_not_enough_points(3, 1)
+    assert load_points('Iron Temple') == 4
+
+
+def test_batch_same_competition_respects_max_places(client):
+    """Test que le plafond de 12 places s'applique au cumul d'une même compétition"""
+    response = client.post('/purchasePlacesBatch', json={
+        'club': 'Simply Lift',
+        'bookings': [
+            {'competition': 'Future Championship', 'places': 8},
+            {'competition': 'Future Championship', 'places': 5},
+        ]
+    })
+
+    assert response.status_code == 400
+    assert response.json['errors'][0]['message'] == Messages.MAX_PLACES_EXCEEDED
+
+
+def test_batch_unknown_club_or_competition(client):
+    """Test d'un lot avec club ou compétition inconnus"""
+    response = client.post('/purchasePlacesBatch', json={
+        'club': 'Unknown Club',
+        'bookings': [{'competition': 'Future Championship', 'places': 1}]
+    })
+    assert response.status_code == 400
+    assert response.json['errors'][0]['message'] == Messages.CLUB_NOT_FOUND
+
+    response = client.post('/purchasePlacesBatch', json={
+        'club': 'Simply Lift',
+        'bookings': [{'competition': 'Unknown Competition', 'places': 1}]
+    })
+    assert response.json['errors'][0]['message'] == Messages.COMPETITION_NOT_FOUND
+
+
+def test_batch_empty_or_malformed(client):
+    """Test d'un lot vide ou mal formé"""
+    response = client.post('/purchasePlacesBatch', json={'club': 'Simply Lift', 'bookings': []})
+    assert response.status_code == 400
+    assert response.json['errors'][0]['message'] == Messages.EMPTY_BATCH
+
+    response = client.post('/purchasePlacesBatch', json={'club': 'Simply Lift', 'bookings': 'oops'})
+    assert response.status_code == 400
+
+
+def test_batch_body_not_an_object(client):
+    """Test qu'un corps JSON qui n'est pas un objet est refusé comme un lot mal formé"""
+    for body in ('[{"competition": "Future Championship", "places": "1"}]', '"Simply Lift"', '42', 'null'):
+        response = client.post('/purchasePlacesBatch', data=body, content_type='application/json')
+        assert response.status_code == 400
+        assert response.json['errors'] == [{'competition': None, 'message': Messages.EMPTY_BATCH}]
+    assert load_points('Simply Lift') == 15
+
+
+def test_batch_persists_once(client, monkeypatch):
+    """Test qu'un lot de plusieurs réservations ne déclenche qu'une écriture"""
+    calls = []
+    original = server.flushBookings
+    monkeypatch.setattr(server, 'flushBookings', lambda bookings: calls.append(len(bookings)) or original(bookings))
+
+    client.post('/purchasePlacesBatch', json={
+        'club': 'Simply Lift',
+        'bookings': [
+            {'competition': 'Future Championship', 'places': 1},
+            {'competition': 'Next Year Games', 'places': 1},
+        ]
+    })
+    assert calls == [2]
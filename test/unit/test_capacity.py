@@ -0,0 +1,43 @@
+from test.perf.capacity import CapacitySearch, percentile, window_summary
+
+
+def test_percentile_from_histogram():
+    """Test du calcul d'un percentile à partir d'un histogramme {ms: nombre}"""
+    histogram = {10: 90, 100: 9, 1000: 1}
+    assert percentile(histogram, 100, 0.5) == 10
+    assert percentile(histogram, 100, 0.95) == 100
+    assert percentile(histogram, 100, 0.99) == 100
+    assert percentile(histogram, 100, 1.0) == 1000
+    assert percentile({}, 0, 0.5) == 0
+
+
+def test_window_only_counts_new_requests():
+    """Test qu'un palier n'est jugé que sur les requêtes arrivées pendant sa fenêtre"""
+    before = {'GET /': (100, 0, {10: 100})}
+    after = {'GET /': (150, 1, {10: 100, 500: 50}), 'POST /purchasePlaces': (10, 0, {50: 10})}
+
+    summaries = window_summary(before, after, duration=10)
+    assert summaries['GET /'] == {'requests': 50, 'failures': 1, 'p50': 500, 'p95': 500, 'p99': 500, 'rps': 5.0}
+    assert summaries['POST /purchasePlaces']['rps'] == 1.0
+    assert window_summary(after, after, duration=10) == {}
+
+
+def step(p95, rps):
+    return {'requests': 100, 'failures': 0, 'p50': 10, 'p95': p95, 'p99': p95, 'rps': rps}
+
+
+def test_search_stops_at_first_broken_step():
+    """Test que la recherche retient, par endpoint, le débit du dernier palier conforme"""
+    search = CapacitySearch()
+    assert search.record(10, {'GET /': step(50, 15.0), 'POST /purchasePlaces': step(50, 2.0)})
+    assert search.record(20, {'GET /': step(80, 30.0), 'POST /purchasePlaces': step(50, 4.0)})
+    assert not search.record(30, {'GET /': step(100, 45.0), 'POST /purchasePlaces': step(5000, 6.0)})
+
+    report = search.report()
+    assert search.done
+    assert report['max_sustainable_rate'] == 20
+    assert report['broken_at'] == 30
+    assert report['endpoints'] == {'GET /': 45.0, 'POST /purchasePlaces': 4.0}
+    assert report['violations'] == ['POST /purchasePlaces: p95 5000ms > 1000ms',
+                                    'POST /purchasePlaces: p99 5000ms > 2000ms']
+    assert len(report['steps']) == 3
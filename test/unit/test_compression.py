@@ -0,0 +1,112 @@
+import gzip
+
+import brotli
+import pytest
+from werkzeug.datastructures import Accept
+from werkzeug.http import parse_accept_header
+
+import server
+from web import ResponseCompressor
+
+
+def accept(value):
+    return parse_accept_header(value, Accept)
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('br, gzip', 'br'),
+    ('gzip', 'gzip'),
+    ('gzip, br;q=0.5', 'gzip'),
+    ('br;q=0, gzip;q=0', None),
+    ('identity', None),
+    ('*', 'br'),
+])
+def test_negotiate_encoding(header, expected):
+    """Test du choix de l'encodage selon les qualités d'Accept-Encoding"""
+    assert ResponseCompressor().negotiate(accept(header)) == expected
+
+
+def test_index_compressed_with_brotli(client):
+    """Test que l'accueil est servi en Brotli quand le client l'accepte"""
+    plain = client.get('/')
+    response = client.get('/', headers={'Accept-Encoding': 'gzip, br'})
+
+    assert response.headers['Content-Encoding'] == 'br'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert brotli.decompress(response.data) == plain.data
+    assert len(response.data) < len(plain.data)
+
+
+def test_index_compressed_with_gzip(client):
+    """Test que l'accueil est servi en gzip sans support de Brotli"""
+    plain = client.get('/')
+    response = client.get('/', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.data) == plain.data
+
+
+def test_small_response_not_compressed(client, monkeypatch):
+    """Test qu'une réponse sous le seuil minimal reste non compressée"""
+    monkeypatch.setattr(server, 'compressor', ResponseCompressor(min_size=10_000))
+    response = client.get('/', headers={'Accept-Encoding': 'br, gzip'})
+
+    assert 'Content-Encoding' not in response.headers
+    assert b'Simply Lift' in response.data
+
+
+def test_compressed_page_reused_until_booking(client):
+    """Test que les octets compressés sont mis en cache avec la version des données"""
+    headers = {'Accept-Encoding': 'br'}
+    client.get('/', headers=headers)
+    misses = server.compressed_cache.misses
+    fragment_misses = server.fragment_cache.misses
+    client.get('/', headers=headers)
+    assert server.compressed_cache.misses == misses
+
+    client.post('/purchasePlaces', data={
+        'club': 'Simply Lift',
+        'competition': 'Future Championship',
+        'places': '2'
+    })
+    response = client.get('/', headers=headers)
+    # Page compressée et tableau des points rendus à nouveau, chacun dans son cache
+    assert server.compressed_cache.misses == misses + 1
+    assert server.fragment_cache.misses == fragment_misses + 1
+    assert b'>13</td>' in brotli.decompress(response.data)
+
+
+def test_compressed_lookups_not_counted_as_fragments(client, monkeypatch):
+    """Test que le cache des pages compressées n'entre pas dans les compteurs des fragments"""
+    monkeypatch.setattr(server, 'compressor', ResponseCompressor(min_size=0))
+    client.get('/')
+    fragments = server.fragment_cache.stats()
+    compressed = server.compressed_cache.stats()
+
+    client.get('/api/clubs', headers={'Accept-Encoding': 'br'})
+    client.get('/api/clubs', headers={'Accept-Encoding': 'br'})
+
+    assert server.fragment_cache.stats() == fragments
+    assert server.compressed_cache.hits == compressed['hits'] + 1
+    assert server.compressed_cache.misses == compressed['misses'] + 1
+
+
+def test_flashed_page_not_cached_compressed(client):
+    """Test qu'une page portant un message flash n'est jamais mise en cache"""
+    response = client.post('/showSummary', data={'email': 'inconnu@example.com'},
+                           headers={'Accept-Encoding': 'br'}, follow_redirects=True)
+    assert b'alert alert-info' in brotli.decompress(response.data)
+
+    response = client.get('/', headers={'Accept-Encoding': 'br'})
+    assert b'alert alert-info' not in brotli.decompress(response.data)
+
+
+def test_compressed_api_etag_is_weak_and_revalidates(client):
+    """Test que l'ETag de la version compressée est faible et accepté en 304"""
+    response = client.get('/api/competitions', headers={'Accept-Encoding': 'gzip'})
+    etag = response.headers['ETag']
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert etag.startswith('W/')
+
+    response = client.get('/api/competitions', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    assert response.status_code == 304
@@ -0,0 +1,117 @@
+import threading
+
+import server
+from web import EventHub
+from web.events import format_event
+
+
+def test_wait_returns_events_after_id():
+    """Test que wait renvoie les événements publiés après un numéro donné"""
+    hub = EventHub()
+    hub.publish('booking', {'n': 1})
+    hub.publish('booking', {'n': 2})
+
+    assert hub.wait(0) == [(1, 'booking', {'n': 1}), (2, 'booking', {'n': 2})]
+    assert hub.wait(1) == [(2, 'booking', {'n': 2})]
+    assert hub.wait(2, timeout=0.01) == []
+
+
+def test_wait_detects_lagging_subscriber():
+    """Test qu'un abonné dont les événements ont quitté le tampon est signalé"""
+    hub = EventHub(capacity=2)
+    for n in range(3):
+        hub.publish('booking', {'n': n})
+
+    assert hub.wait(0) is None
+    assert hub.wait(1) == [(2, 'booking', {'n': 1}), (3, 'booking', {'n': 2})]
+    assert hub.wait(10) is None
+
+
+def test_stream_wakes_many_subscribers_on_publish():
+    """Test qu'une publication réveille tous les abonnés en attente"""
+    hub = EventHub(heartbeat=5)
+    received = []
+    streams = [hub.stream() for _ in range(50)]
+    for stream in streams:
+        next(stream)  # en-tête retry
+
+    def subscribe(stream):
+        received.append(next(stream))
+
+    threads = [threading.Thread(target=subscribe, args=(stream,)) for stream in streams]
+    for thread in threads:
+        thread.start()
+    hub.publish('booking', {'clubs': {'Simply Lift': 13}})
+    for thread in threads:
+        thread.join(timeout=5)
+
+    expected = format_event(1, 'booking', {'clubs': {'Simply Lift': 13}})
+    assert received == [expected] * 50
+    assert hub.subscribers == 50
+    for stream in streams:
+        stream.close()
+    assert hub.subscribers == 0
+
+
+def test_stream_sends_keep_alive_and_resync():
+    """Test du keep-alive sans événement et du resync après un numéro inconnu"""
+    hub = EventHub(heartbeat=0.01)
+    stream = hub.stream()
+    assert next(stream) == 'retry: 10\n\n'
+    assert next(stream) == ': keep-alive\n\n'
+    stream.close()
+
+    stream = hub.stream(last_id=42)
+    next(stream)
+    assert next(stream) == 'id: 0\nevent: resync\ndata: {}\n\n'
+    stream.close()
+
+
+def test_close_ends_stream():
+    """Test que close termine les flux en cours"""
+    hub = EventHub(heartbeat=5)
+    stream = hub.stream()
+    next(stream)
+    hub.close()
+    assert list(stream) == []
+
+
+def test_purchase_publishes_places_and_points(client):
+    """Test qu'un achat publie les nouvelles places et points sur /events"""
+    last_id = server.event_hub.last_id
+    client.post('/purchasePlaces', data={
+        'club': 'Simply Lift',
+        'competition': 'Future Championship',
+        'places': '2'
+    })
+
+    response = client.get('/events', headers={'Last-Event-ID': str(last_id)}, buffered=False)
+    assert response.mimetype == 'text/event-stream'
+    chunks = iter(response.response)
+    next(chunks)
+    event = next(chunks).decode()
+    response.close()
+
+    assert event == format_event(last_id + 1, 'booking', {
+        'competitions': {'Future Championship': 28},
+        'clubs': {'Simply Lift': 13},
+    })
+
+
+def test_failed_purchase_publishes_nothing(client):
+    """Test qu'un achat refusé ne publie aucun événement"""
+    last_id = server.event_hub.last_id
+    client.post('/purchasePlaces', data={
+        'club': 'Simply Lift',
+        'competition': 'Future Championship',
+        'places': '13'
+    })
+    assert server.event_hub.last_id == last_id
+
+
+def test_summary_page_resyncs_from_api(client):
+    """Test que la page de résumé relit places et points sur un événement resync"""
+    response = client.post('/showSummary', data={'email': 'john@simplylift.co'})
+    assert b"addEventListener('resync'" in response.data
+    assert b'/api/competitions' in response.data
+    assert b'/api/clubs' in response.data
@@ -0,0 +1,72 @@
+import server
+from web import FragmentCache
+
+
+def test_fragment_cache_reuses_render_for_same_version():
+    """Test qu'un fragment n'est rendu qu'une fois par version"""
+    cache = FragmentCache()
+    renders = []
+
+    def render():
+        renders.append(1)
+        return f'rendu {len(renders)}'
+
+    assert cache.get_or_render('table', 1, render) == 'rendu 1'
+    assert cache.get_or_render('table', 1, render) == 'rendu 1'
+    assert cache.get_or_render('table', 2, render) == 'rendu 2'
+    assert cache.stats() == {'hits': 1, 'misses': 2, 'hit_ratio': 1 / 3, 'entries': 1}
+
+
+def test_fragment_cache_invalidate_forces_render():
+    """Test que l'invalidation force un nouveau rendu à version égale"""
+    cache = FragmentCache()
+    cache.get_or_render('table', 1, lambda: 'ancien')
+    cache.invalidate('table')
+
+    assert not cache.lookup('table', 1)
+    assert cache.get_or_render('table', 1, lambda: 'nouveau') == 'nouveau'
+
+
+def test_index_serves_points_table_from_cache(client):
+    """Test que la deuxième visite de l'accueil réutilise le fragment"""
+    first = client.get('/')
+    second = client.get('/')
+
+    assert first.headers['X-Fragment-Cache'] == 'miss'
+    assert second.headers['X-Fragment-Cache'] == 'hit'
+    assert first.data == second.data
+    assert b'Simply Lift' in second.data
+
+
+def test_booking_invalidates_points_table(client):
+    """Test qu'une réservation rafraîchit les points affichés sur l'accueil"""
+    client.get('/')
+    client.post('/purchasePlaces', data={
+        'club': 'Simply Lift',
+        'competition': 'Future Championship',
+        'places': '2'
+    })
+    response = client.get('/')
+
+    assert response.headers['X-Fragment-Cache'] == 'miss'
+    assert b'<td style="padding: 10px; text-align: center; border-bottom: 1px solid #ddd;">13</td>' in response.data
+
+
+def test_save_clubs_invalidates_points_table(client):
+    """Test que saveClubs invalide le fragment même sans changement de version"""
+    client.get('/')
+    server.saveClubs()
+
+    assert client.get('/').headers['X-Fragment-Cache'] == 'miss'
+
+
+def test_flash_messages_never_cached_in_fragment(client):
+    """Test qu'un message flash n'apparaît qu'au visiteur concerné"""
+    client.get('/')
+    flashed = client.post('/showSummary', data={'email': 'inconnu@example.com'}, follow_redirects=True)
+    assert flashed.headers['X-Fragment-Cache'] == 'hit'
+    assert b'alert alert-info' in flashed.data
+
+    response = client.get('/')
+    assert response.headers['X-Fragment-Cache'] == 'hit'
+    assert b'alert alert-info' not in response.data
@@ -0,0 +1,94 @@
+import json
+import os
+import subprocess
+import sys
+import types
+from datetime import datetime
+import pytest
+import server
+from storage import Club, Competition
+from test.perf.generate_dataset import generate_clubs, generate_competitions, write_collection, write_dataset
+
+
+def read(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+def test_same_seed_same_files(tmp_path):
+    """Test que la génération est déterministe pour une graine donnée"""
+    write_dataset(tmp_path / 'a', 50, 50, seed=3)
+    write_dataset(tmp_path / 'b', 50, 50, seed=3)
+    write_dataset(tmp_path / 'c', 50, 50, seed=4)
+
+    for name in ('clubs.json', 'competitions.json'):
+        assert (tmp_path / 'a' / name).read_bytes() == (tmp_path / 'b' / name).read_bytes()
+        assert (tmp_path / 'a' / name).read_bytes() != (tmp_path / 'c' / name).read_bytes()
+
+
+def test_files_load_as_records(tmp_path):
+    """Test que les fichiers générés sont lisibles par les modèles, noms et emails uniques"""
+    write_dataset(tmp_path, 200, 100, seed=1)
+    clubs = [Club.from_dict(club) for club in read(tmp_path / 'clubs.json')['clubs']]
+    competitions = [Competition.from_dict(c) for c in read(tmp_path / 'competitions.json')['competitions']]
+
+    assert len(clubs) == 200 and len(competitions) == 100
+    assert len({club.name for club in clubs}) == 200
+    assert len({club.email for club in clubs}) == 200
+    assert len({competition.name for competition in competitions}) == 100
+
+
+def test_options_shape_the_data():
+    """Test du mélange passé/futur, de la distribution des points et de la longueur des noms"""
+    reference = datetime(2030, 1, 1)
+    competitions = list(generate_competitions(1000, future_ratio=0.8, reference=reference, name_length=(30, 30)))
+    future = sum(Competition.from_dict(c).date > reference for c in competitions)
+    assert 750 <= future <= 850
+    assert all(len(competition['name']) == 30 for competition in competitions)
+
+    uniform = [club['points'] for club in generate_clubs(1000, points='uniform', max_points=30)]
+    pareto = [club['points'] for club in generate_clubs(1000, points='pareto', max_points=30)]
+    assert max(uniform) <= 30 and max(pareto) <= 30
+    assert sorted(pareto)[500] < sorted(uniform)[500]
+    assert {club['points'] for club in generate_clubs(10, points='constant', max_points=7)} == {7}
+
+    with pytest.raises(ValueError):
+        list(generate_clubs(1, points='normal'))
+
+
+def test_write_collection_consumes_a_generator(tmp_path):
+    """Test que l'écriture se fait au fil d'un générateur, sans liste intermédiaire"""
+    records = generate_clubs(10)
+    assert isinstance(records, types.GeneratorType)
+    assert write_collection(str(tmp_path / 'clubs.json'), 'clubs', records) == 10
+    assert len(read(tmp_path / 'clubs.json')['clubs']) == 10
+    assert [path.name for path in tmp_path.iterdir()] == ['clubs.json']
+
+
+def test_data_dir_points_app_at_generated_data(tmp_path):
+    """Test que DATA_DIR redirige get_data_path vers le jeu de données généré"""
+    write_dataset(tmp_path, 20, 5, seed=2)
+    previous_data_dir = server.app.config['DATA_DIR']
+    server.app.config['DATA_DIR'] = str(tmp_path)
+    try:
+        server.initStorage()
+        assert server.get_data_path('clubs.json') == str(tmp_path / 'clubs.json')
+        assert len(server.clubs) == 20 and len(server.competitions) == 5
+    finally:
+        server.app.config['DATA_DIR'] = previous_data_dir
+        server.initStorage()
+    assert server.get_data_path('clubs.json') == os.path.join('test', 'data', 'testing', 'clubs.json')
+
+
+def test_tests_ignore_exported_data_dir(tmp_path):
+    """Test qu'un GUDLFT_DATA_DIR exporté ne détourne pas les tests de leurs données"""
+    write_dataset(tmp_path, 20, 5, seed=2)
+    clubs = (tmp_path / 'clubs.json').read_bytes()
+    # Ce test appelle saveClubs() : il réécrirait clubs.json du répertoire exporté
+    result = subprocess.run(
+        [sys.executable, '-m', 'pytest', '-q', '-p', 'no:cacheprovider',
+         'test/unit/test_metrics.py::test_metrics_endpoint_exports_persistence_and_render'],
+        env={**os.environ, 'GUDLFT_DATA_DIR': str(tmp_path)}, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stdout
+    assert (tmp_path / 'clubs.json').read_bytes() == clubs
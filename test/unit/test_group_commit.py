@@ -0,0 +1,109 @@
+import threading
+import time
+import pytest
+import server
+from config.messages import Messages
+from storage import GroupCommitter
+from storage.group_commit import percentile
+from test.conftest import book, persisted_points, with_storage
+
+
+# Fenêtre de regroupement de 50 ms
+GROUP_COMMIT = with_storage('group_commit', GROUP_COMMIT=True, GROUP_COMMIT_MAX_WAIT_MS=50)
+
+
+def test_group_committer_batches_concurrent_submits():
+    """Test que des soumissions concurrentes sont persistées en un seul lot"""
+    flushed = []
+    committer = GroupCommitter(lambda batch: flushed.append(list(batch)), max_batch=10, max_wait=0.2)
+
+    threads = [threading.Thread(target=committer.submit, args=(i,)) for i in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    committer.close()
+
+    assert sorted(item for batch in flushed for item in batch) == [0, 1, 2, 3, 4]
+    assert len(flushed) < 5
+    assert committer.latency_summary()['commits'] == 5
+
+
+def test_group_committer_respects_max_batch():
+    """Test que la taille d'un lot ne dépasse jamais max_batch"""
+    flushed = []
+    committer = GroupCommitter(lambda batch: flushed.append(len(batch)), max_batch=2, max_wait=0.2)
+
+    threads = [threading.Thread(target=committer.submit, args=(i,)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    committer.close()
+
+    assert sum(flushed) == 6
+    assert max(flushed) <= 2
+
+
+def test_group_committer_acknowledges_after_flush():
+    """Test que submit ne rend la main qu'une fois le lot persisté"""
+    flushed = []
+
+    def slow_flush(batch):
+        time.sleep(0.05)
+        flushed.extend(batch)
+
+    committer = GroupCommitter(slow_flush, max_wait=0)
+    committer.submit('booking')
+    assert flushed == ['booking']
+    committer.close()
+
+
+def test_group_committer_propagates_flush_errors():
+    """Test qu'une erreur d'écriture est remontée aux requêtes du lot"""
+    def failing_flush(batch):
+        raise OSError('disk full')
+
+    committer = GroupCommitter(failing_flush, max_wait=0)
+    with pytest.raises(OSError):
+        committer.submit('booking')
+    committer.close()
+
+
+def test_percentile_nearest_rank():
+    """Test du calcul de percentile par rang le plus proche"""
+    values = list(range(1, 101))
+    assert percentile(values, 0.50) == 50
+    assert percentile(values, 0.99) == 99
+    assert percentile([], 0.5) == 0.0
+
+
+@GROUP_COMMIT
+def test_purchase_with_group_commit_persists_before_response(client, storage_mode):
+    """Test qu'un achat en mode commit groupé est sur disque à la réponse"""
+    response = book(client, places='2')
+    assert Messages.BOOKING_COMPLETE.encode() in response.data
+
+    assert persisted_points('Simply Lift') == 13
+    assert storage_mode.committer.latency_summary()['batches'] == 1
+
+
+@GROUP_COMMIT
+def test_concurrent_purchases_on_one_competition_share_a_batch(storage_mode):
+    """Test que l'attente du disque se fait hors des verrous : les achats d'une même compétition sont regroupés"""
+    clubs = ['Simply Lift', 'Iron Temple', 'She Lifts', 'Powerhouse Gym', 'Fit Nation', 'Strength Society']
+    responses = []
+
+    def purchase(club):
+        responses.append(book(server.app.test_client(), club=club, competition='Next Year Games'))
+
+    threads = [threading.Thread(target=purchase, args=(club,)) for club in clubs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(Messages.BOOKING_COMPLETE.encode() in response.data for response in responses)
+    summary = storage_mode.committer.latency_summary()
+    assert summary['commits'] == 6
+    assert summary['batches'] < 6
@@ -0,0 +1,81 @@
+import json
+import pytest
+from test.perf import history
+from test.perf.history import compare_runs, compare_to_baseline, mann_whitney, welch
+
+
+def locust_run(run_id, p95, histogram, users=50):
+    endpoint = {'requests': sum(histogram.values()), 'failures': 0, 'p50': p95 / 2, 'p95': p95, 'p99': p95,
+                'rps': 10.0, 'histogram': histogram}
+    return {'id': run_id, 'kind': 'locust', 'git': 'abc', 'dataset': {'clubs': 10}, 'users': users,
+            'endpoints': {'POST /purchasePlaces': endpoint}}
+
+
+def benchmark_report(mean, stddev=0.0001):
+    return {'commit_info': {'id': 'abc123', 'dirty': False}, 'benchmarks': [{
+        'name': 'test_render_welcome[1000-records]', 'params': {'dataset': 1000},
+        'stats': {'rounds': 100, 'mean': mean, 'stddev': stddev, 'median': mean, 'ops': 1 / mean},
+    }]}
+
+
+def test_mann_whitney_detects_shift():
+    """Test du test de Mann-Whitney sur des histogrammes de temps de réponse"""
+    fast = {10: 400, 20: 100}
+    slow = {20: 100, 30: 400}
+
+    z, p = mann_whitney(fast, slow)
+    assert z > 0 and p < 0.001
+    assert mann_whitney(fast, dict(fast))[1] > 0.5
+    assert mann_whitney({}, slow) == (0.0, 1.0)
+
+
+def test_welch_on_benchmark_means():
+    """Test du test de Welch sur les moyennes et écarts-types des benchmarks"""
+    before = {'mean': 10.0, 'stddev': 1.0, 'rounds': 100}
+    assert welch(before, {'mean': 11.0, 'stddev': 1.0, 'rounds': 100})[1] < 0.001
+    assert welch(before, {'mean': 10.05, 'stddev': 1.0, 'rounds': 100})[1] > 0.5
+
+
+def test_compare_runs_flags_significant_regression():
+    """Test qu'une régression n'est signalée que si elle est significative et assez grande"""
+    before = locust_run(1, 20, {10: 400, 20: 100})
+    slower = locust_run(2, 30, {20: 100, 30: 400})
+    same = locust_run(3, 20, {10: 400, 20: 100})
+
+    assert [row['status'] for row in compare_runs(before, slower)] == ['REGRESSION']
+    assert [row['status'] for row in compare_runs(slower, before)] == ['amélioration']
+    assert [row['status'] for row in compare_runs(before, same)] == ['=']
+    with pytest.raises(ValueError):
+        compare_runs(before, {**same, 'kind': 'benchmark'})
+
+
+def test_rolling_baseline_only_uses_comparable_runs():
+    """Test de la base glissante : mêmes nature, jeu de données et nombre d'utilisateurs"""
+    runs = [locust_run(1, 100, {}), locust_run(2, 102, {}), locust_run(3, 98, {}),
+            locust_run(4, 500, {}, users=10), locust_run(5, 150, {})]
+
+    rows, baseline = compare_to_baseline(runs, runs[-1], window=5)
+    assert [run['id'] for run in baseline] == [1, 2, 3]
+    assert rows[0]['before'] == 100 and rows[0]['status'] == 'REGRESSION'
+
+    rows, _ = compare_to_baseline(runs[:3] + [locust_run(5, 101, {})], locust_run(5, 101, {}))
+    assert rows[0]['status'] == '='
+
+
+def test_record_and_compare_cli(tmp_path, capsys):
+    """Test de l'enregistrement de rapports pytest-benchmark puis de leur comparaison"""
+    path = str(tmp_path / 'history.jsonl')
+    for number, mean in enumerate([0.010, 0.0101, 0.015]):
+        report = tmp_path / f'benchmark{number}.json'
+        report.write_text(json.dumps(benchmark_report(mean)))
+        assert history.main(['--history', path, 'record', '--benchmark', str(report)]) == 0
+
+    runs = history.load_history(path)
+    assert [run['id'] for run in runs] == [1, 2, 3]
+    assert runs[0]['git'] == 'abc123'
+    assert runs[0]['endpoints']['test_render_welcome[1000-records]']['p50'] == pytest.approx(10.0)
+
+    assert history.main(['--history', path, 'compare', '1', '2']) == 0
+    assert history.main(['--history', path, 'compare', '2', '3']) == 1
+    assert history.main(['--history', path, 'compare', 'latest', '--baseline', '5']) == 1
+    assert 'REGRESSION' in capsys.readouterr().out
@@ -0,0 +1,69 @@
+import server
+from config.messages import Messages
+from storage import Club, KeyedIndex, normalize_email
+
+
+def test_index_lookup_by_key():
+    """Test qu'un enregistrement est retrouvé par sa clé"""
+    records = [Club('A', 'a@club.fr', 1), Club('B', 'b@club.fr', 2)]
+    index = KeyedIndex('name')
+    index.rebuild(records)
+
+    assert index.get('B') is records[1]
+    assert index.get('C') is None
+    assert len(index) == 2
+
+
+def test_index_first_record_wins_on_duplicates():
+    """Test qu'en cas de doublon le premier enregistrement est conservé"""
+    records = [Club('A', 'a@club.fr', 1), Club('A', 'a2@club.fr', 2)]
+    index = KeyedIndex('name')
+    index.rebuild(records)
+
+    assert index.get('A').points == 1
+
+
+def test_index_add_and_discard():
+    """Test que l'index suit les ajouts et suppressions"""
+    index = KeyedIndex('name')
+    record = Club('A', 'a@club.fr', 0)
+    index.add(record)
+    assert 'A' in index
+
+    index.discard(record)
+    assert 'A' not in index
+
+
+def test_index_sees_in_place_updates():
+    """Test que les mises à jour en place sont visibles sans reconstruction"""
+    record = Club('A', 'a@club.fr', 1)
+    index = KeyedIndex('name')
+    index.rebuild([record])
+
+    record.points = 5
+    assert index.get('A').points == 5
+
+
+def test_email_index_is_case_insensitive():
+    """Test que l'index par email ignore la casse et les espaces"""
+    index = KeyedIndex('email', normalize=normalize_email)
+    index.rebuild([Club('Simply Lift', 'john@simplylift.co', 0)])
+
+    assert index.get(' John@SimplyLift.co ') is not None
+
+
+def test_server_indexes_rebuilt_on_load():
+    """Test que les index du serveur sont reconstruits au chargement"""
+    clubs = server.loadClubs()
+    competitions = server.loadCompetitions()
+
+    assert server.clubs_by_name.get('Simply Lift') is clubs[0]
+    assert server.clubs_by_email.get('john@simplylift.co') is clubs[0]
+    assert server.competitions_by_name.get('Spring Festival') is competitions[0]
+
+
+def test_login_with_mixed_case_email(client):
+    """Test de connexion avec un email en casse différente"""
+    response = client.post('/showSummary', data={'email': 'JOHN@simplylift.co'})
+    assert response.status_code == 200
+    assert Messages.check_welcome_page(response.data)
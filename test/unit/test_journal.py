@@ -0,0 +1,102 @@
+import json
+import os
+from datetime import datetime
+import server
+from config.messages import Messages
+from storage import BookingJournal, Club, Competition
+from test.conftest import book, read_json, with_storage
+
+JOURNAL_PATH = 'test/data/testing/bookings.journal'
+
+
+JOURNAL = with_storage('journal', PERSISTENCE_MODE='journal', JOURNAL_SNAPSHOT_THRESHOLD=3)
+
+
+@JOURNAL
+def test_journal_appends_one_compact_record_per_booking(client, storage_mode):
+    """Test qu'une réservation ajoute une ligne au journal sans réécrire les JSON"""
+    clubs_before = read_json('clubs.json')
+
+    response = book(client, places='2')
+    assert Messages.BOOKING_COMPLETE.encode() in response.data
+
+    with open(JOURNAL_PATH) as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 1
+    assert '": ' not in lines[0]
+    record = json.loads(lines[0])
+    assert record['club'] == 'Simply Lift'
+    assert record['places'] == 2
+    assert record['points'] == 13
+
+    # Le snapshot n'est pas réécrit tant que le seuil n'est pas atteint
+    assert read_json('clubs.json') == clubs_before
+
+
+@JOURNAL
+def test_journal_replayed_at_startup(client, storage_mode):
+    """Test que le redémarrage rejoue le journal sur le dernier snapshot"""
+    book(client, places='2')
+    book(client, club='She Lifts', places='3')
+
+    server.initStorage()
+
+    assert server.clubs_by_name.get('Simply Lift').points == 13
+    assert server.clubs_by_name.get('She Lifts').points == 9
+    assert server.competitions_by_name.get('Future Championship').numberOfPlaces == 25
+
+
+@JOURNAL
+def test_journal_compacted_at_threshold(client, storage_mode):
+    """Test que le seuil déclenche un snapshot des JSON et vide le journal"""
+    for _ in range(3):
+        book(client)
+
+    assert os.path.getsize(JOURNAL_PATH) == 0
+    clubs = {club['name']: club for club in read_json('clubs.json')['clubs']}
+    assert clubs['Simply Lift']['points'] == 12
+
+
+def test_journal_replay_is_idempotent(tmp_path):
+    """Test que rejouer un enregistrement déjà présent dans le snapshot est sans effet"""
+    journal = BookingJournal(str(tmp_path / 'bookings.journal'))
+    club = Club('A', 'a@club.fr', 8)
+    competition = Competition('C', datetime(2030, 1, 1), 18)
+    journal.append(BookingJournal.booking_record(club, competition, 2))
+
+    clubs = {'A': club}
+    competitions = {'C': competition}
+    journal.replay(clubs, competitions)
+    journal.replay(clubs, competitions)
+    journal.close()
+
+    assert club.points == 8
+    assert competition.numberOfPlaces == 18
+
+
+def test_journal_ignores_torn_last_line(tmp_path):
+    """Test qu'une dernière ligne incomplète (crash) est ignorée"""
+    path = tmp_path / 'bookings.journal'
+    path.write_text('{"club":"A","competition":"C","places":1,"points":4,"numberOfPlaces":9}\n{"club":"A",')
+
+    journal = BookingJournal(str(path))
+    assert len(journal) == 1
+    journal.close()
+
+
+def test_journal_appends_after_torn_tail_are_replayed(tmp_path):
+    """Test qu'un enregistrement ajouté après un crash en pleine écriture est rejoué"""
+    path = tmp_path / 'bookings.journal'
+    path.write_text('{"club":"A","competition":"C","places":1,"points":4,"numberOfPlaces":9}\n{"club":"A",')
+
+    journal = BookingJournal(str(path))
+    journal.append({'club': 'A', 'competition': 'C', 'places': 2, 'points': 2, 'numberOfPlaces': 7})
+    journal.close()
+
+    club = Club('A', 'a@a.fr', 5)
+    competition = Competition('C', datetime(2030, 1, 1), 10)
+    journal = BookingJournal(str(path))
+    assert journal.replay({'A': club}, {'C': competition}) == 2
+    assert (club.points, competition.numberOfPlaces) == (2, 7)
+    assert path.read_text().count('\n') == 2
+    journal.close()
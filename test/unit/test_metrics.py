@@ -0,0 +1,88 @@
+import server
+from web import MetricsRegistry
+
+
+def sample(text, line_start):
+    """Valeur de la première ligne d'export commençant par line_start"""
+    for line in text.splitlines():
+        if line.startswith(line_start):
+            return float(line.rsplit(' ', 1)[1])
+    return None
+
+
+def test_histogram_export_is_cumulative():
+    """Test que les buckets exportés sont cumulatifs, avec +Inf, somme et compte"""
+    registry = MetricsRegistry()
+    histogram = registry.histogram('test_seconds', 'Test', ('route',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, 'index')
+
+    text = registry.render()
+    assert '# TYPE test_seconds histogram' in text
+    assert 'test_seconds_bucket{route="index",le="0.1"} 2' in text
+    assert 'test_seconds_bucket{route="index",le="1.0"} 3' in text
+    assert 'test_seconds_bucket{route="index",le="+Inf"} 4' in text
+    assert 'test_seconds_sum{route="index"} 3.65' in text
+    assert 'test_seconds_count{route="index"} 4' in text
+
+
+def test_label_values_are_escaped():
+    """Test de l'échappement des guillemets et antislashs dans les étiquettes"""
+    registry = MetricsRegistry()
+    registry.collected('test_total', 'Test', 'counter', lambda: {('a"b\\c',): 1}, ('name',))
+
+    assert 'test_total{name="a\\"b\\\\c"} 1' in registry.render()
+
+
+def test_requests_recorded_by_route_and_outcome(client):
+    """Test des compteurs par route et par issue de l'achat"""
+    before = server.request_duration.count('purchasePlaces', 'max_exceeded')
+    client.post('/purchasePlaces', data={
+        'club': 'Simply Lift',
+        'competition': 'Next Year Games',
+        'places': '13'
+    })
+    client.post('/showSummary', data={'email': 'inconnu@example.com'})
+    client.get('/book/Simply Lift/Unknown Competition')
+
+    assert server.request_duration.count('purchasePlaces', 'max_exceeded') == before + 1
+    assert server.request_duration.count('showSummary', 'not_found') >= 1
+    assert server.request_duration.count('book', 'not_found') >= 1
+
+
+def test_booking_outcomes():
+    """Test de la correspondance entre messages et issues d'un achat"""
+    messages = server.Messages
+    assert server.bookingOutcome(messages.BOOKING_COMPLETE) == 'booked'
+    assert server.bookingOutcome(messages.COMPETITION_EXPIRED) == 'expired'
+    assert server.bookingOutcome(messages.MAX_PLACES_EXCEEDED) == 'max_exceeded'
+    assert server.bookingOutcome(messages.SOMETHING_WENT_WRONG) == 'not_found'
+    assert server.bookingOutcome(messages.format_not_enough_points(5, 2)) == 'not_enough_points'
+    assert server.bookingOutcome(messages.format_not_enough_places(5, 2)) == 'not_enough_places'
+
+
+def test_metrics_endpoint_exports_persistence_and_render(client):
+    """Test que /metrics expose les durées d'écriture et de rendu"""
+    server.saveClubs()
+    client.get('/')
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain; version=0.0.4')
+    text = response.data.decode()
+    assert sample(text, 'gudlft_persistence_duration_seconds_count{operation="saveClubs"}') >= 1
+    assert sample(text, 'gudlft_template_render_seconds_count{template="index.html"}') >= 1
+    assert sample(text, 'gudlft_request_duration_seconds_count{route="index",outcome="ok"}') >= 1
+    assert 'route="metrics"' not in text
+
+
+def test_booking_records_storage_write_duration(client):
+    """Test qu'un achat alimente l'histogramme des écritures du backend"""
+    before = server.persistence_duration.count('recordBookings')
+    response = client.post('/purchasePlaces', data={
+        'club': 'Simply Lift', 'competition': 'Future Championship', 'places': '1'})
+    assert response.status_code == 200
+
+    assert server.persistence_duration.count('recordBookings') == before + 1
+    text = client.get('/metrics').data.decode()
+    assert sample(text, 'gudlft_persistence_duration_seconds_count{operation="recordBookings"}') == before + 1
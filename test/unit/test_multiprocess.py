@@ -0,0 +1,131 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import pytest
+import server
+from config.messages import Messages
+from storage import DataCoherence
+from test.conftest import persisted_points, with_storage
+
+CLUBS_PATH = 'test/data/testing/clubs.json'
+
+
+# Verrou fichier + rechargement des données écrites par les autres workers
+MULTIPROCESS = with_storage('multiprocess', MULTIPROCESS=True)
+
+
+def set_club_points_externally(name, points):
+    """Simule l'écriture d'un autre worker dans clubs.json"""
+    with open(CLUBS_PATH) as f:
+        data = json.load(f)
+    for club in data['clubs']:
+        if club['name'] == name:
+            club['points'] = points
+    with open(CLUBS_PATH + '.other', 'w') as f:
+        json.dump(data, f, indent=4)
+    # os.replace, comme write_json_atomic : nouvel inode
+    os.replace(CLUBS_PATH + '.other', CLUBS_PATH)
+
+
+def test_coherence_detects_external_change(tmp_path):
+    """Test qu'une modification du fichier surveillé déclenche un rechargement"""
+    data_file = tmp_path / 'clubs.json'
+    data_file.write_text('{}')
+    reloads = []
+    coherence = DataCoherence(str(tmp_path / 'lock'), lambda: [str(data_file)], lambda: reloads.append(1))
+
+    assert coherence.refresh() is False
+    data_file.write_text('{"changed": true}')
+    assert coherence.refresh() is True
+    assert coherence.refresh() is False
+    assert len(reloads) == 1
+    coherence.close()
+
+
+def test_coherence_own_writes_do_not_reload(tmp_path):
+    """Test que les écritures faites sous le verrou ne provoquent pas de rechargement"""
+    data_file = tmp_path / 'clubs.json'
+    data_file.write_text('{}')
+    reloads = []
+    coherence = DataCoherence(str(tmp_path / 'lock'), lambda: [str(data_file)], lambda: reloads.append(1))
+
+    with coherence.write_lock():
+        data_file.write_text('{"written": "here"}')
+    assert coherence.refresh() is False
+    assert reloads == []
+    coherence.close()
+
+
+@pytest.mark.parametrize('poll_interval', [None, 0.01])
+def test_write_lock_excludes_other_processes(tmp_path, poll_interval):
+    """Test que le verrou exclusif attend la libération par un autre processus
+
+    Avec poll_interval (mode gevent), l'attente se fait par essais non bloquants.
+    """
+    lock_path = str(tmp_path / 'lock')
+    holder = subprocess.Popen([sys.executable, '-c', (
+        'import fcntl, os, sys, time\n'
+        f'fd = os.open({lock_path!r}, os.O_RDWR | os.O_CREAT)\n'
+        'fcntl.flock(fd, fcntl.LOCK_EX)\n'
+        'print("locked", flush=True)\n'
+        'time.sleep(0.3)\n'
+    )], stdout=subprocess.PIPE, text=True)
+    assert holder.stdout.readline().strip() == 'locked'
+
+    coherence = DataCoherence(lock_path, lambda: [], lambda: None, poll_interval=poll_interval)
+    start = time.monotonic()
+    with coherence.write_lock():
+        waited = time.monotonic() - start
+    holder.wait()
+    coherence.close()
+
+    assert waited >= 0.1
+
+
+@MULTIPROCESS
+def test_index_reflects_other_worker_changes(client, storage_mode):
+    """Test que la page publique reflète une écriture d'un autre worker"""
+    set_club_points_externally('Iron Temple', 21)
+
+    response = client.get('/')
+    assert b'21' in response.data
+    assert server.clubs_by_name.get('Iron Temple').points == 21
+
+
+@MULTIPROCESS
+def test_purchase_is_read_modify_write(client, storage_mode):
+    """Test qu'un achat repart des données écrites par un autre worker"""
+    set_club_points_externally('Simply Lift', 6)
+
+    # Sans passer par before_request : le rechargement est fait sous le verrou
+    with server.app.test_request_context():
+        with server.dataWriteLock():
+            club, message = server.bookPlaces('Simply Lift', 'Future Championship', '2')
+
+    assert message == Messages.BOOKING_COMPLETE
+    assert persisted_points('Simply Lift') == 4
+
+
+@MULTIPROCESS
+def test_concurrent_threads_share_process_lock(client, storage_mode):
+    """Test que les threads d'un même worker sont aussi sérialisés"""
+    inside = []
+    overlaps = []
+
+    def critical():
+        with storage_mode.coherence.write_lock():
+            if inside:
+                overlaps.append(1)
+            inside.append(1)
+            time.sleep(0.01)
+            inside.pop()
+
+    threads = [threading.Thread(target=critical) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert overlaps == []
@@ -0,0 +1,102 @@
+import os
+import pstats
+import pytest
+import server
+from web import RequestProfiler
+
+
+@pytest.fixture
+def profiler(tmp_path, monkeypatch):
+    """Profileur actif sur purchasePlaces, une requête sur deux, avec secret"""
+    profiler = RequestProfiler(str(tmp_path), enabled=True, routes=['purchasePlaces'], every=2,
+                               secret='s3cret', keep=3)
+    monkeypatch.setattr(server, 'profiler', profiler)
+    return profiler
+
+
+def purchase(client, headers=None):
+    return client.post('/purchasePlaces', data={
+        'club': 'Simply Lift',
+        'competition': 'Next Year Games',
+        'places': '1'
+    }, headers=headers or {})
+
+
+def test_every_nth_request_per_route(profiler):
+    """Test de l'échantillonnage une requête sur N, compté par route"""
+    assert [profiler.should_profile('purchasePlaces') for _ in range(4)] == [False, True, False, True]
+    assert profiler.should_profile('index') is False
+
+
+def test_secret_header_forces_profile(profiler):
+    """Test que le secret administrateur force le profilage, même hors sélection"""
+    assert profiler.should_profile('index', 's3cret') is True
+    assert profiler.should_profile('index', 'wrong') is False
+    assert RequestProfiler('unused').should_profile('index', '') is False
+
+
+def test_profiled_request_writes_pstats_and_report(client, profiler):
+    """Test qu'une requête profilée produit un fichier pstats et un résumé"""
+    assert 'X-Profile-File' not in purchase(client).headers
+    name = purchase(client).headers['X-Profile-File']
+
+    path = os.path.join(profiler.directory, name)
+    stats = pstats.Stats(path)
+    assert any(function == 'bookPlaces' for _, _, function in stats.stats)
+    with open(path[:-len('.prof')] + '.txt') as file:
+        assert 'cumulative' in file.read()
+    assert profiler.recent()[0]['route'] == 'purchasePlaces'
+
+
+def test_only_recent_profiles_kept(client, profiler):
+    """Test que seuls les `keep` derniers profils sont conservés"""
+    names = [client.get('/', headers={'X-Profile': 's3cret'}).headers['X-Profile-File'] for _ in range(5)]
+
+    assert [profile['name'] for profile in profiler.recent()] == names[:-4:-1]
+    assert len(os.listdir(profiler.directory)) == 6
+
+
+def test_profiles_index_requires_secret(client, profiler):
+    """Test que la liste des profils exige le secret"""
+    purchase(client, headers={'X-Profile': 's3cret'})
+
+    assert client.get('/profiles').status_code == 403
+    response = client.get('/profiles', headers={'X-Profile': 's3cret'})
+    assert response.status_code == 200
+    assert b'purchasePlaces' in response.data
+
+    report = profiler.recent()[0]['report']
+    assert client.get(f'/profiles/{report}', headers={'X-Profile': 's3cret'}).status_code == 200
+
+
+def test_profiles_secret_not_accepted_in_url(client, profiler):
+    """Test que le secret passé en paramètre d'URL (journalisé) est refusé"""
+    purchase(client, headers={'X-Profile': 's3cret'})
+    report = profiler.recent()[0]['report']
+
+    assert client.get('/profiles?key=s3cret').status_code == 403
+    assert client.get(f'/profiles/{report}?key=s3cret').status_code == 403
+    assert b'key=' not in client.get('/profiles', headers={'X-Profile': 's3cret'}).data
+
+
+def test_profiles_index_absent_when_disabled(client, monkeypatch):
+    """Test que les pages de profilage n'existent pas sans configuration"""
+    monkeypatch.setattr(server, 'profiler', None)
+    assert client.get('/profiles').status_code == 404
+
+
+def test_profiles_index_absent_without_secret(client, profiler):
+    """Test que les pages de profilage n'existent pas sans secret configuré"""
+    purchase(client)
+    purchase(client)
+    profiler.secret = ''
+
+    assert client.get('/profiles').status_code == 404
+    assert client.get(f"/profiles/{profiler.recent()[0]['name']}").status_code == 404
+
+
+def test_non_ascii_secret_is_rejected(client, profiler):
+    """Test qu'un en-tête X-Profile non ASCII est refusé sans erreur serveur"""
+    assert not profiler.has_secret('sécret')
+    assert purchase(client, headers={'X-Profile': 'sécret'}).status_code == 200
+    assert client.get('/profiles', headers={'X-Profile': 'sécret'}).status_code == 403
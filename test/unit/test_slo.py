@@ -0,0 +1,44 @@
+import json
+from config.messages import PerformanceThresholds
+from test.perf.slo import evaluate, write_verdict
+
+
+def summary(requests=100, failures=0, p50=50, p95=200, p99=400, rps=10.0):
+    return {'requests': requests, 'failures': failures, 'p50': p50, 'p95': p95, 'p99': p99, 'max': p99, 'rps': rps}
+
+
+def test_within_targets_passes():
+    """Test qu'une exécution sous les objectifs est conforme"""
+    verdict = evaluate({'GET /': summary(), 'POST /purchasePlaces': summary()}, summary(requests=200, rps=20.0))
+    assert verdict['passed'] is True
+    assert verdict['violations'] == []
+    assert verdict['endpoints']['POST /purchasePlaces']['targets'] is PerformanceThresholds.UPDATE_TARGETS
+
+
+def test_tail_latency_violation_fails():
+    """Test qu'un p99 au-delà de l'objectif fait échouer l'endpoint, pas un pic isolé sur le max"""
+    update_p99 = PerformanceThresholds.MAX_UPDATE_TIME * 1000
+    verdict = evaluate({
+        'POST /purchasePlaces': summary(p99=update_p99 + 1),
+        'GET /': {**summary(), 'max': 60_000},
+    }, summary())
+
+    assert verdict['passed'] is False
+    assert verdict['endpoints']['GET /']['violations'] == []
+    assert verdict['endpoints']['POST /purchasePlaces']['violations'] == [f'p99 {update_p99 + 1:.0f}ms > 2000ms']
+
+
+def test_throughput_and_failures_are_gated():
+    """Test des objectifs de débit global et de taux d'échec"""
+    verdict = evaluate({'GET /unknown': summary(failures=5)}, summary(rps=PerformanceThresholds.MIN_TOTAL_RPS / 2))
+    assert verdict['endpoints']['GET /unknown']['targets'] is PerformanceThresholds.DEFAULT_TARGETS
+    assert any(violation.startswith('GET /unknown: échecs') for violation in verdict['violations'])
+    assert any(violation.startswith('Total: débit') for violation in verdict['violations'])
+
+
+def test_verdict_file_is_json(tmp_path):
+    """Test de l'écriture du verdict lisible par machine"""
+    path = tmp_path / 'verdict.json'
+    write_verdict(str(path), evaluate({'GET /': summary()}, summary()))
+    with open(path) as file:
+        assert json.load(file)['passed'] is True
@@ -0,0 +1,156 @@
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import pytest
+import server
+from config.messages import Messages
+from storage import Club, Competition, JsonRepository, Repository, SqliteRepository, import_from_json
+from storage.import_json import main as import_main
+
+
+def data_path(filename):
+    return f'test/data/testing/{filename}'
+
+
+@pytest.fixture
+def sqlite_repository(tmp_path):
+    """Base SQLite temporaire remplie depuis les JSON de test"""
+    repository = SqliteRepository(str(tmp_path / 'gudlft.sqlite3'))
+    import_from_json(JsonRepository(data_path), repository)
+    yield repository
+    repository.close()
+
+
+@pytest.fixture
+def sqlite_backend(monkeypatch, tmp_path):
+    """Bascule le serveur sur le backend SQLite"""
+    db_path = str(tmp_path / 'gudlft.sqlite3')
+    import_main(['--data-dir', 'test/data/testing', '--db', db_path])
+    monkeypatch.setitem(server.app.config, 'STORAGE_BACKEND', 'sqlite')
+    monkeypatch.setitem(server.app.config, 'SQLITE_DATABASE', db_path)
+    server.initStorage()
+    yield db_path
+    server.closeStorage()
+
+
+def test_import_preserves_records_and_order(sqlite_repository):
+    """Test que l'import reprend tous les enregistrements dans l'ordre"""
+    source = JsonRepository(data_path)
+    assert sqlite_repository.load_clubs() == source.load_clubs()
+    assert sqlite_repository.load_competitions() == source.load_competitions()
+
+
+def test_import_is_idempotent(sqlite_repository):
+    """Test qu'un second import ne duplique pas les lignes"""
+    import_from_json(JsonRepository(data_path), sqlite_repository)
+    assert len(sqlite_repository.load_clubs()) == 6
+
+
+def test_sqlite_uses_wal_and_indexes(sqlite_repository):
+    """Test que la base est en mode WAL et indexée sur email/nom/date"""
+    conn = sqlite3.connect(sqlite_repository.path)
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    indexes = {row[1] for row in conn.execute("SELECT type, name FROM sqlite_master WHERE type = 'index'")}
+    conn.close()
+
+    assert 'idx_clubs_email' in indexes
+    assert 'idx_competitions_date' in indexes
+    assert any(name.startswith('sqlite_autoindex_clubs') for name in indexes)
+
+
+def test_record_bookings_updates_rows(sqlite_repository):
+    """Test qu'une réservation met à jour les deux lignes concernées"""
+    club = Club('Simply Lift', 'john@simplylift.co', 12)
+    competition = Competition('Future Championship', datetime(2026, 6, 15, 14), 27)
+    sqlite_repository.record_bookings([(club, competition, 3)], [], [])
+
+    clubs = {c.name: c for c in sqlite_repository.load_clubs()}
+    competitions = {c.name: c for c in sqlite_repository.load_competitions()}
+    assert clubs['Simply Lift'] == club
+    assert competitions['Future Championship'] == competition
+
+
+def test_durable_write_syncs_fully(sqlite_repository):
+    """Test qu'une écriture durable est validée en synchronous=FULL, puis revient à NORMAL"""
+    statements = []
+    sqlite_repository._conn.set_trace_callback(statements.append)
+    club = Club('Simply Lift', 'john@simplylift.co', 14)
+    competition = Competition('Future Championship', datetime(2026, 6, 15, 14), 29)
+    sqlite_repository.record_bookings([(club, competition, 1)], [], [], durable=True)
+    sqlite_repository._conn.set_trace_callback(None)
+
+    assert statements[0] == 'PRAGMA synchronous=FULL'
+    assert statements[-1] == 'PRAGMA synchronous=NORMAL'
+    assert sqlite_repository._conn.execute('PRAGMA synchronous').fetchone()[0] == 1
+
+    statements.clear()
+    sqlite_repository._conn.set_trace_callback(statements.append)
+    sqlite_repository.record_bookings([(club, competition, 1)], [], [])
+    assert not any(statement.startswith('PRAGMA') for statement in statements)
+
+
+def test_repository_interface_is_abstract():
+    """Test qu'un backend incomplet ne peut pas être instancié"""
+    with pytest.raises(TypeError):
+        Repository()
+
+    class Partial(Repository):
+        def load_clubs(self):
+            return []
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_threads_share_one_connection(monkeypatch, tmp_path):
+    """Test que de nombreux threads n'ouvrent qu'une connexion, fermée par close()"""
+    opened = []
+    connect = sqlite3.connect
+
+    def counting_connect(*args, **kwargs):
+        opened.append(connect(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr('storage.sqlite.sqlite3.connect', counting_connect)
+    repository = SqliteRepository(str(tmp_path / 'gudlft.sqlite3'))
+    import_from_json(JsonRepository(data_path), repository)
+    with ThreadPoolExecutor(max_workers=50) as pool:
+        results = list(pool.map(lambda _: len(repository.load_clubs()), range(500)))
+
+    assert results == [6] * 500
+    assert len(opened) == 1
+    repository.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        opened[0].execute('SELECT 1')
+    with pytest.raises(RuntimeError):
+        repository.load_clubs()
+
+
+def test_purchase_with_sqlite_backend(client, sqlite_backend):
+    """Test d'achat de bout en bout avec le backend SQLite"""
+    with open(data_path('clubs.json')) as f:
+        clubs_json_before = json.load(f)
+
+    response = client.post('/purchasePlaces', data={
+        'club': 'Simply Lift',
+        'competition': 'Future Championship',
+        'places': '2'
+    })
+    assert Messages.BOOKING_COMPLETE.encode() in response.data
+
+    reopened = SqliteRepository(sqlite_backend)
+    clubs = {c.name: c for c in reopened.load_clubs()}
+    reopened.close()
+    assert clubs['Simply Lift'].points == 13
+
+    # Les fichiers JSON ne sont plus réécrits
+    with open(data_path('clubs.json')) as f:
+        assert json.load(f) == clubs_json_before
+
+
+def test_unknown_backend_rejected(monkeypatch):
+    """Test qu'un backend inconnu est refusé"""
+    monkeypatch.setitem(server.app.config, 'STORAGE_BACKEND', 'mongodb')
+    with pytest.raises(ValueError):
+        server.createRepository()
@@ -0,0 +1,44 @@
+import pytest
+
+import server
+
+
+@pytest.fixture
+def streaming(monkeypatch):
+    monkeypatch.setitem(server.app.config, 'STREAM_TEMPLATES', True)
+
+
+def test_summary_streamed(client, streaming):
+    """Test que la page de résumé est envoyée en flux, avec le même contenu"""
+    response = client.post('/showSummary', data={'email': 'john@simplylift.co'})
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert b'Welcome, john@simplylift.co' in response.data
+    assert b'Future Championship' in response.data
+
+
+def test_index_streamed_not_compressed(client, streaming):
+    """Test qu'une page en flux n'est pas compressée"""
+    response = client.get('/', headers={'Accept-Encoding': 'br, gzip'})
+
+    assert response.is_streamed
+    assert 'Content-Encoding' not in response.headers
+    assert b'Simply Lift' in response.data
+
+
+def test_streamed_flash_shown_once(client, streaming):
+    """Test qu'un message flash affiché en flux n'est pas réaffiché ensuite
+
+    La session est enregistrée avant le rendu du corps : le message doit
+    être retiré de la session avant le début du flux.
+    """
+    response = client.post('/purchasePlaces', data={
+        'club': 'Simply Lift',
+        'competition': 'Future Championship',
+        'places': '2'
+    })
+    assert b'Great-booking complete!' in response.data
+
+    response = client.post('/showSummary', data={'email': 'john@simplylift.co'})
+    assert b'Great-booking complete!' not in response.data
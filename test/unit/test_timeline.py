@@ -0,0 +1,55 @@
+from datetime import datetime
+import server
+from storage import Competition, CompetitionTimeline
+
+NOW = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def make_timeline():
+    timeline = CompetitionTimeline()
+    timeline.rebuild([
+        Competition('Later', datetime(2025, 6, 1), 10),
+        Competition('Old', datetime(2020, 3, 27, 10), 10),
+        Competition('Soon', datetime(2025, 1, 2), 10),
+        Competition('Recent', datetime(2024, 12, 31), 10),
+    ])
+    return timeline
+
+
+def test_timeline_splits_past_and_upcoming():
+    """Test que la frontière passé/futur est trouvée et les listes triées par date"""
+    timeline = make_timeline()
+
+    assert [c.name for c in timeline.upcoming(NOW)] == ['Soon', 'Later']
+    assert [c.name for c in timeline.past(NOW)] == ['Old', 'Recent']
+
+
+def test_timeline_competition_at_current_instant_is_upcoming():
+    """Test qu'une compétition à l'instant présent n'est pas encore expirée"""
+    timeline = CompetitionTimeline()
+    competition = Competition('Now', NOW, 10)
+    timeline.rebuild([competition])
+
+    assert timeline.upcoming(NOW) == [competition]
+    assert not timeline.is_expired(competition, NOW)
+
+
+def test_timeline_add_keeps_order():
+    """Test qu'une compétition ajoutée est insérée à sa place chronologique"""
+    timeline = make_timeline()
+    timeline.add(Competition('Middle', datetime(2025, 3, 1), 10))
+
+    assert [c.name for c in timeline.upcoming(NOW)] == ['Soon', 'Middle', 'Later']
+    assert len(timeline) == 5
+
+
+def test_welcome_page_lists_only_upcoming_competitions(client):
+    """Test que la page de bienvenue n'affiche que les compétitions à venir"""
+    response = client.post('/showSummary', data={'email': 'john@simplylift.co'})
+    upcoming = [c.name for c in server.competition_timeline.upcoming()]
+    past = [c.name for c in server.competition_timeline.past()]
+
+    for name in upcoming:
+        assert name.encode() in response.data
+    for name in past:
+        assert name.encode() not in response.data
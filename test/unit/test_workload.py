@@ -0,0 +1,51 @@
+import random
+from collections import Counter
+from datetime import datetime
+import pytest
+from storage import Competition
+from test.perf.generate_dataset import write_dataset
+from test.perf.workload import Workload, ZipfSampler, parse_mix
+
+
+def test_zipf_concentrates_traffic():
+    """Test que la compétition la plus populaire reçoit la plus grande part des tirages"""
+    sampler = ZipfSampler(range(100), exponent=1.2, seed=1)
+    rng = random.Random(0)
+    counts = Counter(sampler.sample(rng) for _ in range(20_000))
+
+    most_popular, hits = counts.most_common(1)[0]
+    assert most_popular == sampler.items[0]
+    assert hits > 20_000 * 0.15
+    assert counts[sampler.items[-1]] < hits / 20
+
+
+def test_zipf_exponent_zero_is_uniform():
+    """Test qu'un exposant nul donne une popularité uniforme"""
+    sampler = ZipfSampler(range(10), exponent=0, seed=1)
+    rng = random.Random(0)
+    counts = Counter(sampler.sample(rng) for _ in range(10_000))
+    assert min(counts.values()) > 800
+
+
+def test_each_user_gets_a_distinct_club(tmp_path):
+    """Test de l'attribution d'un club distinct par utilisateur, depuis les fichiers de données"""
+    write_dataset(tmp_path, 30, 20, seed=5, reference=datetime.now())
+    workload = Workload.from_directory(str(tmp_path))
+
+    clubs = [workload.next_user()[0] for _ in range(30)]
+    assert len({club.name for club in clubs}) == 30
+    assert all(competition.date > datetime.now() for competition in workload.competitions.items)
+
+
+def test_flow_mix():
+    """Test des proportions visite/connexion/réservation"""
+    assert parse_mix('70,20,10') == {'browse': 70, 'login': 20, 'book': 10}
+    assert parse_mix(None) == {'browse': 60, 'login': 30, 'book': 10}
+    with pytest.raises(ValueError):
+        parse_mix('50,50')
+
+    competitions = [Competition('Open', datetime(2030, 1, 1), 10)]
+    workload = Workload([object()], competitions, mix=parse_mix('0,0,1'))
+    with pytest.raises(ValueError):
+        Workload([], competitions)
+    assert {workload.next_flow(random.Random(i)) for i in range(20)} == {'book'}
@@ -0,0 +1,143 @@
+import os
+import signal
+import threading
+import time
+from datetime import datetime
+import pytest
+import server
+from config.messages import Messages
+from storage import Club, Competition, WriteBehindFlusher
+from test.conftest import book, persisted_points, with_storage
+
+
+# Intervalle long : pas de flush spontané pendant le test
+WRITE_BEHIND = with_storage('write_behind', WRITE_BEHIND=True, WRITE_BEHIND_INTERVAL_MS=60000)
+
+
+def make_club(name):
+    return Club(name, f'{name.lower()}@club.fr', 10)
+
+
+def make_competition(name):
+    return Competition(name, datetime(2030, 1, 1), 20)
+
+
+def test_flusher_coalesces_same_records():
+    """Test que les réservations d'un même couple club/compétition sont fusionnées"""
+    flushed = []
+    flusher = WriteBehindFlusher(flushed.append, interval=60)
+    club, competition = make_club('A'), make_competition('C')
+    flusher.mark(club, competition, 1)
+    flusher.mark(club, competition, 2)
+    assert flusher.dirty_count == 1
+
+    flusher.close()
+    assert flushed == [[(club, competition, 3)]]
+
+
+def test_flusher_flushes_on_dirty_threshold():
+    """Test que le seuil de données sales déclenche l'écriture sans attendre l'intervalle"""
+    flushed = []
+    flusher = WriteBehindFlusher(flushed.append, interval=60, max_dirty=2)
+    flusher.mark(make_club('A'), make_competition('C'), 1)
+    flusher.mark(make_club('B'), make_competition('C'), 1)
+
+    deadline = time.monotonic() + 2
+    while not flushed and time.monotonic() < deadline:
+        time.sleep(0.01)
+    flusher.close()
+    assert len(flushed[0]) == 2
+
+
+def test_flusher_requeues_on_error():
+    """Test qu'une écriture en échec est retentée au flush suivant"""
+    attempts = []
+
+    def flaky(batch):
+        attempts.append(batch)
+        if len(attempts) == 1:
+            raise OSError('disk full')
+
+    flusher = WriteBehindFlusher(flaky, interval=60)
+    flusher.mark(make_club('A'), make_competition('C'), 1)
+    assert flusher.flush() == 0
+    assert flusher.dirty_count == 1
+    flusher.close()
+    assert len(attempts) == 2
+
+
+@WRITE_BEHIND
+def test_purchase_returns_before_disk_write(client, storage_mode):
+    """Test que l'achat répond sans attendre l'écriture des JSON"""
+    response = book(client, places='2')
+    assert Messages.BOOKING_COMPLETE.encode() in response.data
+    assert persisted_points('Simply Lift') == 15
+    assert storage_mode.write_behind.dirty_count == 1
+
+    storage_mode.write_behind.flush()
+    assert persisted_points('Simply Lift') == 13
+
+
+@WRITE_BEHIND
+def test_shutdown_flushes_pending_writes(client, storage_mode):
+    """Test que l'arrêt écrit les réservations en attente"""
+    book(client, places='2')
+    server.closeStorage()
+    assert persisted_points('Simply Lift') == 13
+
+
+@WRITE_BEHIND
+def test_sigterm_flushes_and_chains_previous_handler(client, storage_mode):
+    """Test que SIGTERM vide les écritures puis appelle le gestionnaire précédent"""
+    received = []
+    server.closeStorage()
+    signal.signal(signal.SIGTERM, lambda signum, frame: received.append(signum))
+    server.initStorage()
+
+    book(client, places='2')
+    os.kill(os.getpid(), signal.SIGTERM)
+
+    assert received == [signal.SIGTERM]
+    assert persisted_points('Simply Lift') == 13
+
+
+@WRITE_BEHIND
+def test_sigterm_waits_for_purchase_in_flight(client, storage_mode, monkeypatch):
+    """Test que SIGTERM laisse finir un achat en cours avant de fermer le stockage"""
+    received = []
+    server.closeStorage()
+    signal.signal(signal.SIGTERM, lambda signum, frame: received.append(signum))
+    server.initStorage()
+
+    validating, release = threading.Event(), threading.Event()
+    checkBooking = server.checkBooking
+
+    def slowCheckBooking(*args):
+        validating.set()
+        release.wait(5)
+        return checkBooking(*args)
+
+    monkeypatch.setattr(server, 'checkBooking', slowCheckBooking)
+    responses = []
+    purchase = threading.Thread(target=lambda: responses.append(book(server.app.test_client(), places='2')))
+    purchase.start()
+    assert validating.wait(5)
+
+    threading.Timer(0.2, release.set).start()
+    os.kill(os.getpid(), signal.SIGTERM)
+    purchase.join(5)
+
+    assert received == [signal.SIGTERM]
+    assert responses[0].status_code == 200
+    assert Messages.BOOKING_COMPLETE.encode() in responses[0].data
+    assert persisted_points('Simply Lift') == 13
+    # Après le début de l'arrêt, les nouveaux achats sont refusés
+    assert book(client, places='2').status_code == 503
+
+
+def test_write_behind_rejects_multiprocess(monkeypatch):
+    """Test que le mode différé est incompatible avec le mode multi-processus"""
+    monkeypatch.setitem(server.app.config, 'WRITE_BEHIND', True)
+    monkeypatch.setitem(server.app.config, 'MULTIPROCESS', True)
+    with pytest.raises(ValueError):
+        server.initStorage()
@@ -0,0 +1,10 @@
+"""
+Couche web : caches de rendu et utilitaires HTTP
+"""
+from web.compression import ResponseCompressor
+from web.events import EventHub
+from web.fragment_cache import FragmentCache
+from web.metrics import MetricsRegistry
+from web.profiling import RequestProfiler
+
+__all__ = ['EventHub', 'FragmentCache', 'MetricsRegistry', 'RequestProfiler', 'ResponseCompressor']
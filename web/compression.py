@@ -0,0 +1,89 @@
+"""
+Compression des réponses HTTP (Brotli, gzip) négociée par Accept-Encoding
+"""
+import gzip
+
+try:
+    import brotli
+except ImportError:  # Brotli absent : seul gzip est proposé
+    brotli = None
+
+
+COMPRESSIBLE_MIMETYPES = frozenset({
+    'text/html',
+    'text/plain',
+    'text/css',
+    'application/json',
+    'application/javascript',
+})
+
+
+class ResponseCompressor:
+    """Compresse les réponses textuelles selon l'encodage accepté par le client
+
+    Les réponses en flux, déjà encodées, hors 200 ou plus petites que
+    min_size octets sont laissées intactes.
+    """
+
+    def __init__(self, min_size=500, gzip_level=6, brotli_quality=4):
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        # Ordre de préférence du serveur à qualité égale
+        self.encodings = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+    def negotiate(self, accept_encodings):
+        """Choisit l'encodage de plus haute qualité acceptée, ou None
+
+        accept_encodings est l'objet Accept de werkzeug
+        (request.accept_encodings) ; une qualité nulle exclut l'encodage.
+        """
+        best, best_quality = None, 0
+        for encoding in self.encodings:
+            quality = accept_encodings.quality(encoding)
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def compress(self, body, encoding):
+        """Compresse des octets avec l'encodage donné"""
+        if encoding == 'br':
+            return brotli.compress(body, quality=self.brotli_quality)
+        if encoding == 'gzip':
+            # mtime fixe : mêmes octets en entrée, mêmes octets en sortie
+            return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+        raise ValueError(f"Encodage inconnu : {encoding!r}")
+
+    def is_compressible(self, response):
+        """Indique si la réponse peut être compressée, quel que soit le client"""
+        return (response.status_code == 200
+                and not response.direct_passthrough
+                and not response.is_streamed
+                and 'Content-Encoding' not in response.headers
+                and response.mimetype in COMPRESSIBLE_MIMETYPES)
+
+    def apply(self, response, accept_encodings, cached=None):
+        """Compresse response sur place si le client et la taille le permettent
+
+        cached(encoding, produce), s'il est fourni, renvoie les octets
+        compressés depuis un cache ou en appelant produce().
+        """
+        if not self.is_compressible(response):
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = self.negotiate(accept_encodings)
+        data = response.get_data()
+        if encoding is None or len(data) < self.min_size:
+            return response
+
+        def produce():
+            return self.compress(data, encoding)
+
+        body = cached(encoding, produce) if cached is not None else produce()
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        # Représentation différente : l'ETag fort devient faible
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
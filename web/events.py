@@ -0,0 +1,100 @@
+"""
+Diffusion d'événements aux clients (Server-Sent Events)
+"""
+import json
+import threading
+from collections import deque
+
+
+class EventHub:
+    """Diffusion des événements à tous les abonnés, sans file par abonné
+
+    Les événements sont numérotés et conservés dans un tampon circulaire
+    commun : publier coûte O(1) quel que soit le nombre d'abonnés, et un
+    abonné inactif ne coûte qu'une attente sur la condition partagée (un
+    greenlet sous gevent). Un abonné trop en retard pour le tampon reçoit
+    un événement 'resync' et doit relire les places et les points.
+
+    Le hub est propre au processus : avec plusieurs workers (wsgi.py), un
+    abonné ne reçoit que les réservations servies par son worker ; celles
+    des autres workers n'apparaissent qu'au prochain 'resync' ou
+    rechargement de la page.
+    """
+
+    def __init__(self, capacity=1024, heartbeat=15.0):
+        self._events = deque(maxlen=capacity)
+        self._last_id = 0
+        self._condition = threading.Condition()
+        self._closed = False
+        self.heartbeat = heartbeat
+        self.subscribers = 0
+
+    @property
+    def last_id(self):
+        return self._last_id
+
+    def publish(self, name, data):
+        """Ajoute un événement et réveille les abonnés ; retourne son numéro"""
+        with self._condition:
+            self._last_id += 1
+            self._events.append((self._last_id, name, data))
+            self._condition.notify_all()
+            return self._last_id
+
+    def wait(self, after, timeout=None):
+        """Événements publiés après `after`, en attendant au plus timeout secondes
+
+        Retourne une liste (vide si le délai expire), ou None si des
+        événements postérieurs à `after` ont déjà quitté le tampon ou si
+        `after` n'a jamais été publié.
+        """
+        with self._condition:
+            if after > self._last_id:
+                # Numéro inconnu : le processus a redémarré depuis
+                return None
+            if self._last_id <= after and not self._closed:
+                self._condition.wait(timeout)
+            if self._last_id <= after:
+                return []
+            if self._events[0][0] > after + 1:
+                return None
+            return [event for event in self._events if event[0] > after]
+
+    def stream(self, last_id=None):
+        """Générateur du flux text/event-stream d'un abonné
+
+        last_id reprend après le dernier événement reçu (en-tête
+        Last-Event-ID) ; par défaut seuls les nouveaux événements sont envoyés.
+        """
+        after = self._last_id if last_id is None else last_id
+        with self._condition:
+            self.subscribers += 1
+        try:
+            yield f'retry: {int(self.heartbeat * 1000)}\n\n'
+            while not self._closed:
+                events = self.wait(after, self.heartbeat)
+                if events is None:
+                    after = self._last_id
+                    yield format_event(after, 'resync', {})
+                elif not events:
+                    # Commentaire : maintient la connexion ouverte à travers les proxys
+                    yield ': keep-alive\n\n'
+                else:
+                    for event_id, name, data in events:
+                        yield format_event(event_id, name, data)
+                    after = events[-1][0]
+        finally:
+            with self._condition:
+                self.subscribers -= 1
+
+    def close(self):
+        """Termine les flux en cours"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+def format_event(event_id, name, data):
+    """Sérialise un événement au format Server-Sent Events"""
+    payload = json.dumps(data, separators=(',', ':'))
+    return f'id: {event_id}\nevent: {name}\ndata: {payload}\n\n'
@@ -0,0 +1,55 @@
+"""
+Cache des fragments HTML rendus, invalidé par version des données
+"""
+import threading
+
+
+class FragmentCache:
+    """Fragments rendus, réutilisés tant que la version des données ne change pas
+
+    Seuls des fragments indépendants de l'utilisateur doivent y être placés :
+    les messages flash et tout contenu propre à la session sont rendus à
+    chaque requête, autour du fragment.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(self, name, version, render):
+        """Retourne le fragment `name` pour `version`, en le rendant si nécessaire"""
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == version:
+            with self._lock:
+                self.hits += 1
+            return entry[1]
+        value = render()
+        with self._lock:
+            self.misses += 1
+            self._entries[name] = (version, value)
+        return value
+
+    def lookup(self, name, version):
+        """Indique si le fragment `name` est en cache pour `version`"""
+        entry = self._entries.get(name)
+        return entry is not None and entry[0] == version
+
+    def invalidate(self, name=None):
+        """Supprime un fragment, ou tous si name est None"""
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(name, None)
+
+    def stats(self):
+        """Compteurs de succès/échecs du cache"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / total if total else 0.0,
+            'entries': len(self._entries),
+        }
@@ -0,0 +1,122 @@
+"""
+Profilage à la demande des requêtes (cProfile)
+"""
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import re
+import threading
+import time
+
+PROFILE_NAME = re.compile(r'^(?P<stamp>\d{8}-\d{6})-(?P<seq>\d+)-(?P<route>\w+)-(?P<ms>\d+)ms\.prof$')
+
+
+class RequestProfiler:
+    """Décide quelles requêtes profiler et écrit les profils dans un répertoire
+
+    Une requête est profilée si elle présente le secret administrateur, ou
+    si le profilage est actif (enabled) pour sa route et qu'elle est la
+    N-ième de cette route depuis le dernier profil. Chaque profil donne un
+    fichier .prof (pstats, lisible par snakeviz) et un résumé .txt trié par
+    temps cumulé ; seuls les `keep` derniers profils sont conservés.
+
+    Un seul profil est actif à la fois (cProfile ne peut pas être activé
+    deux fois à partir de Python 3.12) : une requête concurrente n'est pas
+    profilée.
+    """
+
+    def __init__(self, directory, enabled=False, routes=(), every=1, secret='', keep=50):
+        self.directory = directory
+        self.enabled = enabled
+        self.routes = frozenset(routes)
+        self.every = max(1, every)
+        self.secret = secret
+        self.keep = keep
+        self._counts = {}
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._active = threading.Lock()
+
+    def has_secret(self, presented):
+        """Vérifie le secret administrateur (comparaison à temps constant)
+
+        Comparaison sur les octets : compare_digest refuse les str non ASCII,
+        qu'un client peut envoyer dans l'en-tête X-Profile.
+        """
+        return (bool(self.secret) and presented is not None
+                and hmac.compare_digest(presented.encode(), self.secret.encode()))
+
+    def should_profile(self, route, presented_secret=None):
+        if self.has_secret(presented_secret):
+            return True
+        if not self.enabled or route not in self.routes:
+            return False
+        with self._lock:
+            count = self._counts.get(route, 0) + 1
+            self._counts[route] = count
+        return count % self.every == 0
+
+    def start(self):
+        """Démarre un profil, ou retourne None si un autre est en cours"""
+        if not self._active.acquire(blocking=False):
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:  # autre outil de profilage actif
+            self._active.release()
+            return None
+        return profile, time.perf_counter()
+
+    def stop(self, started, route):
+        """Arrête le profil et l'écrit ; retourne le nom du fichier .prof"""
+        profile, start = started
+        profile.disable()
+        self._active.release()
+        elapsed_ms = int((time.perf_counter() - start) * 1000)
+        with self._lock:
+            self._sequence += 1
+            sequence = self._sequence
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{sequence}-{route}-{elapsed_ms}ms.prof"
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, name)
+        profile.dump_stats(path)
+
+        report = io.StringIO()
+        pstats.Stats(profile, stream=report).sort_stats('cumulative').print_stats(40)
+        with open(path[:-len('.prof')] + '.txt', 'w') as file:
+            file.write(report.getvalue())
+        self.prune()
+        return name
+
+    def recent(self):
+        """Profils présents, du plus récent au plus ancien"""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        profiles = []
+        for name in names:
+            match = PROFILE_NAME.match(name)
+            if match:
+                profiles.append({
+                    'name': name,
+                    'report': name[:-len('.prof')] + '.txt',
+                    'route': match['route'],
+                    'duration_ms': int(match['ms']),
+                    'stamp': match['stamp'],
+                    'sequence': int(match['seq']),
+                })
+        profiles.sort(key=lambda profile: (profile['stamp'], profile['sequence']), reverse=True)
+        return profiles
+
+    def prune(self):
+        """Supprime les profils au-delà des `keep` plus récents"""
+        for profile in self.recent()[self.keep:]:
+            for name in (profile['name'], profile['report']):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,178 @@
+"""
+Point d'entrée de production : serveur WSGI gevent pour server:app
+
+Un processus maître ouvre le socket d'écoute puis lance les workers
+(fork). Chaque worker applique le monkey-patching gevent, importe
+l'application et sert ses connexions dans des greenlets. Chaque worker a
+son propre flux /events : un abonné ne voit que les réservations servies par
+son worker.
+
+Signaux du maître :
+    SIGHUP          rechargement gracieux (nouveaux workers, puis arrêt des anciens)
+    SIGTERM/SIGINT  arrêt gracieux
+
+Usage:
+    python wsgi.py
+    python wsgi.py --workers 4 --port 5050 --max-connections 2000
+"""
+import argparse
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+
+
+def parse_args(settings, argv=None):
+    parser = argparse.ArgumentParser(description='Serveur de production GUDLFT (gevent)')
+    parser.add_argument('--host', default=settings.SERVER_HOST)
+    parser.add_argument('--port', type=int, default=settings.SERVER_PORT)
+    parser.add_argument('--workers', type=int, default=settings.SERVER_WORKERS)
+    parser.add_argument('--max-connections', type=int, default=settings.SERVER_MAX_CONNECTIONS,
+                        help='Connexions simultanées par worker (flux /events compris)')
+    parser.add_argument('--backlog', type=int, default=settings.SERVER_BACKLOG)
+    parser.add_argument('--keepalive', type=float, default=settings.SERVER_KEEPALIVE_S,
+                        help="Durée (s) d'inactivité avant fermeture d'une connexion persistante")
+    parser.add_argument('--graceful-timeout', type=float, default=settings.SERVER_GRACEFUL_TIMEOUT_S,
+                        help='Délai (s) laissé aux requêtes en cours lors d\'un arrêt')
+    return parser.parse_args(argv)
+
+
+def run_worker(listener, options):
+    """Boucle d'un worker : gevent, application, arrêt gracieux sur SIGTERM"""
+    # Avant tout import de l'application : verrous, threads et sockets
+    # deviennent coopératifs
+    from gevent import monkey
+    monkey.patch_all()
+
+    import gevent
+    from gevent.pool import Pool
+    from gevent.pywsgi import WSGIHandler, WSGIServer
+
+    import server
+
+    class KeepAliveHandler(WSGIHandler):
+        """Ferme une connexion persistante restée inactive trop longtemps"""
+
+        def read_requestline(self):
+            self.socket.settimeout(options.keepalive)
+            try:
+                return super().read_requestline()
+            finally:
+                # Pas de délai pendant la réponse : les flux /events restent ouverts
+                self.socket.settimeout(None)
+
+    http_server = WSGIServer(
+        socket.socket(fileno=listener.detach()),
+        server.app,
+        spawn=Pool(options.max_connections),
+        handler_class=KeepAliveHandler,
+    )
+
+    def stop():
+        # Les flux /events se terminent ; les navigateurs se reconnectent
+        # à un autre worker
+        server.event_hub.close()
+        http_server.stop(timeout=options.graceful_timeout)
+
+    gevent.signal_handler(signal.SIGTERM, lambda: gevent.spawn(stop))
+    gevent.signal_handler(signal.SIGINT, lambda: None)
+    http_server.serve_forever()
+    server.closeStorage()
+
+
+class Master:
+    """Supervise les workers : redémarrage, rechargement et arrêt gracieux"""
+
+    def __init__(self, listener, options):
+        self.listener = listener
+        self.options = options
+        self.generation = 0
+        self.workers = {}
+        self.reload_requested = False
+        self.stop_requested = False
+
+    def spawn_worker(self):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                run_worker(self.listener, self.options)
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                os._exit(code)
+        self.workers[pid] = self.generation
+
+    def signal_workers(self, pids, signum):
+        for pid in pids:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def reap(self):
+        """Retire les workers terminés ; remplace ceux de la génération courante"""
+        while self.workers:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            generation = self.workers.pop(pid, None)
+            if generation == self.generation and not self.stop_requested:
+                print(f"Worker {pid} arrêté, redémarrage", file=sys.stderr)
+                self.spawn_worker()
+
+    def reload(self):
+        """Nouvelle génération de workers (code rechargé), puis arrêt des anciens"""
+        self.reload_requested = False
+        old = list(self.workers)
+        self.generation += 1
+        for _ in range(self.options.workers):
+            self.spawn_worker()
+        self.signal_workers(old, signal.SIGTERM)
+
+    def shutdown(self):
+        self.signal_workers(list(self.workers), signal.SIGTERM)
+        deadline = time.monotonic() + self.options.graceful_timeout + 5
+        while self.workers and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.1)
+        self.signal_workers(list(self.workers), signal.SIGKILL)
+
+    def run(self):
+        signal.signal(signal.SIGHUP, lambda *_: setattr(self, 'reload_requested', True))
+        signal.signal(signal.SIGTERM, lambda *_: setattr(self, 'stop_requested', True))
+        signal.signal(signal.SIGINT, lambda *_: setattr(self, 'stop_requested', True))
+        for _ in range(self.options.workers):
+            self.spawn_worker()
+        while not self.stop_requested:
+            if self.reload_requested:
+                self.reload()
+            self.reap()
+            time.sleep(0.2)
+        self.shutdown()
+
+
+def main(argv=None):
+    # Configuration chargée par le maître, héritée telle quelle par les workers
+    from config.settings import Settings
+    options = parse_args(Settings, argv)
+
+    if options.workers > 1:
+        if Settings.WRITE_BEHIND:
+            sys.exit('GUDLFT_WRITE_BEHIND ne peut pas être utilisé avec plusieurs workers')
+        # Plusieurs processus partagent les fichiers : verrou et rechargement
+        Settings.MULTIPROCESS = True
+
+    listener = socket.create_server((options.host, options.port), backlog=options.backlog)
+    print(f"GUDLFT : {options.workers} worker(s) gevent sur http://{options.host}:{options.port}", file=sys.stderr)
+    Master(listener, options).run()
+
+
+if __name__ == '__main__':
+    main()